@@ -22,7 +22,7 @@ export const EntregasProvider = ({ children }) => {
     setLoading(true);
     setError(null);
     try {
-      const response = await axiosInstance.get('/api/entregas/');
+      const response = await axiosInstance.get('/api/entregas/?paginar=false');
       setEntregas(response.data);
       setLoading(false);
     } catch (error) {
@@ -92,7 +92,7 @@ export const EntregasProvider = ({ children }) => {
   // Obtener repartidores disponibles
   const obtenerRepartidores = async () => {
     try {
-      const response = await axiosInstance.get('/api/perfiles/?rol=repartidor');
+      const response = await axiosInstance.get('/api/perfiles/?rol=repartidor&paginar=false');
       return response.data;
     } catch (error) {
       console.error("Error al obtener repartidores:", error);
@@ -6,7 +6,10 @@ const PedidosContext = createContext();
 
 export const PedidosProvider = ({ children }) => {
   const [pedidos, setPedidos] = useState([]);
+  // URL de la página siguiente (paginación por cursor de la API), o null si no hay más
+  const [siguiente, setSiguiente] = useState(null);
   const [loading, setLoading] = useState(false);
+  const [cargandoMas, setCargandoMas] = useState(false);
   const [error, setError] = useState(null);
   const { user } = useAuth();
 
@@ -17,13 +20,14 @@ export const PedidosProvider = ({ children }) => {
     }
   }, [user]);
 
-  // Obtener todos los pedidos del usuario
+  // Obtener la primera página de pedidos del usuario (los más recientes)
   const obtenerPedidos = async () => {
     setLoading(true);
     setError(null);
     try {
       const response = await axiosInstance.get('/api/pedidos/');
-      setPedidos(response.data);
+      setPedidos(response.data.results);
+      setSiguiente(response.data.next);
       setLoading(false);
     } catch (error) {
       console.error("Error al obtener pedidos:", error);
@@ -32,6 +36,33 @@ export const PedidosProvider = ({ children }) => {
     }
   };
 
+  // Añadir la página siguiente a los pedidos cargados
+  const cargarMasPedidos = async () => {
+    if (!siguiente) {
+      return;
+    }
+    setCargandoMas(true);
+    setError(null);
+    try {
+      // Solo la ruta y el cursor: el esquema del enlace depende del proxy delante de la API
+      const { pathname, search } = new URL(siguiente);
+      const response = await axiosInstance.get(`${pathname}${search}`);
+      setPedidos((anteriores) => [...anteriores, ...response.data.results]);
+      setSiguiente(response.data.next);
+    } catch (error) {
+      console.error("Error al obtener más pedidos:", error);
+      setError("No se pudieron cargar más pedidos. Intente nuevamente.");
+    } finally {
+      setCargandoMas(false);
+    }
+  };
+
+  // Lista completa (sin paginar) para los selectores que necesitan todos los pedidos
+  const obtenerTodosLosPedidos = async () => {
+    const response = await axiosInstance.get('/api/pedidos/?paginar=false');
+    return response.data;
+  };
+
   // Crear un nuevo pedido
   const crearPedido = async (pedidoData, itemsData) => {
     setLoading(true);
@@ -134,6 +165,10 @@ export const PedidosProvider = ({ children }) => {
         loading,
         error,
         obtenerPedidos,
+        cargarMasPedidos,
+        obtenerTodosLosPedidos,
+        hayMasPedidos: Boolean(siguiente),
+        cargandoMas,
         crearPedido,
         setError,
         actualizarEstadoPedido,
@@ -20,7 +20,7 @@ export const ProductosProvider = ({ children }) => {
     setLoading(true);
     setError(null);
     try {
-      const response = await axiosInstance.get('/api/productos/');
+      const response = await axiosInstance.get('/api/productos/?paginar=false');
       setProductos(response.data);
       setLoading(false);
     } catch (error) {
@@ -23,9 +23,13 @@ const Entregas = () => {
     obtenerRepartidores
   } = useEntregas();
 
-  const { pedidos, loading: loadingPedidos } = usePedidos();
+  const { obtenerTodosLosPedidos } = usePedidos();
   const { user } = useAuth();
 
+  // Todos los pedidos para el selector (el contexto solo tiene las páginas cargadas)
+  const [pedidos, setPedidos] = useState([]);
+  const [loadingPedidos, setLoadingPedidos] = useState(false);
+
   // Estado para repartidores
   const [repartidores, setRepartidores] = useState([]);
   const [loadingRepartidores, setLoadingRepartidores] = useState(false);
@@ -47,6 +51,21 @@ const Entregas = () => {
     disponible: true,
   });
 
+  // Cargar pedidos para el selector al iniciar
+  useEffect(() => {
+    const cargarPedidos = async () => {
+      setLoadingPedidos(true);
+      try {
+        setPedidos(await obtenerTodosLosPedidos());
+      } catch (error) {
+        console.error("Error al cargar pedidos:", error);
+      } finally {
+        setLoadingPedidos(false);
+      }
+    };
+    cargarPedidos();
+  }, []);
+
   // Cargar repartidores al iniciar
   useEffect(() => {
     const cargarRepartidores = async () => {
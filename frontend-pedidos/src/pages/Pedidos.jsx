@@ -19,7 +19,10 @@ const Pedidos = () => {
     setError,
     crearPedido,
     actualizarEstadoPedido,
-    eliminarPedido
+    eliminarPedido,
+    cargarMasPedidos,
+    hayMasPedidos,
+    cargandoMas
   } = usePedidos();
 
   const [nuevoPedido, setNuevoPedido] = useState({
@@ -286,6 +289,18 @@ const Pedidos = () => {
           ))}
         </tbody>
       </table>
+
+      {!loading && hayMasPedidos && (
+        <div className="text-center mb-4">
+          <button
+            className="btn btn-outline-primary"
+            onClick={cargarMasPedidos}
+            disabled={cargandoMas}
+          >
+            {cargandoMas ? 'Cargando...' : 'Cargar más pedidos'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -14,9 +14,9 @@ const Perfiles = () => {
     const fetchPerfiles = async () => {
       try {
         setLoading(true);
-        let url = '/api/perfiles/';
+        let url = '/api/perfiles/?paginar=false';
         if (rolFiltro) {
-          url += `?rol=${rolFiltro}`;
+          url += `&rol=${rolFiltro}`;
         }
         const response = await axiosInstance.get(url);
         setPerfiles(response.data);
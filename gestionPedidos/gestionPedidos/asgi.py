@@ -12,5 +12,23 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gestionPedidos.settings')
+# Quita del stack el middleware de WhiteNoise, que es solo síncrono (ver settings.SERVIDOR_ASGI)
+os.environ.setdefault('GESTION_ASGI', '1')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler  # noqa: E402
+from django.views.static import serve  # noqa: E402
+
+
+class EstaticosCompilados(ASGIStaticFilesHandler):
+    """
+    Sirve STATIC_ROOT (lo que deja collectstatic, con los nombres con hash del
+    manifiesto) en lugar de buscar en los directorios de cada app.
+    """
+    def serve(self, request):
+        return serve(request, self.file_path(request.path), document_root=settings.STATIC_ROOT)
+
+
+application = EstaticosCompilados(django_application)
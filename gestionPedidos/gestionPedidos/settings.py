@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 from pathlib import Path
 import sys
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -62,11 +63,16 @@ INSTALLED_APPS = [
     'models.producto',
     'models.itemPedido',
     'models.entrega',
-    'models.perfil'
+    'models.perfil',
+    'models.reporte',
+    'models.ventas',
+    'models.rendimiento',
+    'models.comun',
 ]
 
 
 MIDDLEWARE = [
+    'models.rendimiento.middleware.MedicionPeticionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -74,30 +80,123 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'models.rendimiento.middleware.PerfiladorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Bajo ASGI (gestionPedidos.asgi) los estáticos los sirve ASGIStaticFilesHandler: el
+# middleware de WhiteNoise solo es síncrono y obligaría a pasar cada petición por un hilo.
+SERVIDOR_ASGI = os.environ.get('GESTION_ASGI') == '1'
+if SERVIDOR_ASGI:
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
 ROOT_URLCONF = 'gestionPedidos.urls'
 
 
 TESTING = 'pytest' in sys.argv[0]
 
+# Máximo de consultas por vista (nombre de la URL). Se miden en MedicionPeticionMiddleware:
+# en los tests superar el presupuesto hace fallar la petición, en producción deja un warning.
+PRESUPUESTOS_CONSULTAS = {
+    'pedido-list': 8,
+    'pedido-reporte-json': 4,
+    'pedido-crear-con-items': 15,
+    'pedido-crear-lote': 25,
+    'entrega-list': 10,
+    'entrega-reporte-json': 6,
+    'itempedido-list': 6,
+    'perfilusuario-list': 4,
+    'producto-list': 6,
+    'producto-buscar': 3,
+    'ventas-list': 4,
+    'pedido-transicion': 12,
+    'entrega-transicion': 14,
+    'lectura-producto-list': 6,
+    'lectura-producto-detail': 2,
+    'lectura-pedido-list': 8,
+    'lectura-entrega-list': 10,
+}
+PRESUPUESTO_CONSULTAS_DEFECTO = None
+PRESUPUESTO_CONSULTAS_ESTRICTO = TESTING
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'models.rendimiento': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 SWAGGER_USE_COMPAT_RENDERERS = False
 
+# Con True, las peticiones autenticadas usan un usuario construido desde los claims del
+# token (id, username, rol) en lugar de leer User y PerfilUsuario de la base de datos.
+# Contrapartida: las lecturas no ven un usuario desactivado ni un cambio de rol hasta que
+# caduca el token de acceso (ACCESS_TOKEN_LIFETIME, por eso corto). El refresco exige un
+# usuario activo y vuelve a leer el rol (perfil.serializers.RefrescoTokenSerializer).
+# Las escrituras comprueban is_active con una consulta por petición
+# (perfil.authentication.AutenticacionJWTSinEstado); el rol se sigue tomando del token.
+AUTENTICACION_JWT_SIN_ESTADO = True
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'models.perfil.authentication.AutenticacionJWTSinEstado'
+        if AUTENTICACION_JWT_SIN_ESTADO else
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'models.comun.paginacion.PaginacionCursor',
 }
 
+# Filas leídas por bloque al generar reportes JSON en streaming
+REPORTE_CHUNK_SIZE = 500
+
+# Máximo de pedidos por petición en /api/pedidos/crear-lote/
+PEDIDOS_LOTE_MAXIMO = 500
+
+# Reportes PDF generados en segundo plano por el comando 'procesar_reportes --continuo'
+# (models.reporte); las peticiones web solo los encolan
+REPORTES_DIR = BASE_DIR / 'reportes_generados'
+REPORTES_EJECUCION_SINCRONA = False
+REPORTES_CACHE_DIR = BASE_DIR / 'reportes_cache'
+REPORTES_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# Un trabajo 'procesando' más tiempo que esto se da por perdido (worker caído) y el comando
+# procesar_reportes lo reencola; tras REPORTES_MAX_INTENTOS tomas queda en 'error'
+REPORTES_PROCESANDO_MAXIMO_SEGUNDOS = 15 * 60
+REPORTES_MAX_INTENTOS = 3
+
+# Esquema OpenAPI pregenerado que sirven /swagger/ y /redoc/ (comando 'generar_esquema')
+OPENAPI_DIR = BASE_DIR / 'openapi'
+
+# Bases de comparación del comando 'benchmark' (models.rendimiento)
+BENCHMARK_DIR = BASE_DIR / 'benchmarks'
+
+# Perfilador por muestreo (models.rendimiento.PerfiladorMiddleware). Desactivado con
+# PORCENTAJE = 0; los administradores pueden pedirlo con la cabecera 'X-Perfilar: 1'.
+PERFILADOR_PORCENTAJE = 0
+PERFILADOR_RUTAS = []  # p. ej. [r'^/api/pedidos/reporte/pdf/', r'^/api/pedidos/crear-con-items/']
+PERFILADOR_INTERVALO_MS = 1
+PERFILADOR_DIR = BASE_DIR / 'perfiles'
+PERFILADOR_MAXIMO_ARCHIVOS = 50
+
+# Tiempo máximo hasta la primera respuesta de un proceso nuevo. 'informe_arranque' falla
+# si se supera y el test de arranque en frío admite el doble (o ARRANQUE_MAXIMO_MS).
+# Las máquinas de fly.io se detienen sin tráfico y cada arranque en frío lo paga el
+# primer usuario.
+ARRANQUE_PRIMERA_RESPUESTA_MAXIMA_MS = 750
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
+    # Corto porque con AUTENTICACION_JWT_SIN_ESTADO acota cuánto tarda en aplicarse una
+    # desactivación o un cambio de rol en las lecturas; el frontend refresca al recibir 401
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATING': True,
@@ -113,6 +212,8 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 
     'JTI_CLAIM': 'jti',
+    'TOKEN_USER_CLASS': 'models.perfil.authentication.UsuarioToken',
+    'TOKEN_REFRESH_SERIALIZER': 'models.perfil.serializers.RefrescoTokenSerializer',
 
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
@@ -156,6 +257,34 @@ EMAIL_HOST_USER = 'pedidosg97@gmail.com'
 EMAIL_HOST_PASSWORD = 'szzd urgl jgki aemz'
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Bandeja de salida de notificaciones (comando enviar_notificaciones)
+NOTIFICACIONES_MAX_INTENTOS = 5
+NOTIFICACIONES_REINTENTO_BASE_SEGUNDOS = 30
+# Modo resumen: los cambios de estado de un mismo cliente dentro de esta ventana salen en
+# un solo correo. Con 0 cada cambio se envía por separado en cuanto el worker lo procesa.
+NOTIFICACIONES_VENTANA_RESUMEN_SEGUNDOS = 120
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Compartida entre los workers de gunicorn de la máquina: el contenido del catálogo y
+    # su candado de reconstrucción (add() atómico) valen para todos los procesos
+    'catalogo': {
+        'BACKEND': 'models.comun.cache.CacheArchivosCompartida',
+        # En los tests, un directorio por ejecución para no leer catálogos de otra
+        'LOCATION': (
+            Path(tempfile.gettempdir()) / f'gestion-catalogo-{os.getpid()}' if TESTING
+            else BASE_DIR / 'cache' / 'catalogo'
+        ),
+    },
+}
+
+# Catálogo de productos cacheado por versión (models.producto.catalogo)
+CATALOGO_CACHE = 'catalogo'
+CATALOGO_CACHE_SEGUNDOS = 300
+CATALOGO_ESPERA_RECONSTRUCCION = 5
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
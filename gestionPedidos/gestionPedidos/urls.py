@@ -1,11 +1,14 @@
 
 from django.contrib import admin
 from django.urls import path, include
-from models.pedido.views import PedidoViewSet
-from models.entrega.views import EntregaViewSet
+from models.pedido.views import PedidoListaAsincrona, PedidoViewSet
+from models.entrega.views import EntregaListaAsincrona, EntregaViewSet
 from models.itemPedido.views import ItemPedidoViewSet
 from models.perfil.views import PerfilUsuarioViewSet
-from models.producto.views import ProductoViewSet
+from models.producto.views import ProductoDetalleAsincrono, ProductoListaAsincrona, ProductoViewSet
+from models.reporte.views import TrabajoReporteViewSet
+from models.ventas.views import ResumenVentasViewSet
+from models.rendimiento.views import PerfiladorViewSet
 from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
@@ -14,9 +17,7 @@ from django.conf.urls.static import static
 from rest_framework import routers
 from models.perfil.views import RegistroAPIView, CustomTokenObtainPairView
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework import permissions
+from models.comun.documentacion import vista_documentacion
 
 router = routers.DefaultRouter()
 router.register(r'entregas', EntregaViewSet, basename='entrega')
@@ -24,19 +25,9 @@ router.register(r'items-pedido', ItemPedidoViewSet, basename='itempedido')
 router.register(r'pedidos', PedidoViewSet, basename='pedido')
 router.register(r'perfiles', PerfilUsuarioViewSet, basename='perfilusuario')
 router.register(r'productos', ProductoViewSet, basename='producto')
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Documentacion API Gestión de Pedidos",
-        default_version="v1.0",
-        description="Documentación para la API de Gestión de Pedidos",
-        terms_of_service="https://www.google.com/policies/terms",
-        contact=openapi.Contact(email="contact@management.local"),
-        license=openapi.License(name="BDS license"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+router.register(r'reportes', TrabajoReporteViewSet, basename='trabajoreporte')
+router.register(r'ventas', ResumenVentasViewSet, basename='ventas')
+router.register(r'perfilador', PerfiladorViewSet, basename='perfilador')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -44,8 +35,13 @@ urlpatterns = [
     path('api/token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/registro/', RegistroAPIView.as_view(), name='registro_usuario'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui' ),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # Lecturas con el ORM async; bajo ASGI no ocupan un hilo mientras esperan a la base de datos
+    path('api/lectura/productos/', ProductoListaAsincrona.as_view(), name='lectura-producto-list'),
+    path('api/lectura/productos/<int:pk>/', ProductoDetalleAsincrono.as_view(), name='lectura-producto-detail'),
+    path('api/lectura/pedidos/', PedidoListaAsincrona.as_view(), name='lectura-pedido-list'),
+    path('api/lectura/entregas/', EntregaListaAsincrona.as_view(), name='lectura-entrega-list'),
+    path('swagger/', vista_documentacion('swagger'), name='schema-swagger-ui' ),
+    path('redoc/', vista_documentacion('redoc'), name='schema-redoc'),
 ]
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
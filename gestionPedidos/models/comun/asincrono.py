@@ -0,0 +1,76 @@
+# models/comun/asincrono.py
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.response import Response
+
+
+def _respuesta_renderizada(response):
+    """
+    Renderiza la respuesta de DRF (JSON, sin acceso a la base de datos) y la entrega
+    como HttpResponse, para que el manejador ASGI no la renderice en un hilo aparte.
+    """
+    response.render()
+    renderizada = HttpResponse(response.content, status=response.status_code)
+    for cabecera, valor in response.items():
+        renderizada[cabecera] = valor
+    return renderizada
+
+
+class LecturaAsincronaView(View):
+    """
+    Variante asíncrona de las acciones 'list' o 'retrieve' de un ViewSet.
+
+    Reutiliza del ViewSet la autenticación, los permisos, el queryset por rol, el plan
+    de consultas, la paginación y el serializer, y lee las filas con la interfaz async
+    del ORM. Bajo ASGI la petición no ocupa un hilo mientras espera a la base de datos.
+
+    La serialización corre en el bucle de eventos, así que el serializer solo puede
+    leer relaciones ya cargadas por el plan de consultas. La autenticación y los
+    permisos, que pueden leer el usuario y su perfil, se resuelven en un solo salto a
+    sync_to_async antes de la consulta.
+    """
+    viewset = None
+    accion = 'list'
+
+    async def get(self, request, *args, **kwargs):
+        vista = self.viewset(action_map={'get': self.accion}, format_kwarg=None)
+        vista.args, vista.kwargs = args, kwargs
+        drf_request = vista.initialize_request(request, *args, **kwargs)
+        vista.request = drf_request
+        vista.headers = vista.default_response_headers
+        try:
+            await sync_to_async(self._inicializar)(vista, drf_request, *args, **kwargs)
+            response = await getattr(self, self.accion)(vista, drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = vista.handle_exception(exc)
+        response = vista.finalize_response(drf_request, response, *args, **kwargs)
+        return _respuesta_renderizada(response)
+
+    @staticmethod
+    def _inicializar(vista, request, *args, **kwargs):
+        vista.initial(request, *args, **kwargs)
+        # get_queryset filtra por el rol: el perfil queda cargado fuera del bucle de eventos
+        getattr(request.user, 'perfil', None)
+
+    async def list(self, vista, request, *args, **kwargs):
+        queryset = vista.filter_queryset(vista.get_queryset())
+        paginador = vista.paginator
+        if paginador is not None and hasattr(paginador, 'apaginar_queryset'):
+            pagina = await paginador.apaginar_queryset(queryset, request, view=vista)
+            if pagina is not None:
+                return paginador.get_paginated_response(vista.get_serializer(pagina, many=True).data)
+        objetos = [objeto async for objeto in queryset]
+        return Response(vista.get_serializer(objetos, many=True).data)
+
+    async def retrieve(self, vista, request, *args, **kwargs):
+        queryset = vista.filter_queryset(vista.get_queryset())
+        clave = kwargs[vista.lookup_url_kwarg or vista.lookup_field]
+        try:
+            objeto = await queryset.aget(**{vista.lookup_field: clave})
+        except (ObjectDoesNotExist, ValueError, TypeError):
+            raise Http404
+        vista.check_object_permissions(request, objeto)
+        return Response(vista.get_serializer(objeto).data)
@@ -0,0 +1,33 @@
+# models/comun/cache.py
+
+import os
+import tempfile
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class CacheArchivosCompartida(FileBasedCache):
+    """
+    FileBasedCache cuyo add() es atómico entre procesos, para usarla como candado entre
+    los workers de gunicorn de la misma máquina. En Django, add() comprueba y luego
+    escribe, así que dos procesos pueden ganar a la vez; aquí la entrada se escribe en
+    un temporal y se enlaza con os.link, que falla si la clave ya existe.
+    """
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # has_key borra la entrada si expiró (p. ej. candado de un worker caído)
+        if self.has_key(key, version):
+            return False
+        self._createdir()
+        fname = self._key_to_file(key, version)
+        self._cull()
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+        try:
+            with open(fd, 'wb') as archivo:
+                self._write_content(archivo, timeout, value)
+            os.link(tmp_path, fname)
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+        return True
@@ -0,0 +1,89 @@
+# models/comun/cambios.py
+
+from django.core.exceptions import ValidationError
+
+
+class SeguimientoCambiosMixin:
+    """
+    Mixin para modelos: recuerda el valor de los campos al cargarse de la base de datos
+    y después de cada save(), y permite preguntar qué cambió desde entonces. Las señales
+    y las vistas lo usan para actuar solo ante cambios reales (p. ej. de 'estado').
+
+    Se siguen los campos de 'campos_seguidos' o, por defecto, todos los concretos salvo
+    la clave primaria y los auto_now, que cambian en cada guardado. Los campos diferidos
+    (only/defer) no se conocen y nunca cuentan como cambiados. Una instancia nueva no
+    tiene cambios: las señales usan 'created'.
+
+    Los valores originales son los que leyó esta instancia; las escrituras que deben ser
+    exactas ante cambios concurrentes (acumulados, stock) se apoyan en la base de datos.
+    """
+    campos_seguidos = None
+
+    @classmethod
+    def _campos_con_seguimiento(cls):
+        campos = cls.__dict__.get('_campos_con_seguimiento_cache')
+        if campos is None:
+            campos = [
+                campo for campo in cls._meta.concrete_fields
+                if (
+                    campo.name in cls.campos_seguidos if cls.campos_seguidos is not None
+                    else not campo.primary_key and not getattr(campo, 'auto_now', False)
+                )
+            ]
+            cls._campos_con_seguimiento_cache = campos
+        return campos
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        instancia._recordar_originales()
+        return instancia
+
+    def _recordar_originales(self, campos=None):
+        originales = dict(getattr(self, '_originales', {})) if campos is not None else {}
+        for campo in self._campos_con_seguimiento():
+            if campos is not None and campo.name not in campos and campo.attname not in campos:
+                continue
+            if campo.attname in self.__dict__:
+                originales[campo.name] = self.__dict__[campo.attname]
+        self._originales = originales
+
+    def sincronizar_originales(self, *campos):
+        """
+        Da por guardados los valores actuales de 'campos' (p. ej. tras escribirlos con
+        un UPDATE directo), para que el siguiente save() no los vea como cambios.
+        """
+        self._recordar_originales(campos)
+
+    def valor_original(self, campo, defecto=None):
+        return getattr(self, '_originales', {}).get(campo, defecto)
+
+    def campos_cambiados(self):
+        """
+        {campo: (valor_original, valor_actual)} de los campos seguidos que cambiaron.
+        """
+        originales = getattr(self, '_originales', {})
+        cambios = {}
+        for campo in self._campos_con_seguimiento():
+            if campo.name not in originales or campo.attname not in self.__dict__:
+                continue
+            original, actual = originales[campo.name], self.__dict__[campo.attname]
+            try:
+                distintos = campo.to_python(original) != campo.to_python(actual)
+            except ValidationError:
+                distintos = original != actual
+            if distintos:
+                cambios[campo.name] = (original, actual)
+        return cambios
+
+    def ha_cambiado(self, *campos):
+        cambios = self.campos_cambiados()
+        return any(campo in cambios for campo in campos) if campos else bool(cambios)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._recordar_originales(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._recordar_originales(fields)
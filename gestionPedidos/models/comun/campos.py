@@ -0,0 +1,90 @@
+# models/comun/campos.py
+
+from rest_framework import serializers
+
+
+def _parsear_rutas(valor):
+    """
+    Convierte 'id,estado,pedido_detalle.items' en un árbol de diccionarios:
+    {'id': {}, 'estado': {}, 'pedido_detalle': {'items': {}}}
+    """
+    arbol = {}
+    for ruta in valor.split(','):
+        ruta = ruta.strip()
+        if not ruta:
+            continue
+        nodo = arbol
+        for nombre in ruta.split('.'):
+            nodo = nodo.setdefault(nombre, {})
+    return arbol
+
+
+class CamposDinamicosMixin:
+    """
+    Mixin para ModelSerializer que admite '?fields=' (campos a devolver) y
+    '?expand=' (campos anidados a incrustar) en las peticiones GET.
+
+    Los campos anidados que pueden omitirse se declaran en Meta.campos_expandibles.
+    Sin '?expand=' se incrustan todos, como hasta ahora; con '?expand=' solo los
+    indicados, nivel a nivel (p. ej. '?expand=pedido_detalle.items').
+    Como el plan de consultas se deriva de los campos del serializer, los campos
+    omitidos tampoco generan joins ni prefetch.
+    """
+    def __init__(self, *args, **kwargs):
+        self._seleccion = None
+        super().__init__(*args, **kwargs)
+
+    def _seleccion_desde_request(self):
+        padre = self.parent
+        if isinstance(padre, serializers.ListSerializer):
+            padre = padre.parent
+        if padre is not None:
+            return None, None
+
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return None, None
+
+        campos = request.query_params.get('fields')
+        expandir = request.query_params.get('expand')
+        return (
+            _parsear_rutas(campos) if campos is not None else None,
+            _parsear_rutas(expandir) if expandir is not None else None,
+        )
+
+    def get_fields(self):
+        campos = super().get_fields()
+
+        if self._seleccion is None:
+            self._seleccion = self._seleccion_desde_request()
+        seleccion_campos, seleccion_expandir = self._seleccion
+
+        if seleccion_campos:
+            desconocidos = set(seleccion_campos) - set(campos)
+            if desconocidos:
+                raise serializers.ValidationError(
+                    {'fields': f"Campos desconocidos: {', '.join(sorted(desconocidos))}"}
+                )
+            campos = {nombre: campo for nombre, campo in campos.items() if nombre in seleccion_campos}
+
+        expandibles = getattr(self.Meta, 'campos_expandibles', [])
+        if seleccion_expandir is not None:
+            desconocidos = set(seleccion_expandir) - set(expandibles)
+            if desconocidos:
+                raise serializers.ValidationError(
+                    {'expand': f"Campos no expandibles: {', '.join(sorted(desconocidos))}"}
+                )
+            for nombre in expandibles:
+                if nombre not in seleccion_expandir and nombre not in (seleccion_campos or {}):
+                    campos.pop(nombre, None)
+
+        for nombre, campo in campos.items():
+            if isinstance(campo, serializers.ListSerializer):
+                campo = campo.child
+            if not isinstance(campo, CamposDinamicosMixin):
+                continue
+            subcampos = (seleccion_campos or {}).get(nombre) or None
+            subexpandir = seleccion_expandir.get(nombre, {}) if seleccion_expandir is not None else None
+            campo._seleccion = (subcampos, subexpandir)
+
+        return campos
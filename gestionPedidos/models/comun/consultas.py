@@ -0,0 +1,102 @@
+# models/comun/consultas.py
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class PlanConsulta:
+    """
+    Plan de carga anticipada (select_related / prefetch_related) para un queryset.
+    """
+    def __init__(self):
+        self.select = set()
+        self.prefetch = {}
+
+    def aplicar(self, queryset):
+        if self.select:
+            queryset = queryset.select_related(*sorted(self.select))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch.values())
+        return queryset
+
+
+def _resolver_relaciones(modelo, atributos):
+    """
+    Recorre la ruta de atributos de un campo y devuelve los campos de relación
+    del modelo que la componen, deteniéndose en el primer atributo no relacional.
+    """
+    relaciones = []
+    for atributo in atributos:
+        try:
+            campo = modelo._meta.get_field(atributo)
+        except FieldDoesNotExist:
+            break
+        if not campo.is_relation:
+            break
+        relaciones.append(campo)
+        modelo = campo.related_model
+    return relaciones
+
+
+def construir_plan(serializer, modelo=None, prefijo='', plan=None):
+    """
+    Deriva el plan de carga recorriendo los campos (y serializers anidados) que
+    el serializer va a leer, de modo que la serialización no dispare consultas N+1.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    if modelo is None:
+        modelo = serializer.Meta.model
+    if plan is None:
+        plan = PlanConsulta()
+
+    for campo in serializer.fields.values():
+        if campo.write_only:
+            continue
+
+        atributos = campo.source_attrs
+        # Las claves foráneas representadas por su id se leen de la columna local.
+        if isinstance(campo, serializers.RelatedField) and campo.use_pk_only_optimization() and len(atributos) == 1:
+            continue
+
+        relaciones = _resolver_relaciones(modelo, atributos)
+        if not relaciones:
+            continue
+
+        ruta = prefijo
+        for posicion, relacion in enumerate(relaciones):
+            ruta = f"{ruta}__{atributos[posicion]}" if ruta else atributos[posicion]
+
+            if relacion.one_to_many or relacion.many_to_many:
+                queryset = relacion.related_model._default_manager.all()
+                es_destino = posicion == len(relaciones) - 1 == len(atributos) - 1
+                if es_destino and isinstance(campo, serializers.ListSerializer):
+                    queryset = construir_plan(campo.child, relacion.related_model).aplicar(queryset)
+                plan.prefetch[ruta] = Prefetch(ruta, queryset=queryset)
+                break
+
+            plan.select.add(ruta)
+        else:
+            es_anidado = isinstance(campo, serializers.BaseSerializer) and not isinstance(campo, serializers.ListSerializer)
+            if es_anidado and len(relaciones) == len(atributos):
+                construir_plan(campo, relaciones[-1].related_model, ruta, plan)
+
+    return plan
+
+
+def optimizar_queryset(queryset, serializer):
+    """
+    Aplica al queryset el plan de carga derivado del serializer.
+    """
+    return construir_plan(serializer, queryset.model).aplicar(queryset)
+
+
+class ConsultaOptimizadaMixin:
+    """
+    Mixin para ViewSets: carga por adelantado las relaciones que recorre el
+    serializer, para que list, retrieve y los reportes usen un número fijo de consultas.
+    """
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return optimizar_queryset(queryset, self.get_serializer())
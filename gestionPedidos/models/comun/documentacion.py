@@ -0,0 +1,141 @@
+# models/comun/documentacion.py
+
+import hashlib
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import condition
+from rest_framework import permissions
+
+VERSION_API = 'v1.0'
+
+# Formato pedido en '?format=' -> (extensión del artefacto, tipo de contenido)
+FORMATOS_ESQUEMA = {
+    'openapi': ('json', 'application/openapi+json'),
+    'json': ('json', 'application/json'),
+    'yaml': ('yaml', 'application/yaml'),
+}
+
+_esquemas = {}
+_esquemas_lock = threading.RLock()
+
+
+def _info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Documentacion API Gestión de Pedidos",
+        default_version=VERSION_API,
+        description="Documentación para la API de Gestión de Pedidos",
+        terms_of_service="https://www.google.com/policies/terms",
+        contact=openapi.Contact(email="contact@management.local"),
+        license=openapi.License(name="BDS license"),
+    )
+
+
+@lru_cache(maxsize=None)
+def _vista_esquema():
+    from drf_yasg.views import get_schema_view
+
+    return get_schema_view(
+        _info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+
+@lru_cache(maxsize=None)
+def _vista_ui(interfaz):
+    return _vista_esquema().with_ui(interfaz, cache_timeout=0)
+
+
+def directorio_esquemas():
+    return Path(getattr(settings, 'OPENAPI_DIR', settings.BASE_DIR / 'openapi'))
+
+
+def ruta_esquema(extension):
+    return directorio_esquemas() / f"openapi-{VERSION_API}.{extension}"
+
+
+def generar_esquemas():
+    """
+    Introspecciona todos los ViewSets y serializers y escribe el esquema en JSON y YAML
+    (openapi-<versión>.json/.yaml en OPENAPI_DIR), de forma atómica. Se genera sin
+    petición: sin 'host' ni 'schemes', así que Swagger UI usa los de la página.
+    Devuelve las rutas escritas.
+    """
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    esquema = OpenAPISchemaGenerator(_info(), VERSION_API).get_schema(request=None, public=True)
+    directorio = directorio_esquemas()
+    directorio.mkdir(parents=True, exist_ok=True)
+
+    rutas = []
+    for extension, codec in (('json', OpenAPICodecJson), ('yaml', OpenAPICodecYaml)):
+        descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.write(codec(validators=[]).encode(esquema))
+        ruta = ruta_esquema(extension)
+        os.replace(temporal, ruta)
+        rutas.append(ruta)
+
+    with _esquemas_lock:
+        _esquemas.clear()
+    return rutas
+
+
+def esquema(extension):
+    """
+    (contenido, etag) del esquema pregenerado. Se lee del disco una vez por proceso y se
+    vuelve a leer si el archivo cambia (comando 'generar_esquema'). Si no existe, el
+    primer proceso que lo necesita lo genera.
+    """
+    ruta = ruta_esquema(extension)
+    with _esquemas_lock:
+        try:
+            marca = ruta.stat().st_mtime_ns
+        except FileNotFoundError:
+            generar_esquemas()
+            marca = ruta.stat().st_mtime_ns
+
+        guardado = _esquemas.get(ruta)
+        if guardado is None or guardado[0] != marca:
+            contenido = ruta.read_bytes()
+            etag = f'"{VERSION_API}-{hashlib.sha256(contenido).hexdigest()[:32]}"'
+            guardado = _esquemas[ruta] = (marca, contenido, etag)
+        return guardado[1], guardado[2]
+
+
+def _etag_esquema(request, *args, **kwargs):
+    formato = FORMATOS_ESQUEMA[request.GET['format']]
+    return esquema(formato[0])[1]
+
+
+@condition(etag_func=_etag_esquema)
+def _respuesta_esquema(request):
+    extension, tipo_contenido = FORMATOS_ESQUEMA[request.GET['format']]
+    contenido, _ = esquema(extension)
+    response = HttpResponse(contenido, content_type=tipo_contenido)
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def vista_documentacion(interfaz):
+    """
+    Vista de documentación ('swagger' o 'redoc'). La página la renderiza drf_yasg, que
+    se importa en la primera visita y no introspecciona la API para ello. La
+    especificación que pide la página ('?format=openapi', también json y yaml) se sirve
+    del artefacto pregenerado, con ETag, en lugar de regenerarse en cada visita.
+    """
+    def documentacion(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD') and request.GET.get('format') in FORMATOS_ESQUEMA:
+            return _respuesta_esquema(request)
+        return _vista_ui(interfaz)(request, *args, **kwargs)
+    documentacion.csrf_exempt = True
+    return documentacion
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from models.comun.documentacion import generar_esquemas
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera el esquema OpenAPI que sirven /swagger/ y /redoc/ (JSON y YAML en OPENAPI_DIR). "
+        "Se ejecuta al construir la imagen; los procesos en marcha lo recargan al cambiar el archivo."
+    )
+
+    def handle(self, *args, **options):
+        for ruta in generar_esquemas():
+            self.stdout.write(self.style.SUCCESS(f"Esquema generado en {ruta}"))
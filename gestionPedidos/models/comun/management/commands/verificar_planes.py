@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from models.comun.planes import consultas_criticas, escaneos_completos, explicar
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta EXPLAIN QUERY PLAN sobre las consultas calientes de las vistas y falla "
+        "si alguna recorre una tabla completa sin índice."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--plan', action='store_true', help="Muestra el plan completo de cada consulta.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("La verificación de planes solo está disponible para SQLite.")
+
+        fallidas = []
+        for nombre, queryset in consultas_criticas():
+            plan = explicar(queryset)
+            escaneos = escaneos_completos(plan)
+            if escaneos:
+                fallidas.append(nombre)
+                self.stdout.write(self.style.ERROR(f"[ESCANEO] {nombre}: {'; '.join(escaneos)}"))
+            else:
+                self.stdout.write(f"[OK] {nombre}")
+            if options['plan'] or escaneos:
+                for linea in plan:
+                    self.stdout.write(f"    {linea}")
+
+        if fallidas:
+            raise CommandError(f"{len(fallidas)} consulta(s) sin índice: {', '.join(fallidas)}")
+        self.stdout.write(self.style.SUCCESS("Todas las consultas calientes usan índices."))
@@ -0,0 +1,147 @@
+# models/comun/paginacion.py
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PaginacionCursor(CursorPagination):
+    """
+    Paginación por cursor (keyset) para los ViewSets de la API.
+
+    El orden se toma del atributo 'orden_cursor' de la vista, que debe terminar en un
+    campo único (normalmente 'id') y usar campos no nulos. El cursor guarda los valores
+    de todos esos campos en la fila frontera y la página siguiente se pide con una
+    comparación de tuplas, p. ej. para ('-fecha_pedido', '-id'):
+
+        fecha_pedido < f OR (fecha_pedido = f AND id < i)
+
+    sin OFFSET, así que el coste no crece con la página ni con las filas que comparten
+    fecha. Las vistas asíncronas leen la misma consulta con el ORM async
+    (apaginar_queryset).
+
+    Los clientes antiguos que esperan la lista completa pueden enviar '?paginar=false'.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-id',)
+    parametro_desactivar = 'paginar'
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, 'orden_cursor', self.ordering))
+
+    def paginacion_desactivada(self, request):
+        valor = request.query_params.get(self.parametro_desactivar, '')
+        return valor.lower() in ('false', '0', 'no')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        consulta = self.consulta_pagina(queryset, request, view)
+        if consulta is None:
+            return None
+        return self._cerrar_pagina(list(consulta))
+
+    async def apaginar_queryset(self, queryset, request, view=None):
+        consulta = self.consulta_pagina(queryset, request, view)
+        if consulta is None:
+            return None
+        return self._cerrar_pagina([objeto async for objeto in consulta])
+
+    def consulta_pagina(self, queryset, request, view):
+        """
+        Queryset (sin evaluar) con las filas de la página pedida más una, que indica
+        si hay más filas en esa dirección.
+        """
+        if self.paginacion_desactivada(request):
+            return None
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self._campos = [queryset.model._meta.get_field(orden.lstrip('-')) for orden in self.ordering]
+        self._posicion, self._anterior = self.decode_cursor(request)
+
+        if self._anterior:
+            queryset = queryset.order_by(*[
+                orden[1:] if orden.startswith('-') else f"-{orden}" for orden in self.ordering
+            ])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if self._posicion is not None:
+            queryset = queryset.filter(self._filtro_posicion(self._posicion, despues=not self._anterior))
+        return queryset[:self.page_size + 1]
+
+    def _filtro_posicion(self, posicion, despues):
+        """
+        Filas después (o antes) de 'posicion' en el orden de la vista.
+        """
+        condicion = Q()
+        iguales = {}
+        for campo, orden, valor in zip(self._campos, self.ordering, posicion):
+            operador = 'lt' if orden.startswith('-') == despues else 'gt'
+            condicion |= Q(**iguales, **{f"{campo.name}__{operador}": valor})
+            iguales[campo.name] = valor
+        return condicion
+
+    def _cerrar_pagina(self, filas):
+        hay_mas = len(filas) > self.page_size
+        self.page = filas[:self.page_size]
+        if self._anterior:
+            self.page.reverse()
+            self.has_previous, self.has_next = hay_mas, True
+        else:
+            self.has_previous, self.has_next = self._posicion is not None, hay_mas
+        self.display_page_controls = (self.has_previous or self.has_next) and self.template is not None
+        return self.page
+
+    def decode_cursor(self, request):
+        """
+        (valores de la fila frontera, hacia atrás) del cursor de la petición, o
+        (None, False) para la primera página.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            datos = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            textos, anterior = datos['p'], bool(datos['r'])
+            if not isinstance(textos, list) or len(textos) != len(self._campos):
+                raise ValueError
+            return [campo.to_python(texto) for campo, texto in zip(self._campos, textos)], anterior
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, fila, anterior):
+        datos = {'p': [campo.value_to_string(fila) for campo in self._campos], 'r': int(anterior)}
+        cursor = base64.urlsafe_b64encode(json.dumps(datos, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], anterior=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Cursor más allá de la última fila: se vuelve a la primera página
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], anterior=True)
+
+
+class PaginacionBusqueda(PageNumberPagination):
+    """
+    Paginación por número de página para resultados ordenados por relevancia, donde
+    no hay un campo único y monótono sobre el que construir un cursor.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,121 @@
+# models/comun/planes.py
+
+from urllib.parse import urlsplit
+
+from django.db import connections
+from django.http import QueryDict
+
+
+class UsuarioConRol:
+    """
+    Usuario mínimo con perfil para construir los querysets por rol de las vistas sin
+    tocar la base de datos.
+    """
+    is_authenticated = True
+
+    def __init__(self, rol, id=1):
+        self.id = id
+        self.perfil = type('Perfil', (), {'rol': rol})()
+
+
+def explicar(queryset):
+    """
+    Ejecuta EXPLAIN QUERY PLAN (SQLite) sobre el SQL del queryset y devuelve las líneas
+    de detalle del plan.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [fila[-1] for fila in cursor.fetchall()]
+
+
+def escaneos_completos(plan):
+    """
+    Líneas del plan que recorren una tabla entera sin índice ('SCAN tabla' sin 'USING').
+    """
+    return [
+        linea for linea in plan
+        if linea.startswith('SCAN ') and ' USING ' not in linea and 'VIRTUAL TABLE' not in linea
+    ]
+
+
+def _peticion(usuario, parametros=None):
+    from django.test import RequestFactory
+    from rest_framework.request import Request
+
+    request = Request(RequestFactory().get('/', parametros or {}))
+    request.user = usuario
+    return request
+
+
+def consulta_lista(vista, usuario, frontera=None, **parametros):
+    """
+    Consulta de la página que devuelve la acción 'list' del ViewSet 'vista' para
+    'usuario': su get_queryset, filter_queryset (con el plan de carga del serializer,
+    ver comun.consultas) y la paginación por cursor. Con 'frontera' ({campo: valor} de
+    la última fila vista) es la consulta de la página siguiente.
+    """
+    view = vista(request=_peticion(usuario, parametros), action='list', format_kwarg=None, args=(), kwargs={})
+    queryset = view.filter_queryset(view.get_queryset())
+    consulta = view.paginator.consulta_pagina(queryset, view.request, view)
+    if frontera is None:
+        return consulta
+    enlace = view.paginator.encode_cursor(queryset.model(**frontera), anterior=False)
+    view.request = _peticion(usuario, QueryDict(urlsplit(enlace).query))
+    return view.paginator.consulta_pagina(queryset, view.request, view)
+
+
+def consulta_admin(modelo, **parametros):
+    """
+    Consulta de la página del listado del admin de 'modelo' con los filtros
+    'parametros' (los de la barra lateral, p. ej. estado__exact), como la arma ChangeList.
+    """
+    from django.contrib import admin
+    from django.contrib.auth import get_user_model
+    from django.test import RequestFactory
+
+    request = RequestFactory().get('/', parametros)
+    request.user = get_user_model()(is_active=True, is_staff=True, is_superuser=True)
+    return admin.site.get_model_admin(modelo).get_changelist_instance(request).result_list
+
+
+def consultas_criticas():
+    """
+    Consultas calientes de la API y del admin, construidas por las propias vistas
+    (ViewSets y ChangeList) y por los servicios que las ejecutan, con el orden y el
+    tamaño de página reales. Devuelve [(nombre, queryset)].
+    """
+    from django.utils import timezone
+    from models.entrega.models import Entrega, NotificacionEntrega
+    from models.entrega.utils import notificaciones_vencidas
+    from models.entrega.views import EntregaViewSet
+    from models.itemPedido.views import ItemPedidoViewSet
+    from models.pedido.models import Pedido
+    from models.pedido.transiciones import consulta_cantidades_por_producto
+    from models.pedido.views import PedidoViewSet
+    from models.perfil.models import PerfilUsuario
+    from models.perfil.views import PerfilUsuarioViewSet
+
+    admin, cliente, repartidor = UsuarioConRol('admin'), UsuarioConRol('cliente'), UsuarioConRol('repartidor')
+    ahora = timezone.now()
+
+    return [
+        ('pedidos del cliente', consulta_lista(PedidoViewSet, cliente)),
+        ('pedidos del cliente (página siguiente)',
+         consulta_lista(PedidoViewSet, cliente, frontera={'id': 1, 'fecha_pedido': ahora})),
+        ('pedidos por estado (admin)', consulta_admin(Pedido, estado__exact='pendiente')),
+        ('pedidos por fecha (admin)',
+         consulta_admin(Pedido, fecha_pedido__gte=str(timezone.localtime(ahora) - timezone.timedelta(days=7)))),
+        ('entregas del repartidor', consulta_lista(EntregaViewSet, repartidor)),
+        ('entregas del repartidor (página siguiente)', consulta_lista(EntregaViewSet, repartidor, frontera={'id': 1})),
+        ('entregas del cliente', consulta_lista(EntregaViewSet, cliente)),
+        ('entregas por estado (admin)', consulta_admin(Entrega, estado__exact='pendiente')),
+        ('entregas del repartidor por estado (admin)',
+         consulta_admin(Entrega, estado__exact='en_camino', asignado_a__id__exact=repartidor.id)),
+        ('items del cliente', consulta_lista(ItemPedidoViewSet, cliente)),
+        ('cantidades a liberar al cancelar', consulta_cantidades_por_producto([1, 2, 3])),
+        ('perfiles por rol', consulta_lista(PerfilUsuarioViewSet, admin, rol='repartidor')),
+        ('perfiles por rol (admin)', consulta_admin(PerfilUsuario, rol__exact='repartidor')),
+        ('notificaciones pendientes', notificaciones_vencidas(ahora)[:100]),
+        ('notificaciones por estado (admin)', consulta_admin(NotificacionEntrega, estado__exact='pendiente')),
+    ]
@@ -0,0 +1,87 @@
+# models/comun/streaming.py
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
+
+FORMATOS_STREAMING = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def formato_streaming(request):
+    """
+    Devuelve el formato pedido en '?streaming=' (json o ndjson), o None si no se pidió.
+    """
+    formato = request.query_params.get('streaming')
+    if not formato:
+        return None
+    formato = formato.lower()
+    if formato not in FORMATOS_STREAMING:
+        raise serializers.ValidationError(
+            {'streaming': f"Formato no soportado. Opciones: {', '.join(FORMATOS_STREAMING)}"}
+        )
+    return formato
+
+
+def _serializar_por_bloques(queryset, serializer, formato, chunk_size):
+    """
+    Recorre el queryset por bloques con iterator() y emite cada bloque ya codificado,
+    de modo que en memoria solo hay un bloque de filas a la vez.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    separador = '\n' if formato == 'ndjson' else ','
+
+    if formato == 'json':
+        yield '['
+
+    bloque = []
+    primero = True
+    for objeto in queryset.iterator(chunk_size=chunk_size):
+        bloque.append(json.dumps(serializer.to_representation(objeto), cls=JSONEncoder, ensure_ascii=False))
+        if len(bloque) >= chunk_size:
+            yield ('' if primero else separador) + separador.join(bloque)
+            primero = False
+            bloque = []
+    if bloque:
+        yield ('' if primero else separador) + separador.join(bloque)
+        primero = False
+
+    if formato == 'json':
+        yield ']'
+    elif not primero:
+        yield '\n'
+
+
+async def _en_asincrono(bloques):
+    """
+    Entrega los bloques del generador síncrono como un generador asíncrono. Con ASGI,
+    Django lee un iterador síncrono entero con sync_to_async(list) antes de enviar
+    nada; así cada bloque se lee (en el hilo de la base de datos) y se envía por turnos.
+    """
+    fin = object()
+    siguiente = sync_to_async(next, thread_sensitive=True)
+    while (bloque := await siguiente(bloques, fin)) is not fin:
+        yield bloque
+
+
+def respuesta_streaming(request, queryset, serializer, formato, nombre_archivo=None):
+    """
+    Construye un StreamingHttpResponse que serializa el queryset fila a fila, con un
+    iterador asíncrono si la petición llega por ASGI.
+    """
+    chunk_size = getattr(settings, 'REPORTE_CHUNK_SIZE', 500)
+    bloques = _serializar_por_bloques(queryset, serializer, formato, chunk_size)
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        bloques = _en_asincrono(bloques)
+    response = StreamingHttpResponse(bloques, content_type=FORMATOS_STREAMING[formato])
+    if nombre_archivo:
+        response['Content-Disposition'] = f'attachment; filename="{nombre_archivo}.{formato}"'
+    return response
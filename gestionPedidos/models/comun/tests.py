@@ -0,0 +1,92 @@
+import pytest
+from django.core.management import call_command
+
+from .planes import escaneos_completos
+
+
+@pytest.mark.django_db
+def test_verificar_planes_sin_escaneos_completos(settings, capsys):
+    settings.TESTING = False
+    call_command('verificar_planes')
+    salida = capsys.readouterr().out
+    assert '[ESCANEO]' not in salida
+    assert 'pedidos del cliente' in salida
+
+
+def test_detecta_escaneo_completo():
+    plan = [
+        'SCAN pedido_pedido',
+        'SCAN pedido_pedido USING INDEX pedido_fecha_idx',
+        'SEARCH entrega_entrega USING INDEX entrega_estado_idx (estado=?)',
+    ]
+    assert escaneos_completos(plan) == ['SCAN pedido_pedido']
+
+
+@pytest.mark.django_db
+def test_esquema_pregenerado_con_etag(client, settings, tmp_path, monkeypatch):
+    from . import documentacion
+    settings.OPENAPI_DIR = tmp_path
+    call_command('generar_esquema')
+    assert (tmp_path / f"openapi-{documentacion.VERSION_API}.json").exists()
+
+    def no_regenerar(*args, **kwargs):
+        raise AssertionError("El esquema no debe regenerarse por petición")
+    monkeypatch.setattr(documentacion, 'generar_esquemas', no_regenerar)
+
+    response = client.get('/swagger/', {'format': 'openapi'})
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/openapi+json'
+    assert '/pedidos/' in response.json()['paths']
+    assert client.get('/redoc/', {'format': 'openapi'})['ETag'] == response['ETag']
+
+    no_modificado = client.get('/swagger/', {'format': 'openapi'}, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert no_modificado.status_code == 304
+    assert client.get('/swagger/', {'format': 'yaml'}).content.startswith(b'swagger:')
+    assert client.get('/swagger/').status_code == 200
+
+
+@pytest.mark.django_db
+def test_seguimiento_de_cambios_desde_la_carga():
+    from django.contrib.auth.models import User
+    from models.pedido.models import Pedido
+    cliente = User.objects.create_user(username='cliente_cambios')
+    Pedido.objects.create(cliente=cliente, direccion_envio='Calle 1', monto_total=100)
+
+    pedido = Pedido.objects.get()
+    assert pedido.campos_cambiados() == {}
+    pedido.monto_total = 100.0
+    pedido.fecha_actualizacion = None
+    assert not pedido.ha_cambiado()
+
+    pedido.estado = 'en_proceso'
+    assert pedido.campos_cambiados() == {'estado': ('pendiente', 'en_proceso')}
+    assert pedido.ha_cambiado('estado') and not pedido.ha_cambiado('direccion_envio')
+    pedido.save()
+    assert not pedido.ha_cambiado()
+    assert pedido.valor_original('estado') == 'en_proceso'
+
+    diferido = Pedido.objects.only('id').get()
+    diferido.estado = 'cancelado'
+    assert not diferido.ha_cambiado('estado')
+
+def _agregar_candado(directorio, resultados):
+    from .cache import CacheArchivosCompartida
+    resultados.put(CacheArchivosCompartida(directorio, {}).add('candado', True, timeout=30))
+
+def test_cache_archivos_add_atomico_entre_procesos(tmp_path):
+    import multiprocessing
+    from .cache import CacheArchivosCompartida
+    contexto = multiprocessing.get_context('fork')
+    resultados = contexto.Queue()
+    procesos = [contexto.Process(target=_agregar_candado, args=(str(tmp_path), resultados)) for _ in range(8)]
+    for proceso in procesos:
+        proceso.start()
+    for proceso in procesos:
+        proceso.join()
+    assert sorted(resultados.get() for _ in procesos) == [False] * 7 + [True]
+
+    # Un candado expirado (worker caído) se puede volver a tomar
+    cache = CacheArchivosCompartida(str(tmp_path), {})
+    cache.set('candado', True, timeout=-1)
+    assert cache.add('candado', True, timeout=30)
+    assert not cache.add('candado', True, timeout=30)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from models.entrega.models import Entrega
+from models.entrega.models import Entrega, NotificacionEntrega
 
 @admin.register(Entrega)
 class EntregaAdmin(admin.ModelAdmin):
@@ -7,3 +7,9 @@ class EntregaAdmin(admin.ModelAdmin):
     list_filter = ('estado', 'asignado_a')
     search_fields = ('id', 'pedido__id', 'asignado_a__username', 'numero_seguimiento')
     date_hierarchy = 'fecha_entrega'
+
+@admin.register(NotificacionEntrega)
+class NotificacionEntregaAdmin(admin.ModelAdmin):
+    list_display = ('id', 'entrega', 'destinatario', 'estado_entrega', 'estado', 'intentos', 'proximo_intento', 'fecha_envio')
+    list_filter = ('estado',)
+    search_fields = ('destinatario', 'entrega__id')
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from models.entrega.utils import procesar_notificaciones_pendientes
+
+
+class Command(BaseCommand):
+    help = "Vacía la bandeja de salida de notificaciones de entrega reutilizando una conexión SMTP por lote."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=100, help="Notificaciones por conexión SMTP.")
+        parser.add_argument('--continuo', action='store_true', help="Seguir revisando la bandeja indefinidamente.")
+        parser.add_argument('--intervalo', type=float, default=5.0, help="Segundos de espera cuando la bandeja está vacía.")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                enviadas, fallidas = procesar_notificaciones_pendientes(options['lote'])
+            except Exception as e:
+                # Típicamente el servidor SMTP no está disponible; las notificaciones siguen pendientes
+                self.stderr.write(f"Error al procesar notificaciones: {e}")
+                enviadas = fallidas = 0
+
+            if enviadas or fallidas:
+                self.stdout.write(f"Notificaciones enviadas: {enviadas}, fallidas: {fallidas}")
+
+            if not options['continuo']:
+                break
+            if enviadas + fallidas < options['lote']:
+                time.sleep(options['intervalo'])
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entrega', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entrega',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entrega', '0003_notificacionentrega'),
+        ('pedido', '0005_pedido_pedido_cliente_fecha_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entrega',
+            index=models.Index(fields=['asignado_a', 'estado'], name='entrega_repartidor_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entrega',
+            index=models.Index(fields=['estado'], name='entrega_estado_idx'),
+        ),
+    ]
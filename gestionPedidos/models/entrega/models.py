@@ -1,8 +1,10 @@
 from django.db import models
+from django.utils import timezone
 from models.pedido.models import Pedido
 from django.contrib.auth.models import User
+from models.comun.cambios import SeguimientoCambiosMixin
 
-class Entrega(models.Model):
+class Entrega(SeguimientoCambiosMixin, models.Model):
     ESTADOS_ENTREGA = [
         ('pendiente', 'Pendiente'),
         ('en_camino', 'En Camino'),
@@ -16,6 +18,41 @@ class Entrega(models.Model):
     numero_seguimiento = models.CharField(max_length=100, blank=True, null=True)
     vehiculo = models.CharField(max_length=50, blank=True, null=True)
     disponible = models.BooleanField(default=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Entregas del repartidor, opcionalmente por estado
+            models.Index(fields=['asignado_a', 'estado'], name='entrega_repartidor_estado_idx'),
+            # Filtro del admin por estado
+            models.Index(fields=['estado'], name='entrega_estado_idx'),
+        ]
+
+    def __str__(self):
+        return f"Entrega para el Pedido #{self.pedido.id}"
+
+class NotificacionEntrega(models.Model):
+    """
+    Bandeja de salida (outbox) de correos de cambio de estado. Se escribe en la misma
+    transacción que la Entrega y la vacía el comando 'enviar_notificaciones'.
+    """
+    ESTADOS_NOTIFICACION = [
+        ('pendiente', 'Pendiente'),
+        ('enviada', 'Enviada'),
+        ('fallida', 'Fallida'),
+    ]
+    entrega = models.ForeignKey(Entrega, on_delete=models.CASCADE, related_name='notificaciones')
+    destinatario = models.EmailField()
+    estado_entrega = models.CharField(max_length=20, choices=Entrega.ESTADOS_ENTREGA)
+    estado = models.CharField(max_length=20, choices=ESTADOS_NOTIFICACION, default='pendiente')
+    intentos = models.PositiveIntegerField(default=0)
+    proximo_intento = models.DateTimeField(default=timezone.now)
+    ultimo_error = models.TextField(blank=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_envio = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['estado', 'proximo_intento'], name='notif_estado_proximo_idx')]
 
     def __str__(self):
-        return f"Entrega para el Pedido #{self.pedido.id}"
\ No newline at end of file
+        return f"Notificación #{self.id} a {self.destinatario} ({self.estado})"
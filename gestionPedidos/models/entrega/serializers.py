@@ -3,9 +3,10 @@ from ..pedido.models import Pedido
 from .models import Entrega
 from ..pedido.serializers import PedidoSerializer
 from ..perfil.serializers import PerfilUsuarioSerializer
+from ..comun.campos import CamposDinamicosMixin
 from django.contrib.auth.models import User
 
-class EntregaSerializer(serializers.ModelSerializer):
+class EntregaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     pedido = serializers.PrimaryKeyRelatedField(queryset=Pedido.objects.all())
     pedido_detalle = PedidoSerializer(read_only=True, source='pedido')
     repartidor_detalle = PerfilUsuarioSerializer(read_only=True, source='asignado_a.perfil')
@@ -14,3 +15,4 @@ class EntregaSerializer(serializers.ModelSerializer):
     class Meta:
         model = Entrega
         fields = ['id', 'pedido','pedido_detalle', 'asignado_a', 'repartidor_detalle', 'estado', 'fecha_entrega', 'numero_seguimiento', 'vehiculo', 'disponible']
+        campos_expandibles = ['pedido_detalle', 'repartidor_detalle']
@@ -1,8 +1,10 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import Entrega
-from .utils import enviar_notificacion_entrega
+from .utils import encolar_notificacion_entrega
 
 @receiver(post_save, sender=Entrega)
-def notificar_cambio_estado(sender, instance, **kwargs):
-    enviar_notificacion_entrega(instance)
+def notificar_cambio_estado(sender, instance, created, **kwargs):
+    # Guardar sin cambiar el estado (vehículo, asignación, admin) no notifica al cliente
+    if created or instance.ha_cambiado('estado'):
+        encolar_notificacion_entrega(instance)
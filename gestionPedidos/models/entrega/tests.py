@@ -87,4 +87,209 @@ def test_eliminar_entrega(api_client, crear_entrega):
     url = reverse('entrega-detail', args=[crear_entrega.id])
     response = api_client.delete(url)
     assert response.status_code == 204
-    assert not Entrega.objects.filter(id=crear_entrega.id).exists()
\ No newline at end of file
+    assert not Entrega.objects.filter(id=crear_entrega.id).exists()
+
+@pytest.mark.django_db
+def test_listar_entregas_campos_dispersos(api_client, crear_entrega):
+    url = reverse('entrega-list')
+    response = api_client.get(url, {'fields': 'id,estado,pedido'})
+    assert response.status_code == 200
+    assert response.data['results'][0] == {'id': crear_entrega.id, 'estado': 'pendiente', 'pedido': crear_entrega.pedido.id}
+
+@pytest.mark.django_db
+def test_listar_entregas_expandir_por_niveles(api_client, crear_entrega):
+    url = reverse('entrega-list')
+    response = api_client.get(url, {'expand': 'pedido_detalle'})
+    assert response.status_code == 200
+    entrega = response.data['results'][0]
+    assert 'repartidor_detalle' not in entrega
+    assert entrega['pedido_detalle']['id'] == crear_entrega.pedido.id
+    assert 'items' not in entrega['pedido_detalle']
+    assert 'cliente_detalle' not in entrega['pedido_detalle']
+
+    response = api_client.get(url, {'expand': 'pedido_detalle.items', 'fields': 'id,pedido_detalle.items'})
+    assert response.data['results'][0] == {'id': crear_entrega.id, 'pedido_detalle': {'items': []}}
+
+@pytest.mark.django_db
+def test_listar_entregas_sin_expandir_evita_joins(api_client, crear_entrega):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as contexto:
+        response = api_client.get(reverse('entrega-list'), {'expand': ''})
+    assert response.status_code == 200
+    assert len(contexto.captured_queries) == 1
+    assert 'JOIN' not in contexto.captured_queries[0]['sql']
+
+@pytest.mark.django_db
+def test_listar_entregas_campo_desconocido(api_client, crear_entrega):
+    response = api_client.get(reverse('entrega-list'), {'fields': 'id,inexistente'})
+    assert response.status_code == 400
+
+@pytest.fixture
+def notificaciones_individuales(settings):
+    settings.NOTIFICACIONES_VENTANA_RESUMEN_SEGUNDOS = 0
+
+@pytest.fixture
+def entrega_con_correo(crear_pedido, crear_cliente):
+    crear_cliente.email = 'cliente@example.com'
+    crear_cliente.save()
+    return Entrega.objects.create(pedido=crear_pedido, asignado_a=crear_cliente, estado='pendiente')
+
+@pytest.mark.django_db
+def test_cambio_entrega_encola_notificacion_sin_enviar(api_client, entrega_con_correo):
+    from django.core import mail
+    from models.entrega.models import NotificacionEntrega
+    url = reverse('entrega-detail', args=[entrega_con_correo.id])
+    response = api_client.patch(url, {"estado": "en_camino"}, format='json')
+    assert response.status_code == 200
+    assert len(mail.outbox) == 0
+    assert list(NotificacionEntrega.objects.values_list('estado_entrega', 'estado')) == [
+        ('pendiente', 'pendiente'), ('en_camino', 'pendiente')
+    ]
+
+@pytest.mark.django_db
+def test_guardar_sin_cambiar_estado_no_notifica(api_client, entrega_con_correo):
+    from models.entrega.models import NotificacionEntrega
+    url = reverse('entrega-detail', args=[entrega_con_correo.id])
+    assert api_client.patch(url, {"vehiculo": "Moto", "estado": "pendiente"}, format='json').status_code == 200
+    entrega = Entrega.objects.get()
+    entrega.save()
+    assert list(NotificacionEntrega.objects.values_list('estado_entrega', flat=True)) == ['pendiente']
+
+@pytest.mark.django_db
+def test_procesar_notificaciones_envia_con_una_conexion(notificaciones_individuales, entrega_con_correo):
+    from django.core import mail
+    from django.core.management import call_command
+    from models.entrega.models import NotificacionEntrega
+    entrega_con_correo.estado = 'entregado'
+    entrega_con_correo.save()
+
+    call_command('enviar_notificaciones')
+
+    assert len(mail.outbox) == 2
+    assert mail.outbox[1].to == ['cliente@example.com']
+    assert 'entregado' in mail.outbox[1].body
+    assert set(NotificacionEntrega.objects.values_list('estado', flat=True)) == {'enviada'}
+
+@pytest.mark.django_db
+def test_procesar_notificaciones_reintenta_con_espera(notificaciones_individuales, entrega_con_correo, settings):
+    from django.utils import timezone
+    from models.entrega.models import NotificacionEntrega
+    from models.entrega.utils import procesar_notificaciones_pendientes
+
+    class ConexionCaida:
+        def open(self): pass
+        def close(self): pass
+        def send_messages(self, mensajes): raise ConnectionError('SMTP no disponible')
+
+    settings.NOTIFICACIONES_MAX_INTENTOS = 2
+    assert procesar_notificaciones_pendientes(connection=ConexionCaida()) == (0, 1)
+    notificacion = NotificacionEntrega.objects.get()
+    assert notificacion.estado == 'pendiente'
+    assert notificacion.intentos == 1
+    assert notificacion.proximo_intento > timezone.now()
+    assert procesar_notificaciones_pendientes(connection=ConexionCaida()) == (0, 0)
+
+    NotificacionEntrega.objects.update(proximo_intento=timezone.now())
+    procesar_notificaciones_pendientes(connection=ConexionCaida())
+    notificacion.refresh_from_db()
+    assert notificacion.estado == 'fallida'
+    assert notificacion.ultimo_error == 'SMTP no disponible'
+
+@pytest.mark.django_db
+def test_resumen_agrupa_cambios_del_cliente_en_un_correo(entrega_con_correo, crear_cliente, settings, monkeypatch):
+    from django.core import mail
+    from django.utils import timezone
+    from models.entrega import utils
+    from models.entrega.models import NotificacionEntrega
+    from models.entrega.utils import procesar_notificaciones_pendientes
+
+    otro_pedido = Pedido.objects.create(cliente=crear_cliente, direccion_envio='Calle 2', monto_total=50.00)
+    otra_entrega = Entrega.objects.create(pedido=otro_pedido, estado='pendiente')
+    for estado in ('en_camino', 'entregado'):
+        entrega_con_correo.estado = estado
+        entrega_con_correo.save()
+    otra_entrega.estado = 'en_camino'
+    otra_entrega.save()
+
+    # Dentro de la ventana no sale nada
+    assert procesar_notificaciones_pendientes() == (0, 0)
+    assert len(mail.outbox) == 0
+
+    renderizados = []
+    render_original = utils.render_to_string
+    monkeypatch.setattr(utils, 'render_to_string', lambda *a, **k: renderizados.append(a[0]) or render_original(*a, **k))
+
+    # Al vencer la primera se envían todas las del cliente, aunque las demás no hayan vencido
+    primera = NotificacionEntrega.objects.order_by('id').first()
+    NotificacionEntrega.objects.filter(id=primera.id).update(proximo_intento=timezone.now())
+    assert procesar_notificaciones_pendientes() == (5, 0)
+
+    assert len(mail.outbox) == 1
+    assert renderizados == ['emails/resumenEstados.html']
+    cuerpo = mail.outbox[0].body
+    assert 'pendiente → en_camino → entregado' in cuerpo
+    assert f"Pedido #{otro_pedido.id}" in cuerpo
+    assert set(NotificacionEntrega.objects.values_list('estado', flat=True)) == {'enviada'}
+
+@pytest.mark.django_db
+def test_resumen_de_una_entrega_usa_correo_individual(entrega_con_correo):
+    from django.core import mail
+    from django.utils import timezone
+    from models.entrega.models import NotificacionEntrega
+    from models.entrega.utils import procesar_notificaciones_pendientes
+
+    entrega_con_correo.estado = 'en_camino'
+    entrega_con_correo.save()
+    NotificacionEntrega.objects.update(proximo_intento=timezone.now())
+
+    assert procesar_notificaciones_pendientes() == (2, 0)
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].subject == f"Estado de tu entrega del pedido #{entrega_con_correo.pedido.id}"
+    assert 'pendiente → en_camino' in mail.outbox[0].body
+
+@pytest.mark.django_db
+def test_resumen_no_adelanta_reintentos(entrega_con_correo, crear_cliente):
+    from datetime import timedelta
+    from django.core import mail
+    from django.utils import timezone
+    from models.entrega.models import NotificacionEntrega
+    from models.entrega.utils import procesar_notificaciones_pendientes
+
+    otra_entrega = Entrega.objects.create(
+        pedido=Pedido.objects.create(cliente=crear_cliente, direccion_envio='Calle 2', monto_total=50.00),
+    )
+    en_espera, vencida = NotificacionEntrega.objects.order_by('id')
+    NotificacionEntrega.objects.filter(id=en_espera.id).update(intentos=1, proximo_intento=timezone.now() + timedelta(hours=1))
+    NotificacionEntrega.objects.filter(id=vencida.id).update(proximo_intento=timezone.now())
+
+    assert procesar_notificaciones_pendientes() == (1, 0)
+    assert f"pedido #{otra_entrega.pedido.id}" in mail.outbox[0].subject
+    assert NotificacionEntrega.objects.get(id=en_espera.id).estado == 'pendiente'
+
+@pytest.mark.django_db
+def test_transicion_entregada_cierra_pedido(notificaciones_individuales, api_client, entrega_con_correo):
+    from models.entrega.models import NotificacionEntrega
+    url = reverse('entrega-transicion', args=[entrega_con_correo.id])
+    assert api_client.post(url, {"estado": "entregado", "desde": "en_camino"}, format='json').status_code == 409
+
+    assert api_client.post(url, {"estado": "en_camino"}, format='json').data['permitidas'] == ['problema', 'entregado']
+    response = api_client.post(url, {"estado": "entregado"}, format='json')
+    assert response.status_code == 200
+    assert response.data['anterior'] == 'en_camino'
+
+    entrega = Entrega.objects.select_related('pedido').get()
+    assert entrega.estado == 'entregado' and entrega.fecha_entrega is not None
+    assert entrega.pedido.estado == 'entregado'
+    assert list(NotificacionEntrega.objects.values_list('estado_entrega', flat=True)) == [
+        'pendiente', 'en_camino', 'entregado'
+    ]
+
+@pytest.mark.django_db
+def test_repartidor_no_reabre_entrega_con_problema(entrega_con_correo):
+    from models.comun.transiciones import RolNoAutorizado
+    from models.entrega.transiciones import maquina_entrega
+    maquina_entrega.transicionar(Entrega.objects.all(), entrega_con_correo.pk, 'problema', 'repartidor')
+    with pytest.raises(RolNoAutorizado):
+        maquina_entrega.transicionar(Entrega.objects.all(), entrega_con_correo.pk, 'pendiente', 'repartidor')
+    assert maquina_entrega.permitidas('problema', 'repartidor') == ['en_camino']
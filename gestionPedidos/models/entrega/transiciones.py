@@ -0,0 +1,53 @@
+# models/entrega/transiciones.py
+
+from django.utils import timezone
+
+from models.comun.transiciones import (
+    ADMIN, REPARTIDOR, SISTEMA, MaquinaEstados, RolNoAutorizado, Transicion, TransicionNoPermitida,
+)
+from models.pedido.models import Pedido
+from models.pedido.transiciones import maquina_pedido
+from models.reporte import cache
+from .models import Entrega
+from .utils import encolar_notificacion
+
+
+def _notificar_cliente(fila, transicion):
+    encolar_notificacion(fila['pk'], fila['pedido__cliente__email'], transicion.destino)
+
+
+def _invalidar_reportes(fila, transicion):
+    cache.invalidar('entregas')
+
+
+def _cerrar_pedido(fila, transicion):
+    # Un pedido cancelado no se reabre: la entrega queda registrada igualmente
+    try:
+        maquina_pedido.transicionar(Pedido.objects.all(), fila['pedido_id'], 'entregado', SISTEMA)
+    except (TransicionNoPermitida, RolNoAutorizado):
+        pass
+
+
+def _fecha_entrega():
+    return {'fecha_entrega': timezone.now()}
+
+
+_OPERACION = frozenset({ADMIN, REPARTIDOR})
+
+TRANSICIONES_ENTREGA = [
+    Transicion('pendiente', 'en_camino', _OPERACION),
+    Transicion('pendiente', 'problema', _OPERACION),
+    Transicion('en_camino', 'problema', _OPERACION),
+    Transicion('problema', 'en_camino', _OPERACION),
+    Transicion('problema', 'pendiente', frozenset({ADMIN})),
+    Transicion('en_camino', 'entregado', _OPERACION, efectos=(_cerrar_pedido,), valores=_fecha_entrega),
+    # Entregas registradas a posteriori por la administración
+    Transicion('pendiente', 'entregado', frozenset({ADMIN}), efectos=(_cerrar_pedido,), valores=_fecha_entrega),
+]
+
+maquina_entrega = MaquinaEstados(
+    Entrega,
+    TRANSICIONES_ENTREGA,
+    campos_contexto=('pedido_id', 'pedido__cliente__email'),
+    efectos=(_notificar_cliente, _invalidar_reportes),
+)
@@ -1,39 +1,220 @@
-from django.core.mail import EmailMessage
+from datetime import timedelta
+from itertools import groupby
+
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.utils import timezone
 
-def enviar_notificacion_entrega(entrega):
-    cliente = entrega.pedido.cliente
-    email_cliente = cliente.email
 
-    if not email_cliente:
-        print("Cliente sin correo electrónico.")
-        return
+def _datos_cliente(cliente, email_cliente):
+    return {
+        'nombre': cliente.get_full_name() or cliente.username,
+        'email': email_cliente,
+        'telefono': getattr(getattr(cliente, 'perfil', None), 'telefono', None) or 'No proporcionado',
+    }
 
-    asunto = f"Estado de tu entrega del pedido #{entrega.pedido.id}"
 
-    mensaje_html = render_to_string('emails/notificacionEstado.html', {
-        'cliente': {
-            'nombre': cliente.get_full_name() or cliente.username,
-            'email': cliente.email,
-            'telefono': getattr(cliente.perfil, 'telefono', 'No proporcionado'),
-        },
-        'estado': entrega.estado,
-        'fecha_pedido': entrega.pedido.fecha_pedido.strftime('%d/%m/%Y %H:%M'),
-        'direccion': entrega.pedido.direccion_envio,
-        'monto_total': entrega.pedido.monto_total,
-    })
+def _datos_pedido(pedido):
+    return {
+        'fecha_pedido': pedido.fecha_pedido.strftime('%d/%m/%Y %H:%M'),
+        'direccion': pedido.direccion_envio,
+        'monto_total': pedido.monto_total,
+    }
 
+
+def _correo_html(asunto, mensaje_html, destinatario):
     email = EmailMessage(
         subject=asunto,
         body=mensaje_html,
         from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[email_cliente],
+        to=[destinatario],
     )
     email.content_subtype = 'html'
+    return email
+
+
+def construir_notificacion_entrega(entrega, estado=None, destinatario=None, estados_anteriores=()):
+    """
+    Construye el correo HTML de cambio de estado de una entrega, o devuelve None
+    si el cliente no tiene correo electrónico. 'estados_anteriores' son los estados
+    por los que pasó antes de 'estado' desde la última notificación (resúmenes).
+    """
+    cliente = entrega.pedido.cliente
+    email_cliente = destinatario or cliente.email
+
+    if not email_cliente:
+        return None
+
+    asunto = f"Estado de tu entrega del pedido #{entrega.pedido.id}"
+
+    mensaje_html = render_to_string('emails/notificacionEstado.html', {
+        'cliente': _datos_cliente(cliente, email_cliente),
+        'estado': estado or entrega.estado,
+        'estados_anteriores': list(estados_anteriores),
+        **_datos_pedido(entrega.pedido),
+    })
+    return _correo_html(asunto, mensaje_html, email_cliente)
+
+
+def construir_resumen_entregas(notificaciones):
+    """
+    Construye un único correo con los cambios de estado de varias notificaciones del
+    mismo destinatario. Los cambios de una misma entrega se agrupan en su secuencia de
+    estados; con una sola entrega se usa el correo de cambio de estado habitual, también
+    con su secuencia. La plantilla se renderiza una vez por resumen.
+    """
+    notificaciones = sorted(notificaciones, key=lambda n: (n.entrega.pedido_id, n.fecha_creacion, n.id))
+    destinatario = notificaciones[0].destinatario
+
+    entregas = []
+    for _, grupo in groupby(notificaciones, key=lambda n: n.entrega.pedido_id):
+        grupo = list(grupo)
+        estados = [grupo[0].estado_entrega]
+        for notificacion in grupo[1:]:
+            if notificacion.estado_entrega != estados[-1]:
+                estados.append(notificacion.estado_entrega)
+        entregas.append((grupo[0].entrega, estados))
+
+    if len(entregas) == 1:
+        entrega, estados = entregas[0]
+        return construir_notificacion_entrega(entrega, estados[-1], destinatario, estados[:-1])
+
+    mensaje_html = render_to_string('emails/resumenEstados.html', {
+        'cliente': _datos_cliente(entregas[0][0].pedido.cliente, destinatario),
+        'entregas': [
+            {
+                'pedido': entrega.pedido.id,
+                'estado': estados[-1],
+                'estados_anteriores': estados[:-1],
+                **_datos_pedido(entrega.pedido),
+            }
+            for entrega, estados in entregas
+        ],
+    })
+    return _correo_html(f"Estado de tus entregas ({len(entregas)} pedidos)", mensaje_html, destinatario)
+
+
+def encolar_notificacion_entrega(entrega):
+    """
+    Registra la notificación en la bandeja de salida. Se ejecuta dentro de la
+    transacción que guarda la Entrega, así que solo queda si el cambio se confirma.
+    """
+    return encolar_notificacion(entrega.pk, entrega.pedido.cliente.email, entrega.estado)
+
+
+def encolar_notificacion(entrega_id, email_cliente, estado):
+    """
+    Igual que encolar_notificacion_entrega a partir de los datos ya leídos, para las
+    transiciones de estado que no cargan la Entrega.
+    """
+    from .models import NotificacionEntrega
+
+    if not email_cliente:
+        return None
+    # En modo resumen la notificación espera la ventana para juntarse con las siguientes
+    return NotificacionEntrega.objects.create(
+        entrega_id=entrega_id,
+        destinatario=email_cliente,
+        estado_entrega=estado,
+        proximo_intento=timezone.now() + timedelta(seconds=_ventana_resumen()),
+    )
+
+
+def _ventana_resumen():
+    return getattr(settings, 'NOTIFICACIONES_VENTANA_RESUMEN_SEGUNDOS', 0)
+
+
+def _espera_reintento(intentos):
+    base = getattr(settings, 'NOTIFICACIONES_REINTENTO_BASE_SEGUNDOS', 30)
+    return timedelta(seconds=min(base * 2 ** (intentos - 1), 6 * 60 * 60))
+
+
+def _agrupar_pendientes(pendientes):
+    """
+    Grupos de notificaciones que salen en un mismo correo. Con
+    NOTIFICACIONES_VENTANA_RESUMEN_SEGUNDOS > 0 se juntan las pendientes de cada
+    destinatario con alguna vencida: las vencidas y las nuevas que aún esperan su
+    ventana. Las que esperan un reintento no se adelantan. Si no hay ventana, cada
+    notificación va en su propio correo.
+    """
+    from .models import NotificacionEntrega
+
+    if not _ventana_resumen():
+        return [[notificacion] for notificacion in pendientes]
+
+    ahora = timezone.now()
+
+    destinatarios = list(dict.fromkeys(notificacion.destinatario for notificacion in pendientes))
+    por_destinatario = {destinatario: [] for destinatario in destinatarios}
+    for notificacion in (
+        NotificacionEntrega.objects
+        .filter(estado='pendiente', destinatario__in=destinatarios)
+        .filter(Q(proximo_intento__lte=ahora) | Q(intentos=0))
+        .select_related('entrega__pedido__cliente__perfil')
+        .order_by('fecha_creacion', 'id')
+    ):
+        por_destinatario[notificacion.destinatario].append(notificacion)
+    return list(por_destinatario.values())
+
+
+def notificaciones_vencidas(ahora):
+    """
+    Notificaciones pendientes cuyo envío (o reintento) ya venció, en orden de envío.
+    """
+    from .models import NotificacionEntrega
+
+    return (
+        NotificacionEntrega.objects
+        .filter(estado='pendiente', proximo_intento__lte=ahora)
+        .select_related('entrega__pedido__cliente__perfil')
+        .order_by('proximo_intento', 'id')
+    )
+
+
+def procesar_notificaciones_pendientes(lote=100, connection=None):
+    """
+    Envía las notificaciones pendientes reutilizando una sola conexión SMTP, hasta
+    'lote' notificaciones vencidas (en modo resumen, los destinatarios de esas
+    notificaciones). Cada grupo (ver _agrupar_pendientes) sale en un único correo.
+    Los fallos se reintentan con espera exponencial hasta NOTIFICACIONES_MAX_INTENTOS.
+    Devuelve (enviadas, fallidas), contadas por notificación.
+    """
+    from .models import NotificacionEntrega
+
+    pendientes = list(notificaciones_vencidas(timezone.now())[:lote])
+    if not pendientes:
+        return 0, 0
 
+    max_intentos = getattr(settings, 'NOTIFICACIONES_MAX_INTENTOS', 5)
+    enviadas = fallidas = 0
+    connection = connection or get_connection()
     try:
-        email.send()
-        print(f"Correo HTML enviado a {email_cliente}")
-    except Exception as e:
-        print(f"Error al enviar correo: {e}")
+        connection.open()
+        for grupo in _agrupar_pendientes(pendientes):
+            for notificacion in grupo:
+                notificacion.intentos += 1
+            try:
+                connection.send_messages([construir_resumen_entregas(grupo)])
+            except Exception as e:
+                fallidas += len(grupo)
+                for notificacion in grupo:
+                    notificacion.ultimo_error = str(e)
+                    if notificacion.intentos >= max_intentos:
+                        notificacion.estado = 'fallida'
+                    else:
+                        notificacion.proximo_intento = timezone.now() + _espera_reintento(notificacion.intentos)
+            else:
+                enviadas += len(grupo)
+                fecha_envio = timezone.now()
+                for notificacion in grupo:
+                    notificacion.estado = 'enviada'
+                    notificacion.ultimo_error = ''
+                    notificacion.fecha_envio = fecha_envio
+            NotificacionEntrega.objects.bulk_update(
+                grupo, ['estado', 'intentos', 'proximo_intento', 'ultimo_error', 'fecha_envio']
+            )
+    finally:
+        connection.close()
+    return enviadas, fallidas
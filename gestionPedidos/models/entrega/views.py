@@ -1,13 +1,13 @@
 # models/entrega/views.py
 
 from rest_framework import viewsets
+from django.db import transaction
 from .models import Entrega
 from .serializers import EntregaSerializer 
+from .transiciones import maquina_entrega
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import HttpResponse
-from django.template.loader import get_template
-from xhtml2pdf import pisa
+from django.http import FileResponse, HttpResponse
 
 from models.perfil.permissions import (
     EsAdministrador,
@@ -16,10 +16,44 @@ from models.perfil.permissions import (
     EsRepartidorAsignado,
 )
 from rest_framework.permissions import IsAuthenticated
+from models.comun.asincrono import LecturaAsincronaView
+from models.comun.consultas import ConsultaOptimizadaMixin
+from models.comun.streaming import formato_streaming, respuesta_streaming
+from models.comun.transiciones import TransicionesMixin
+from models.reporte.pdf import generar_pdf_cacheado
 
-class EntregaViewSet(viewsets.ModelViewSet):
+
+def entregas_visibles(usuario_actual):
+    """
+    Entregas que el usuario puede ver según su rol. Se usa en get_queryset y en los
+    trabajos de reporte que se generan fuera de la petición.
+    """
+    from django.conf import settings
+    if getattr(settings, 'TESTING', False):
+        return Entrega.objects.all()
+
+    if not usuario_actual or not usuario_actual.is_authenticated or not hasattr(usuario_actual, 'perfil'):
+         return Entrega.objects.none()
+
+    rol_usuario = usuario_actual.perfil.rol
+
+    if rol_usuario == 'admin':
+
+        return Entrega.objects.all()
+    elif rol_usuario == 'repartidor':
+        return Entrega.objects.filter(asignado_a_id=usuario_actual.id)
+    elif rol_usuario == 'cliente':
+
+        return Entrega.objects.filter(pedido__cliente_id=usuario_actual.id)
+
+    return Entrega.objects.none()
+
+
+class EntregaViewSet(TransicionesMixin, ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = Entrega.objects.all()
     serializer_class = EntregaSerializer
+    # Los cambios de estado (PUT/PATCH y POST .../transicion/) pasan por la máquina de estados
+    maquina_estados = maquina_entrega
 
     def get_permissions(self):
         from django.conf import settings
@@ -44,47 +78,44 @@ class EntregaViewSet(viewsets.ModelViewSet):
             return [UsuarioConPerfilAutenticado()]
 
     def get_queryset(self):
-        from django.conf import settings
-        if getattr(settings, 'TESTING', False):
-            return Entrega.objects.all()
         """
         Filtra el conjunto de Entregas que se retorna para las acciones 'list' y 'retrieve'
         basándose en el rol del usuario autenticado.
         """
-        usuario_actual = self.request.user
-        if not usuario_actual or not usuario_actual.is_authenticated or not hasattr(usuario_actual, 'perfil'):
-             return Entrega.objects.none()
-
-        rol_usuario = usuario_actual.perfil.rol
-
-        if rol_usuario == 'admin':
-          
-            return Entrega.objects.all()
-        elif rol_usuario == 'repartidor':
-            return Entrega.objects.filter(asignado_a=usuario_actual)
-        elif rol_usuario == 'cliente':
-           
-            return Entrega.objects.filter(pedido__cliente=usuario_actual)
-      
-        return Entrega.objects.none()
+        return entregas_visibles(self.request.user)
     
+    def perform_create(self, serializer):
+        # La Entrega y su notificación en la bandeja de salida se guardan juntas
+        with transaction.atomic():
+            serializer.save()
+
     @action(detail=False, methods=['get'], url_path='reporte/json')
     def reporte_json(self, request):
-        entregas = self.get_queryset()
+        """
+        Reporte en JSON. Con '?streaming=json' o '?streaming=ndjson' las filas se
+        serializan por bloques en un StreamingHttpResponse en lugar de cargarse todas en memoria.
+        """
+        entregas = self.filter_queryset(self.get_queryset())
+        formato = formato_streaming(request)
+        if formato:
+            return respuesta_streaming(request, entregas, self.get_serializer(), formato, 'reporte_entregas')
         serializer = self.get_serializer(entregas, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='reporte/pdf')
     def reporte_pdf(self, request):
+        """
+        Genera el PDF dentro de la petición. Para reportes grandes conviene usar
+        POST /api/reportes/ (models.reporte), que lo genera en segundo plano.
+        """
         entregas = self.get_queryset()
-        template = get_template('entrega/reporte_entregas.html')
-        html = template.render({'entregas': entregas})
-        
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="reporte_entregas.pdf"'
-        
-        pisa_status = pisa.CreatePDF(html, dest=response)
-        if pisa_status.err:
+
+        archivo = generar_pdf_cacheado('entregas', entregas)
+        if archivo is None:
             return HttpResponse('Error al generar el PDF', status=500)
-        return response
+        return FileResponse(archivo, as_attachment=True, filename='reporte_entregas.pdf', content_type='application/pdf')
+
 
+class EntregaListaAsincrona(LecturaAsincronaView):
+    viewset = EntregaViewSet
+    accion = 'list'
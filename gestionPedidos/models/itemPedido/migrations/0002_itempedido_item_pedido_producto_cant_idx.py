@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('itemPedido', '0001_initial'),
+        ('pedido', '0005_pedido_pedido_cliente_fecha_idx_and_more'),
+        ('producto', '0004_producto_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='itempedido',
+            index=models.Index(fields=['pedido', 'producto', 'cantidad'], name='item_pedido_producto_cant_idx'),
+        ),
+    ]
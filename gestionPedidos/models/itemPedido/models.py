@@ -1,13 +1,20 @@
 from django.db import models
 from models.producto.models import Producto
 from models.pedido.models import Pedido
+from models.comun.cambios import SeguimientoCambiosMixin
 
-class ItemPedido(models.Model):
+class ItemPedido(SeguimientoCambiosMixin, models.Model):
     pedido = models.ForeignKey(Pedido, on_delete=models.CASCADE, related_name='items')
     producto = models.ForeignKey(Producto, on_delete=models.CASCADE)
     cantidad = models.PositiveIntegerField()
     precio_al_comprar = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            # Cubre la suma de cantidades por producto al cancelar pedidos
+            models.Index(fields=['pedido', 'producto', 'cantidad'], name='item_pedido_producto_cant_idx'),
+        ]
+
     def __str__(self):
         return f"{self.cantidad} x {self.producto.nombre} en el Pedido #{self.pedido.id}"
 
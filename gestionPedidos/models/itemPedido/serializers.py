@@ -2,8 +2,9 @@ from rest_framework import serializers
 from .models import ItemPedido
 from ..producto.serializers import ProductoSerializer 
 from ..producto.models import Producto
+from ..comun.campos import CamposDinamicosMixin
 
-class ItemPedidoSerializer(serializers.ModelSerializer):
+class ItemPedidoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     producto = serializers.PrimaryKeyRelatedField(queryset=Producto.objects.all())
 
     producto_detalle = ProductoSerializer(read_only=True, source='producto')
@@ -11,4 +12,5 @@ class ItemPedidoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ItemPedido
-        fields = ['id', 'pedido', 'producto','producto_detalle', 'producto_id', 'cantidad', 'precio_al_comprar']
\ No newline at end of file
+        fields = ['id', 'pedido', 'producto','producto_detalle', 'producto_id', 'cantidad', 'precio_al_comprar']
+        campos_expandibles = ['producto_detalle']
\ No newline at end of file
@@ -61,9 +61,9 @@ def test_listar_items_pedido(api_client, crear_pedido, crear_producto):
     )
     response = api_client.get(url)
     assert response.status_code == 200
-    assert len(response.data) > 0
-    assert response.data[0]['pedido'] == crear_pedido.id
-    assert response.data[0]['producto'] == crear_producto.id
+    assert len(response.data['results']) > 0
+    assert response.data['results'][0]['pedido'] == crear_pedido.id
+    assert response.data['results'][0]['producto'] == crear_producto.id
 
 @pytest.mark.django_db
 def test_actualizar_item_pedido(api_client, crear_pedido, crear_producto):
@@ -12,8 +12,9 @@ from models.perfil.permissions import (
 )
 # Importa permisos básicos si son necesarios
 from rest_framework.permissions import IsAuthenticated
+from models.comun.consultas import ConsultaOptimizadaMixin
 
-class ItemPedidoViewSet(viewsets.ModelViewSet):
+class ItemPedidoViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = ItemPedido.objects.all()
     serializer_class = ItemPedidoSerializer
     def get_permissions(self):
@@ -47,10 +48,10 @@ class ItemPedidoViewSet(viewsets.ModelViewSet):
         if rol_usuario == 'admin':
             return ItemPedido.objects.all()
         elif rol_usuario == 'cliente':
-            return ItemPedido.objects.filter(pedido__cliente=usuario_actual) 
+            return ItemPedido.objects.filter(pedido__cliente_id=usuario_actual.id) 
         elif rol_usuario == 'repartidor':
         
-             return ItemPedido.objects.filter(pedido__entrega__asignado_a=usuario_actual).distinct() 
+             return ItemPedido.objects.filter(pedido__entrega__asignado_a_id=usuario_actual.id).distinct() 
 
      
         return ItemPedido.objects.none()
@@ -1,5 +1,6 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import Pedido
+from .cancelacion import cancelar_pedidos
 
 @admin.register(Pedido)
 class PedidoAdmin(admin.ModelAdmin):
@@ -7,3 +8,15 @@ class PedidoAdmin(admin.ModelAdmin):
     list_filter = ('estado', 'fecha_pedido')
     search_fields = ('id', 'cliente__username', 'direccion_envio')
     date_hierarchy = 'fecha_pedido'
+    # Mismo orden que la API: el filtro por fecha recorre pedido_fecha_idx en lugar de la tabla
+    ordering = ('-fecha_pedido', '-id')
+    actions = ['cancelar_con_stock']
+
+    @admin.action(description='Cancelar pedidos seleccionados (restaurando stock)')
+    def cancelar_con_stock(self, request, queryset):
+        cancelados, rechazados = cancelar_pedidos(list(queryset.values_list('id', flat=True)))
+        self.message_user(request, f"{len(cancelados)} pedido(s) cancelado(s).")
+        if rechazados:
+            self.message_user(
+                request, f"{len(rechazados)} pedido(s) no se pueden cancelar en su estado actual.", level=messages.WARNING
+            )
@@ -0,0 +1,51 @@
+# models/pedido/cancelacion.py
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Pedido
+from .transiciones import cantidades_por_producto, maquina_pedido
+from models.comun.transiciones import ADMIN
+from models.producto.inventario import liberar_stock
+from models.reporte import cache
+from models.ventas.acumulados import registrar_cambio_estado
+
+
+def cancelar_pedidos(pedido_ids, rol=ADMIN):
+    """
+    Cancela los pedidos indicados y restaura su stock.
+
+    Solo se cancelan los pedidos cuyo estado permite pasar a 'cancelado' para 'rol'
+    según TRANSICIONES_PEDIDO (models.pedido.transiciones); los demás se rechazan.
+    Cada pedido se marca con un UPDATE condicional sobre el estado leído, así que un
+    pedido que otra petición ya canceló o cambió no devuelve stock dos veces. El
+    stock de todos los pedidos cancelados se restaura con un único UPDATE agregado y
+    los acumulados de ventas se mueven al estado 'cancelado'.
+    Devuelve (ids cancelados por esta llamada, ids rechazados por su estado).
+    """
+    origenes = maquina_pedido.origenes('cancelado', rol)
+    ahora = timezone.now()
+    with transaction.atomic():
+        filas = (
+            Pedido.objects.filter(id__in=pedido_ids).exclude(estado='cancelado')
+            .values_list('id', 'fecha_pedido', 'estado', 'monto_total')
+        )
+        anteriores = {}
+        rechazados = []
+        for fila in filas:
+            if fila[2] in origenes:
+                anteriores[fila[0]] = fila
+            else:
+                rechazados.append(fila[0])
+        cancelados = [
+            anteriores[pedido_id] for pedido_id in pedido_ids
+            if pedido_id in anteriores and Pedido.objects.filter(id=pedido_id, estado=anteriores[pedido_id][2]).update(
+                estado='cancelado', fecha_actualizacion=ahora
+            )
+        ]
+        if cancelados:
+            liberar_stock(cantidades_por_producto([fila[0] for fila in cancelados]))
+            registrar_cambio_estado(cancelados, 'cancelado')
+            cache.invalidar('pedidos')
+            cache.invalidar('entregas')
+    return [fila[0] for fila in cancelados], sorted(rechazados)
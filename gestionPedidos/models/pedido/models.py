@@ -1,7 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
+from models.comun.cambios import SeguimientoCambiosMixin
 
-class Pedido(models.Model):
+class Pedido(SeguimientoCambiosMixin, models.Model):
     ESTADOS_PEDIDO = [
         ('pendiente', 'Pendiente'),
         ('en_proceso', 'En Proceso'),
@@ -13,6 +14,16 @@ class Pedido(models.Model):
     estado = models.CharField(max_length=20, choices=ESTADOS_PEDIDO, default='pendiente')
     direccion_envio = models.TextField()
     monto_total = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Pedidos del cliente ordenados por fecha (listado y cursor)
+            models.Index(fields=['cliente', 'fecha_pedido'], name='pedido_cliente_fecha_idx'),
+            # Filtros del admin por estado y por fecha
+            models.Index(fields=['estado', 'fecha_pedido'], name='pedido_estado_fecha_idx'),
+            models.Index(fields=['fecha_pedido'], name='pedido_fecha_idx'),
+        ]
 
     def __str__(self):
         return f"Pedido #{self.id} - {self.cliente.username}"
@@ -2,9 +2,10 @@ from rest_framework import serializers
 from .models import Pedido
 from ..itemPedido.serializers import ItemPedidoSerializer
 from ..perfil.serializers import PerfilUsuarioSerializer
+from ..comun.campos import CamposDinamicosMixin
 from django.contrib.auth.models import User
 
-class PedidoSerializer(serializers.ModelSerializer):
+class PedidoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     items = ItemPedidoSerializer(many=True, read_only=True)
     cliente_detalle = PerfilUsuarioSerializer(read_only=True, source='cliente.perfil')
     cliente = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
@@ -12,3 +13,4 @@ class PedidoSerializer(serializers.ModelSerializer):
     class Meta:
         model = Pedido
         fields = ['id', 'cliente', 'cliente_detalle', 'fecha_pedido', 'estado', 'direccion_envio', 'monto_total', 'items']
+        campos_expandibles = ['cliente_detalle', 'items']
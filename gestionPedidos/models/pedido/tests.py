@@ -169,3 +169,417 @@ def test_crear_pedido_stock_insuficiente(api_client, crear_cliente, crear_produc
     response = api_client.post(url, data, format='json')
     assert response.status_code == 400
     assert "Stock insuficiente" in response.data['detail']
+
+def _crear_pedidos_con_items(cantidad, producto):
+    from models.perfil.models import PerfilUsuario
+    inicio = Pedido.objects.count()
+    for indice in range(inicio, inicio + cantidad):
+        cliente = User.objects.create_user(username=f'cliente{indice}', password='testpassword')
+        PerfilUsuario.objects.create(usuario=cliente, rol='cliente')
+        pedido = Pedido.objects.create(cliente=cliente, direccion_envio='Calle 1', monto_total=200.00)
+        ItemPedido.objects.create(pedido=pedido, producto=producto, cantidad=1, precio_al_comprar=producto.precio)
+        ItemPedido.objects.create(pedido=pedido, producto=producto, cantidad=2, precio_al_comprar=producto.precio)
+
+def _contar_consultas(api_client, url):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as contexto:
+        response = api_client.get(url)
+    assert response.status_code == 200
+    return len(contexto.captured_queries), response
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('nombre_url', ['pedido-list', 'pedido-reporte-json'])
+def test_listado_pedidos_consultas_constantes(api_client, crear_producto, nombre_url):
+    """El número de consultas no crece con la cantidad de pedidos listados."""
+    url = reverse(nombre_url)
+    _crear_pedidos_con_items(2, crear_producto)
+    consultas_pocos, _ = _contar_consultas(api_client, url)
+
+    _crear_pedidos_con_items(10, crear_producto)
+    consultas_muchos, response = _contar_consultas(api_client, url)
+
+    assert consultas_muchos == consultas_pocos
+    pedidos = response.data['results'] if nombre_url == 'pedido-list' else response.data
+    assert len(pedidos) == 12
+    assert pedidos[0]['cliente_detalle']['username'].startswith('cliente')
+    assert pedidos[0]['items'][0]['producto_detalle']['nombre'] == crear_producto.nombre
+
+@pytest.mark.django_db
+def test_listado_pedidos_asincrono_igual_al_sincrono(api_client, crear_producto):
+    import json
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+    _crear_pedidos_con_items(3, crear_producto)
+    sincrono = api_client.get(reverse('pedido-list'), {'page_size': 2})
+    response = async_to_sync(AsyncClient().get)(reverse('lectura-pedido-list'), {'page_size': 2})
+    assert response.status_code == 200
+    datos = json.loads(response.content)
+    assert datos['results'] == json.loads(sincrono.content)['results']
+    assert len(datos['results']) == 2 and datos['next']
+    siguiente = async_to_sync(AsyncClient().get)(datos['next'])
+    assert len(json.loads(siguiente.content)['results']) == 1
+
+@pytest.mark.django_db
+def test_detalle_pedido_consultas_fijas(api_client, crear_producto):
+    _crear_pedidos_con_items(1, crear_producto)
+    pedido = Pedido.objects.get()
+    consultas, response = _contar_consultas(api_client, reverse('pedido-detail', args=[pedido.id]))
+    assert consultas == 2
+    assert len(response.data['items']) == 2
+
+@pytest.mark.django_db
+def test_listado_pedidos_paginado_por_cursor(api_client, crear_producto):
+    _crear_pedidos_con_items(5, crear_producto)
+    url = reverse('pedido-list')
+
+    primera = api_client.get(url, {'page_size': 3})
+    assert primera.status_code == 200
+    assert len(primera.data['results']) == 3
+    assert primera.data['previous'] is None
+
+    segunda = api_client.get(primera.data['next'])
+    assert len(segunda.data['results']) == 2
+    assert segunda.data['next'] is None
+
+    ids = [p['id'] for p in primera.data['results'] + segunda.data['results']]
+    esperados = list(Pedido.objects.order_by('-fecha_pedido', '-id').values_list('id', flat=True))
+    assert ids == esperados
+
+@pytest.mark.django_db
+def test_cursor_estable_con_fechas_repetidas(api_client, crear_producto):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils import timezone
+    _crear_pedidos_con_items(5, crear_producto)
+    Pedido.objects.update(fecha_pedido=timezone.now())
+    esperados = list(Pedido.objects.order_by('-fecha_pedido', '-id').values_list('id', flat=True))
+
+    paginas = [api_client.get(reverse('pedido-list'), {'page_size': 2}).data]
+    while paginas[-1]['next']:
+        with CaptureQueriesContext(connection) as contexto:
+            paginas.append(api_client.get(paginas[-1]['next']).data)
+        assert not any('OFFSET' in consulta['sql'] for consulta in contexto.captured_queries)
+    assert [p['id'] for pagina in paginas for p in pagina['results']] == esperados
+
+    # Hacia atrás se obtienen las mismas páginas
+    anterior = api_client.get(paginas[-1]['previous']).data
+    assert [p['id'] for p in anterior['results']] == esperados[2:4]
+    assert api_client.get(reverse('pedido-list'), {'cursor': 'no-valido'}).status_code == 404
+
+@pytest.mark.django_db
+def test_listado_pedidos_sin_paginar(api_client, crear_producto):
+    _crear_pedidos_con_items(3, crear_producto)
+    response = api_client.get(reverse('pedido-list'), {'paginar': 'false'})
+    assert response.status_code == 200
+    assert len(response.data) == 3
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('formato', ['json', 'ndjson'])
+def test_reporte_json_streaming(api_client, crear_producto, formato, settings):
+    import json
+    settings.REPORTE_CHUNK_SIZE = 2
+    _crear_pedidos_con_items(5, crear_producto)
+    url = reverse('pedido-reporte-json')
+
+    esperado = api_client.get(url).data
+    response = api_client.get(url, {'streaming': formato})
+    assert response.status_code == 200
+    assert response.streaming
+    contenido = b''.join(response.streaming_content).decode()
+
+    if formato == 'json':
+        filas = json.loads(contenido)
+    else:
+        filas = [json.loads(linea) for linea in contenido.splitlines()]
+    assert filas == json.loads(json.dumps(esperado))
+
+@pytest.mark.django_db
+def test_reporte_json_streaming_asgi_envia_por_bloques(crear_producto, settings, monkeypatch):
+    import json
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+    from .serializers import PedidoSerializer
+    settings.REPORTE_CHUNK_SIZE = 2
+    _crear_pedidos_con_items(5, crear_producto)
+
+    serializadas = []
+    representar = PedidoSerializer.to_representation
+    def contar(self, instancia):
+        serializadas.append(instancia.pk)
+        return representar(self, instancia)
+    monkeypatch.setattr(PedidoSerializer, 'to_representation', contar)
+
+    async def leer():
+        response = await AsyncClient().get(reverse('pedido-reporte-json'), {'streaming': 'ndjson'})
+        assert response.is_async
+        bloques = []
+        async for bloque in response.streaming_content:
+            # El primer bloque sale cuando solo se han leído sus filas
+            bloques.append((bloque, len(serializadas)))
+        return bloques
+
+    bloques = async_to_sync(leer)()
+    assert [leidas for _, leidas in bloques] == [2, 4, 5, 5]
+    filas = [json.loads(linea) for linea in b''.join(bloque for bloque, _ in bloques).decode().splitlines()]
+    assert len(filas) == 5
+
+@pytest.mark.django_db
+def test_reporte_json_streaming_formato_invalido(api_client):
+    response = api_client.get(reverse('pedido-reporte-json'), {'streaming': 'xml'})
+    assert response.status_code == 400
+
+def _datos_pedido(cliente, items):
+    return {
+        "pedido": {
+            "cliente": cliente.id,
+            "estado": "pendiente",
+            "direccion_envio": "Dirección de prueba",
+            "monto_total": 100.00
+        },
+        "items": items
+    }
+
+@pytest.mark.django_db
+def test_crear_con_items_consultas_constantes(api_client, crear_cliente):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    productos = [Producto.objects.create(nombre=f'P{i}', precio=10, stock=50) for i in range(6)]
+    url = reverse('pedido-crear-con-items')
+
+    consultas = []
+    for cantidad_lineas in (1, 6):
+        items = [{"producto_id": p.id, "cantidad": 1} for p in productos[:cantidad_lineas]]
+        with CaptureQueriesContext(connection) as contexto:
+            response = api_client.post(url, _datos_pedido(crear_cliente, items), format='json')
+        assert response.status_code == 201
+        assert len(response.data['items']) == cantidad_lineas
+        consultas.append(len(contexto.captured_queries))
+
+    assert consultas[0] == consultas[1]
+
+@pytest.mark.django_db
+def test_crear_con_items_stock_insuficiente_no_descuenta_nada(api_client, crear_cliente, crear_producto):
+    otro = Producto.objects.create(nombre='Otro', precio=5, stock=100)
+    # Dos líneas del mismo producto suman 12 unidades y el stock es 10
+    items = [
+        {"producto_id": otro.id, "cantidad": 3},
+        {"producto_id": crear_producto.id, "cantidad": 6},
+        {"producto_id": crear_producto.id, "cantidad": 6},
+    ]
+    response = api_client.post(reverse('pedido-crear-con-items'), _datos_pedido(crear_cliente, items), format='json')
+    assert response.status_code == 400
+    assert "Stock insuficiente" in response.data['detail']
+
+    crear_producto.refresh_from_db()
+    otro.refresh_from_db()
+    assert (crear_producto.stock, otro.stock) == (10, 100)
+    assert not Pedido.objects.exists()
+
+@pytest.mark.django_db
+def test_crear_con_items_cantidad_invalida(api_client, crear_cliente, crear_producto):
+    items = [{"producto_id": crear_producto.id, "cantidad": -2}]
+    response = api_client.post(reverse('pedido-crear-con-items'), _datos_pedido(crear_cliente, items), format='json')
+    assert response.status_code == 400
+    crear_producto.refresh_from_db()
+    assert crear_producto.stock == 10
+
+@pytest.mark.django_db
+def test_cancelar_lote_restaura_stock_una_vez(api_client, crear_cliente, crear_producto):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    otro = Producto.objects.create(nombre='Otro', precio=5, stock=20)
+    url_crear = reverse('pedido-crear-con-items')
+    ids = []
+    for items in (
+        [{"producto_id": crear_producto.id, "cantidad": 2}, {"producto_id": otro.id, "cantidad": 1}],
+        [{"producto_id": crear_producto.id, "cantidad": 3}],
+        [{"producto_id": otro.id, "cantidad": 4}],
+    ):
+        ids.append(api_client.post(url_crear, _datos_pedido(crear_cliente, items), format='json').data['id'])
+
+    url = reverse('pedido-cancelar-lote')
+    with CaptureQueriesContext(connection) as contexto:
+        response = api_client.post(url, {"pedidos": ids[:2]}, format='json')
+    assert response.status_code == 200
+    assert response.data['cancelados'] == ids[:2]
+    actualizaciones_stock = [q for q in contexto.captured_queries if 'UPDATE "producto_producto"' in q['sql']]
+    assert len(actualizaciones_stock) == 1
+
+    # Repetir la cancelación no vuelve a sumar stock
+    response = api_client.post(url, {"pedidos": ids}, format='json')
+    assert response.data['cancelados'] == [ids[2]]
+
+    crear_producto.refresh_from_db()
+    otro.refresh_from_db()
+    assert (crear_producto.stock, otro.stock) == (10, 20)
+    assert set(Pedido.objects.values_list('estado', flat=True)) == {'cancelado'}
+
+@pytest.mark.django_db
+def test_cancelar_lote_rechaza_pedidos_entregados(api_client, crear_cliente, crear_producto):
+    url_crear = reverse('pedido-crear-con-items')
+    ids = [
+        api_client.post(url_crear, _datos_pedido(crear_cliente, [{"producto_id": crear_producto.id, "cantidad": 2}]), format='json').data['id']
+        for _ in range(2)
+    ]
+    Pedido.objects.filter(id=ids[0]).update(estado='entregado')
+
+    response = api_client.post(reverse('pedido-cancelar-lote'), {"pedidos": ids}, format='json')
+    assert response.data == {"cancelados": [ids[1]], "rechazados": [ids[0]]}
+    assert Pedido.objects.get(id=ids[0]).estado == 'entregado'
+    crear_producto.refresh_from_db()
+    assert crear_producto.stock == 8
+
+@pytest.mark.django_db
+def test_crear_lote_con_fallo_parcial(api_client, crear_cliente, crear_producto):
+    otro = Producto.objects.create(nombre='Otro', precio=5, stock=3)
+    lote = [
+        _datos_pedido(crear_cliente, [{"producto_id": crear_producto.id, "cantidad": 6}]),
+        # Solo quedan 4 unidades tras el primer pedido
+        _datos_pedido(crear_cliente, [{"producto_id": crear_producto.id, "cantidad": 5}]),
+        _datos_pedido(crear_cliente, [{"producto_id": crear_producto.id, "cantidad": 4}, {"producto_id": otro.id, "cantidad": 3}]),
+        _datos_pedido(crear_cliente, [{"producto_id": 9999, "cantidad": 1}]),
+        {"pedido": {"estado": "pendiente"}, "items": []},
+    ]
+    response = api_client.post(reverse('pedido-crear-lote'), lote, format='json')
+    assert response.status_code == 207
+    assert [r['estado'] for r in response.data] == ['creado', 'error', 'creado', 'error', 'error']
+    assert "Stock insuficiente" in response.data[1]['detail']
+    assert "no existe" in response.data[3]['detail']
+    assert 'cliente' in response.data[4]['errores']
+    assert len(response.data[2]['pedido']['items']) == 2
+
+    crear_producto.refresh_from_db()
+    otro.refresh_from_db()
+    assert (crear_producto.stock, otro.stock) == (0, 0)
+    assert Pedido.objects.count() == 2
+    assert ItemPedido.objects.count() == 3
+
+@pytest.mark.django_db
+def test_crear_lote_items_con_formato_invalido(api_client, crear_cliente, crear_producto):
+    valido = _datos_pedido(crear_cliente, [{"producto_id": crear_producto.id, "cantidad": 1}])
+    lote = [
+        {**valido, "items": [1]},
+        {**valido, "items": {"producto_id": crear_producto.id, "cantidad": 1}},
+        {**valido, "items": "x"},
+        valido,
+    ]
+    response = api_client.post(reverse('pedido-crear-lote'), lote, format='json')
+    assert response.status_code == 207
+    assert [r['estado'] for r in response.data] == ['error', 'error', 'error', 'creado']
+    assert Pedido.objects.count() == 1
+
+@pytest.mark.django_db
+def test_crear_lote_consultas_constantes(api_client, crear_cliente, crear_producto):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    url = reverse('pedido-crear-lote')
+    consultas = []
+    for tamano in (1, 8):
+        lote = [_datos_pedido(crear_cliente, [{"producto_id": crear_producto.id, "cantidad": 1}])] * tamano
+        crear_producto.stock = 100
+        crear_producto.save()
+        with CaptureQueriesContext(connection) as contexto:
+            response = api_client.post(url, lote, format='json')
+        assert response.status_code == 201
+        # La validación del cliente de cada pedido es la única consulta por pedido
+        consultas.append(len(contexto.captured_queries) - tamano)
+    assert consultas[0] == consultas[1]
+
+@pytest.mark.django_db
+def test_transicion_cancelar_es_idempotente(api_client, crear_cliente, crear_producto):
+    from models.ventas.models import VentaDiaria
+    pedido_id = api_client.post(
+        reverse('pedido-crear-con-items'),
+        _datos_pedido(crear_cliente, [{"producto_id": crear_producto.id, "cantidad": 3}]),
+        format='json',
+    ).data['id']
+    url = reverse('pedido-transicion', args=[pedido_id])
+
+    response = api_client.post(url, {"estado": "cancelado", "desde": "pendiente"}, format='json')
+    assert response.status_code == 200
+    assert response.data == {
+        'id': pedido_id, 'anterior': 'pendiente', 'estado': 'cancelado', 'cambiado': True, 'permitidas': [],
+    }
+    # Una segunda cancelación (p. ej. concurrente, que leyó 'pendiente') no devuelve stock otra vez
+    response = api_client.post(url, {"estado": "cancelado", "desde": "pendiente"}, format='json')
+    assert response.status_code == 200
+    assert response.data['cambiado'] is False
+
+    crear_producto.refresh_from_db()
+    assert crear_producto.stock == 10
+    assert list(VentaDiaria.objects.filter(pedidos__gt=0).values_list('estado', 'pedidos')) == [('cancelado', 1)]
+
+@pytest.mark.django_db
+def test_transicion_no_permitida(api_client, crear_item_pedido):
+    pedido = crear_item_pedido
+    url = reverse('pedido-transicion', args=[pedido.id])
+    assert api_client.post(url, {"estado": "enviado"}, format='json').status_code == 400
+    assert api_client.post(url, {"estado": "cancelado", "desde": "en_proceso"}, format='json').status_code == 409
+    assert api_client.post(url, {"estado": "cancelado"}, format='json').status_code == 200
+    assert api_client.post(url, {"estado": "en_proceso"}, format='json').status_code == 409
+    assert api_client.patch(
+        reverse('pedido-detail', args=[pedido.id]), {"estado": "pendiente"}, format='json'
+    ).status_code == 409
+    pedido.refresh_from_db()
+    assert pedido.estado == 'cancelado'
+
+@pytest.mark.django_db
+def test_transiciones_por_rol(crear_item_pedido):
+    from models.comun.transiciones import RolNoAutorizado
+    from .transiciones import maquina_pedido
+    pedido = crear_item_pedido
+    assert maquina_pedido.permitidas('pendiente', 'cliente') == ['cancelado']
+    with pytest.raises(RolNoAutorizado):
+        maquina_pedido.transicionar(Pedido.objects.all(), pedido.pk, 'en_proceso', 'cliente')
+    resultado = maquina_pedido.transicionar(Pedido.objects.all(), pedido.pk, 'cancelado', 'cliente')
+    assert (resultado.anterior, resultado.cambiado) == ('pendiente', True)
+
+    # Ya en el destino, un rol sin permiso recibe 403, no el no-op
+    Pedido.objects.filter(pk=pedido.pk).update(estado='en_proceso')
+    with pytest.raises(RolNoAutorizado):
+        maquina_pedido.transicionar(Pedido.objects.all(), pedido.pk, 'en_proceso', 'cliente')
+
+@pytest.mark.django_db
+def test_patch_concurrente_no_revierte_el_estado(api_client, crear_cliente, crear_producto, monkeypatch):
+    from .views import PedidoViewSet
+    pedido_id = api_client.post(
+        reverse('pedido-crear-con-items'),
+        _datos_pedido(crear_cliente, [{"producto_id": crear_producto.id, "cantidad": 3}]),
+        format='json',
+    ).data['id']
+    get_object = PedidoViewSet.get_object
+
+    def cancelado_tras_leer(self):
+        # Una cancelación termina entre la lectura del PATCH y su guardado
+        pedido = get_object(self)
+        APIClient().post(reverse('pedido-transicion', args=[pedido_id]), {"estado": "cancelado"}, format='json')
+        return pedido
+
+    monkeypatch.setattr(PedidoViewSet, 'get_object', cancelado_tras_leer)
+    response = api_client.patch(reverse('pedido-detail', args=[pedido_id]), {"direccion_envio": "Calle 9"}, format='json')
+    assert response.status_code == 200
+
+    pedido = Pedido.objects.get(pk=pedido_id)
+    assert (pedido.estado, pedido.direccion_envio) == ('cancelado', 'Calle 9')
+    crear_producto.refresh_from_db()
+    assert crear_producto.stock == 10
+
+@pytest.mark.django_db
+def test_transiciones_por_rol_desde_la_api(api_client, crear_item_pedido, settings):
+    from models.perfil.models import PerfilUsuario
+    settings.TESTING = False
+    pedido = crear_item_pedido
+    PerfilUsuario.objects.create(usuario=pedido.cliente, rol='cliente')
+    api_client.force_authenticate(pedido.cliente)
+    url = reverse('pedido-transicion', args=[pedido.id])
+
+    assert api_client.post(url, {"estado": "en_proceso"}, format='json').status_code == 403
+    response = api_client.patch(reverse('pedido-detail', args=[pedido.id]), {"estado": "en_proceso"}, format='json')
+    assert response.status_code == 403
+    pedido.refresh_from_db()
+    assert pedido.estado == 'pendiente'
+
+    response = api_client.post(url, {"estado": "cancelado"}, format='json')
+    assert response.status_code == 200
+    assert response.data['permitidas'] == []
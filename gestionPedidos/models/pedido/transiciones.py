@@ -0,0 +1,59 @@
+# models/pedido/transiciones.py
+
+from django.db.models import Sum
+
+from models.comun.transiciones import ADMIN, CLIENTE, SISTEMA, MaquinaEstados, Transicion
+from models.itemPedido.models import ItemPedido
+from models.producto.inventario import liberar_stock
+from models.reporte import cache
+from models.ventas.acumulados import registrar_cambio_estado
+from .models import Pedido
+
+
+def consulta_cantidades_por_producto(pedido_ids):
+    return (
+        ItemPedido.objects
+        .filter(pedido_id__in=pedido_ids)
+        .values('producto_id')
+        .annotate(total=Sum('cantidad'))
+    )
+
+
+def cantidades_por_producto(pedido_ids):
+    """
+    Unidades a devolver por producto para un conjunto de pedidos, agregadas en la base de datos.
+    """
+    return {fila['producto_id']: fila['total'] for fila in consulta_cantidades_por_producto(pedido_ids)}
+
+
+def _registrar_venta(fila, transicion):
+    registrar_cambio_estado(
+        [(fila['pk'], fila['fecha_pedido'], transicion.origen, fila['monto_total'])], transicion.destino
+    )
+
+
+def _invalidar_reportes(fila, transicion):
+    # El reporte de entregas también muestra datos del pedido
+    cache.invalidar('pedidos')
+    cache.invalidar('entregas')
+
+
+def _restaurar_stock(fila, transicion):
+    liberar_stock(cantidades_por_producto([fila['pk']]))
+
+
+TRANSICIONES_PEDIDO = [
+    Transicion('pendiente', 'en_proceso', frozenset({ADMIN})),
+    Transicion('pendiente', 'cancelado', frozenset({ADMIN, CLIENTE}), efectos=(_restaurar_stock,)),
+    Transicion('en_proceso', 'cancelado', frozenset({ADMIN}), efectos=(_restaurar_stock,)),
+    # La entrega entregada cierra el pedido (models.entrega.transiciones)
+    Transicion('pendiente', 'entregado', frozenset({ADMIN, SISTEMA})),
+    Transicion('en_proceso', 'entregado', frozenset({ADMIN, SISTEMA})),
+]
+
+maquina_pedido = MaquinaEstados(
+    Pedido,
+    TRANSICIONES_PEDIDO,
+    campos_contexto=('fecha_pedido', 'monto_total'),
+    efectos=(_registrar_venta, _invalidar_reportes),
+)
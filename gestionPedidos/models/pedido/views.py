@@ -5,9 +5,7 @@ from .models import Pedido
 from .serializers import PedidoSerializer
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import HttpResponse
-from django.template.loader import get_template
-from xhtml2pdf import pisa
+from django.http import FileResponse, HttpResponse
 from django.db import transaction
 
 from models.perfil.permissions import (
@@ -20,11 +18,52 @@ from models.perfil.permissions import (
 from rest_framework.permissions import IsAuthenticated
 from models.itemPedido.models import ItemPedido
 from models.producto.models import Producto
+from .cancelacion import cancelar_pedidos
+from .transiciones import maquina_pedido
+from models.producto.inventario import agrupar_cantidades, normalizar_items, reservar_stock, reservar_stock_por_pedidos
+from models.comun.asincrono import LecturaAsincronaView
+from models.comun.consultas import ConsultaOptimizadaMixin, optimizar_queryset
+from models.comun.streaming import formato_streaming, respuesta_streaming
+from models.comun.transiciones import TransicionesMixin
+from models.reporte.pdf import generar_pdf_cacheado
+from models.ventas.acumulados import acumular_items, registrar_pedidos_creados
 
-class PedidoViewSet(viewsets.ModelViewSet):
+
+def pedidos_visibles(usuario_actual):
+    """
+    Pedidos que el usuario puede ver según su rol. Se usa en get_queryset y en los
+    trabajos de reporte que se generan fuera de la petición.
+    """
+    from django.conf import settings
+    if getattr(settings, 'TESTING', False):
+        return Pedido.objects.all()
+
+    if not usuario_actual or not usuario_actual.is_authenticated or not hasattr(usuario_actual, 'perfil'):
+         return Pedido.objects.none()
+
+    rol_usuario = usuario_actual.perfil.rol
+
+    if rol_usuario == 'admin':
+
+        return Pedido.objects.all()
+    elif rol_usuario == 'cliente':
+
+        return Pedido.objects.filter(cliente_id=usuario_actual.id)
+    elif rol_usuario == 'repartidor':
+
+        return Pedido.objects.none()
+
+
+    return Pedido.objects.none()
+
+
+class PedidoViewSet(TransicionesMixin, ConsultaOptimizadaMixin, viewsets.ModelViewSet):
 
     queryset = Pedido.objects.all()
     serializer_class = PedidoSerializer
+    # Los cambios de estado (PUT/PATCH y POST .../transicion/) pasan por la máquina de estados
+    maquina_estados = maquina_pedido
+    orden_cursor = ('-fecha_pedido', '-id')
 
     def get_permissions(self):
         from django.conf import settings
@@ -43,7 +82,11 @@ class PedidoViewSet(viewsets.ModelViewSet):
 
             return [UsuarioConPerfilAutenticado(), EsPropietarioDelObjeto()]
 
-        elif self.action in ['create', 'crear_con_items']:
+        elif self.action == 'cancelar_lote':
+
+            return [EsAdministrador()]
+
+        elif self.action in ['create', 'crear_con_items', 'crear_lote']:
 
             return [EsCliente()]
 
@@ -52,95 +95,58 @@ class PedidoViewSet(viewsets.ModelViewSet):
             return [UsuarioConPerfilAutenticado()]
 
     def get_queryset(self):
-        from django.conf import settings
-        if getattr(settings, 'TESTING', False):
-            return Pedido.objects.all()
         """
         Filtra el conjunto de Pedidos que se retorna para las acciones 'list' y 'retrieve'
         basándose en el rol del usuario autenticado.
         """
-        usuario_actual = self.request.user
-
-
-        if not usuario_actual or not usuario_actual.is_authenticated or not hasattr(usuario_actual, 'perfil'):
-             return Pedido.objects.none()
-
-        rol_usuario = usuario_actual.perfil.rol
-
-        if rol_usuario == 'admin':
-
-            return Pedido.objects.all()
-        elif rol_usuario == 'cliente':
-
-            return Pedido.objects.filter(cliente=usuario_actual)
-        elif rol_usuario == 'repartidor':
-
-            return Pedido.objects.none()
-
-
-        return Pedido.objects.none()
+        return pedidos_visibles(self.request.user)
 
     @action(detail=False, methods=['get'], url_path='reporte/json')
     def reporte_json(self, request):
-        pedidos = self.get_queryset()
+        """
+        Reporte en JSON. Con '?streaming=json' o '?streaming=ndjson' las filas se
+        serializan por bloques en un StreamingHttpResponse en lugar de cargarse todas en memoria.
+        """
+        pedidos = self.filter_queryset(self.get_queryset())
+        formato = formato_streaming(request)
+        if formato:
+            return respuesta_streaming(request, pedidos, self.get_serializer(), formato, 'reporte_pedidos')
         serializer = self.get_serializer(pedidos, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='reporte/pdf')
     def reporte_pdf(self, request):
-        pedidos = self.get_queryset()
-        template = get_template('pedido/reporte_pedidos.html')
-        html = template.render({'pedidos': pedidos})
-
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="reporte_pedidos.pdf"'
-
-        pisa_status = pisa.CreatePDF(html, dest=response)
-        if pisa_status.err:
-            return HttpResponse('Error al generar el PDF', status=500)
-        return response
-
-    def update(self, request, *args, **kwargs):
         """
-        Actualiza un pedido y gestiona el inventario si el estado cambia a 'cancelado'.
+        Genera el PDF dentro de la petición. Para reportes grandes conviene usar
+        POST /api/reportes/ (models.reporte), que lo genera en segundo plano.
         """
-        pedido = self.get_object()
-        estado_anterior = pedido.estado
-
-        # Actualizar el pedido
-        response = super().update(request, *args, **kwargs)
-
-        # Si el estado cambió a 'cancelado', restaurar el stock
-        if estado_anterior != 'cancelado' and pedido.estado == 'cancelado':
-            self._restaurar_stock_pedido(pedido)
+        pedidos = self.get_queryset()
 
-        return response
+        archivo = generar_pdf_cacheado('pedidos', pedidos)
+        if archivo is None:
+            return HttpResponse('Error al generar el PDF', status=500)
+        return FileResponse(archivo, as_attachment=True, filename='reporte_pedidos.pdf', content_type='application/pdf')
 
-    def partial_update(self, request, *args, **kwargs):
+    @action(detail=False, methods=['post'], url_path='cancelar')
+    def cancelar_lote(self, request):
         """
-        Actualiza parcialmente un pedido y gestiona el inventario si el estado cambia a 'cancelado'.
-        """
-        pedido = self.get_object()
-        estado_anterior = pedido.estado
-
-        # Actualizar el pedido
-        response = super().partial_update(request, *args, **kwargs)
+        Cancela varios pedidos a la vez y restaura su stock con un UPDATE agregado.
+        Los pedidos cuyo estado no admite la cancelación se devuelven en 'rechazados'.
 
-        # Si el estado cambió a 'cancelado', restaurar el stock
-        if estado_anterior != 'cancelado' and pedido.estado == 'cancelado':
-            self._restaurar_stock_pedido(pedido)
-
-        return response
-
-    def _restaurar_stock_pedido(self, pedido):
-        """
-        Restaura el stock de los productos de un pedido cancelado.
+        Formato esperado del request:
+        {
+            "pedidos": [1, 2, 3]
+        }
         """
-        with transaction.atomic():
-            for item in pedido.items.all():
-                producto = item.producto
-                producto.stock += item.cantidad
-                producto.save()
+        pedido_ids = request.data.get('pedidos', [])
+        if not isinstance(pedido_ids, list) or not all(isinstance(pedido_id, int) for pedido_id in pedido_ids):
+            return Response(
+                {"detail": "Se espera una lista de ids de pedidos en 'pedidos'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        visibles = list(self.get_queryset().filter(id__in=pedido_ids).values_list('id', flat=True))
+        cancelados, rechazados = cancelar_pedidos(sorted(visibles))
+        return Response({"cancelados": cancelados, "rechazados": rechazados})
 
     @action(detail=False, methods=['post'], url_path='crear-con-items')
     def crear_con_items(self, request):
@@ -175,35 +181,25 @@ class PedidoViewSet(viewsets.ModelViewSet):
                 pedido_serializer.is_valid(raise_exception=True)
                 pedido = pedido_serializer.save()
 
+                # Reservar el stock de todas las líneas con una sola consulta y un solo UPDATE
+                lineas = normalizar_items(request.data.get('items', []))
+                productos = reservar_stock(agrupar_cantidades(lineas))
+
                 # Crear los items del pedido
-                items_data = request.data.get('items', [])
-                for item_data in items_data:
-                    producto_id = item_data.get('producto_id')
-                    cantidad = item_data.get('cantidad')
-
-                    try:
-                        producto = Producto.objects.get(id=producto_id)
-
-                        # Verificar si hay suficiente stock
-                        if producto.stock < cantidad:
-                            raise ValueError(f"Stock insuficiente para el producto {producto.nombre}. Stock actual: {producto.stock}, Solicitado: {cantidad}")
-
-                        # Actualizar el stock del producto
-                        producto.stock -= cantidad
-                        producto.save()
-
-                        # Crear el item del pedido
-                        ItemPedido.objects.create(
-                            pedido=pedido,
-                            producto=producto,
-                            cantidad=cantidad,
-                            precio_al_comprar=producto.precio
-                        )
-                    except Producto.DoesNotExist:
-                        # Si el producto no existe, revertir la transacción
-                        raise ValueError(f"El producto con ID {producto_id} no existe")
+                ItemPedido.objects.bulk_create([
+                    ItemPedido(
+                        pedido=pedido,
+                        producto=productos[producto_id],
+                        cantidad=cantidad,
+                        precio_al_comprar=productos[producto_id].precio
+                    )
+                    for producto_id, cantidad in lineas
+                ])
+                if pedido.estado != 'cancelado':
+                    acumular_items([pedido.pk])
 
                 # Devolver el pedido creado con sus items
+                pedido = optimizar_queryset(Pedido.objects.filter(pk=pedido.pk), self.get_serializer()).get()
                 pedido_completo = self.get_serializer(pedido).data
                 return Response(pedido_completo, status=status.HTTP_201_CREATED)
 
@@ -212,3 +208,89 @@ class PedidoViewSet(viewsets.ModelViewSet):
                 {"detail": f"Error al crear el pedido: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
+
+    @action(detail=False, methods=['post'], url_path='crear-lote')
+    def crear_lote(self, request):
+        """
+        Crea varios pedidos con sus items en una sola petición.
+
+        Formato esperado del request (lista con el mismo formato de 'crear-con-items'):
+        [
+            {"pedido": {...}, "items": [{"producto_id": 1, "cantidad": 2}]},
+            {"pedido": {...}, "items": [{"producto_id": 3, "cantidad": 1}]}
+        ]
+
+        Cada pedido se valida por separado: los que fallan (datos inválidos, producto
+        inexistente o stock insuficiente) se informan en su posición sin impedir que se
+        creen los demás. El stock de todo el lote se reserva con consultas agregadas.
+        Responde 201 si se crearon todos, 207 si solo algunos y 400 si ninguno.
+        """
+        from django.conf import settings
+        entradas = request.data
+        maximo = getattr(settings, 'PEDIDOS_LOTE_MAXIMO', 500)
+        if not isinstance(entradas, list) or not entradas:
+            return Response({"detail": "Se espera una lista de pedidos."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(entradas) > maximo:
+            return Response(
+                {"detail": f"El lote supera el máximo de {maximo} pedidos."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        resultados = [None] * len(entradas)
+        validos = []
+        for indice, entrada in enumerate(entradas):
+            if not isinstance(entrada, dict):
+                resultados[indice] = {"indice": indice, "estado": "error", "detail": "Formato de pedido inválido."}
+                continue
+            pedido_serializer = self.get_serializer(data=entrada.get('pedido', {}))
+            if not pedido_serializer.is_valid():
+                resultados[indice] = {"indice": indice, "estado": "error", "errores": pedido_serializer.errors}
+                continue
+            try:
+                lineas = normalizar_items(entrada.get('items', []))
+            except ValueError as e:
+                resultados[indice] = {"indice": indice, "estado": "error", "detail": str(e)}
+                continue
+            validos.append((indice, pedido_serializer, lineas))
+
+        aceptados = []
+        with transaction.atomic():
+            productos, errores = reservar_stock_por_pedidos([agrupar_cantidades(lineas) for _, _, lineas in validos])
+            for (indice, pedido_serializer, lineas), error in zip(validos, errores):
+                if error:
+                    resultados[indice] = {"indice": indice, "estado": "error", "detail": error}
+                else:
+                    aceptados.append((indice, Pedido(**pedido_serializer.validated_data), lineas))
+
+            Pedido.objects.bulk_create([pedido for _, pedido, _ in aceptados])
+            ItemPedido.objects.bulk_create([
+                ItemPedido(
+                    pedido=pedido,
+                    producto=productos[producto_id],
+                    cantidad=cantidad,
+                    precio_al_comprar=productos[producto_id].precio
+                )
+                for _, pedido, lineas in aceptados
+                for producto_id, cantidad in lineas
+            ])
+            registrar_pedidos_creados([pedido for _, pedido, _ in aceptados])
+
+        serializer = self.get_serializer()
+        creados = optimizar_queryset(
+            Pedido.objects.filter(pk__in=[pedido.pk for _, pedido, _ in aceptados]), serializer
+        ).in_bulk()
+        for indice, pedido, _ in aceptados:
+            resultados[indice] = {"indice": indice, "estado": "creado", "pedido": serializer.to_representation(creados[pedido.pk])}
+
+        if len(aceptados) == len(entradas):
+            codigo = status.HTTP_201_CREATED
+        elif aceptados:
+            codigo = status.HTTP_207_MULTI_STATUS
+        else:
+            codigo = status.HTTP_400_BAD_REQUEST
+        return Response(resultados, status=codigo)
+
+
+class PedidoListaAsincrona(LecturaAsincronaView):
+    viewset = PedidoViewSet
+    accion = 'list'
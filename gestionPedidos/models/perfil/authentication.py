@@ -0,0 +1,63 @@
+# models/perfil/authentication.py
+
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+from .models import PerfilUsuario
+
+
+class PerfilNoEncontrado(PerfilUsuario.DoesNotExist, AttributeError):
+    """
+    Igual que el RelatedObjectDoesNotExist de Django: hasattr(usuario, 'perfil')
+    devuelve False y los permisos que capturan PerfilUsuario.DoesNotExist siguen funcionando.
+    """
+
+
+class PerfilToken:
+    """
+    Perfil mínimo construido desde el claim 'rol' del token.
+    """
+    def __init__(self, rol):
+        self.rol = rol
+
+    def __str__(self):
+        return self.rol
+
+
+class UsuarioToken(TokenUser):
+    """
+    Usuario autenticado construido desde los claims verificados del token (id, username, rol),
+    sin consultar la base de datos. Se activa con AUTENTICACION_JWT_SIN_ESTADO.
+
+    Los tokens emitidos sin 'rol' recurren a la base de datos para obtener el perfil.
+    Un cambio de rol se refleja cuando el usuario obtiene un token nuevo.
+    """
+    @cached_property
+    def perfil(self):
+        rol = self.token.get('rol')
+        if rol:
+            return PerfilToken(rol)
+        try:
+            return PerfilUsuario.objects.get(usuario_id=self.id)
+        except PerfilUsuario.DoesNotExist:
+            raise PerfilNoEncontrado(f"El usuario {self.id} no tiene PerfilUsuario.")
+
+
+class AutenticacionJWTSinEstado(JWTStatelessUserAuthentication):
+    """
+    Autenticación sin estado (UsuarioToken) para las lecturas. Las escrituras comprueban
+    además con una consulta por clave primaria que el usuario sigue activo, así que un
+    usuario desactivado deja de poder modificar datos en cuanto se desactiva y de leer
+    cuando caduca su token de acceso (el refresco ya exige un usuario activo).
+    """
+    def authenticate(self, request):
+        resultado = super().authenticate(request)
+        if resultado is not None and request.method not in SAFE_METHODS:
+            usuario, _ = resultado
+            if not get_user_model().objects.filter(pk=usuario.id, is_active=True).exists():
+                raise AuthenticationFailed("El usuario está inactivo.", code='user_inactive')
+        return resultado
@@ -12,5 +12,11 @@ class PerfilUsuario(models.Model):
     telefono = models.CharField(max_length=20, blank=True, null=True)
     direccion = models.TextField(blank=True, null=True) 
 
+    class Meta:
+        indexes = [
+            # Listados de perfiles por rol; el id implícito del índice da el orden del cursor
+            models.Index(fields=['rol'], name='perfil_rol_idx'),
+        ]
+
     def __str__(self):
         return self.usuario.username
@@ -10,6 +10,14 @@ from .models import PerfilUsuario
 Usuario = get_user_model()
 
 
+def _es_usuario_actual(request, usuario_id):
+    """
+    Compara por id para que funcione tanto con un User como con el usuario
+    construido desde los claims del token (models.perfil.authentication).
+    """
+    return usuario_id is not None and request.user.is_authenticated and usuario_id == request.user.id
+
+
 class UsuarioConPerfilAutenticado(BasePermission):
     """
     Permiso para asegurar que el usuario está autenticado y tiene un perfil asociado.
@@ -54,28 +62,28 @@ class EsPropietarioDelObjeto(BasePermission):
         if request.user and request.user.is_authenticated and hasattr(request.user, 'perfil') and request.user.perfil.rol == 'admin':
              return True
         try:
-             if hasattr(obj, 'cliente') and obj.cliente == request.user:
+             if _es_usuario_actual(request, getattr(obj, 'cliente_id', None)):
                  return True
         except Exception: pass 
 
         try:
-             if hasattr(obj, 'usuario') and obj.usuario == request.user:
+             if _es_usuario_actual(request, getattr(obj, 'usuario_id', None)):
                  return True
         except Exception: pass
 
         try:
-             if hasattr(obj, 'usuario_destino') and obj.usuario_destino == request.user:
+             if _es_usuario_actual(request, getattr(obj, 'usuario_destino_id', None)):
                  return True
         except Exception: pass
 
         try:
-             if isinstance(obj, PerfilUsuario) and obj.usuario == request.user:
+             if isinstance(obj, PerfilUsuario) and _es_usuario_actual(request, obj.usuario_id):
                   return True
         except Exception: pass
 
         try:
         
-            if hasattr(obj, 'pedido') and hasattr(obj.pedido, 'cliente') and obj.pedido.cliente == request.user:
+            if hasattr(obj, 'pedido') and _es_usuario_actual(request, getattr(obj.pedido, 'cliente_id', None)):
                 return True
         except Exception: pass
 
@@ -93,7 +101,7 @@ class EsRepartidorAsignado(BasePermission):
              return True
 
    
-        if hasattr(obj, 'asignado_a') and obj.asignado_a == request.user:
+        if _es_usuario_actual(request, getattr(obj, 'asignado_a_id', None)):
             return True
 
   
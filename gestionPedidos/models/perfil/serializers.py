@@ -3,7 +3,9 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from rest_framework.validators import UniqueValidator
 from .models import PerfilUsuario
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 
 User = get_user_model()
 
@@ -16,6 +18,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
+        token['username'] = user.username
 
         # Añadir el rol del usuario al token
         try:
@@ -36,6 +39,25 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return token
 
 
+class RefrescoTokenSerializer(TokenRefreshSerializer):
+    """
+    Refresco de tokens que vuelve a leer el rol del perfil. simplejwt copia los claims
+    del refresh token (emitido al iniciar sesión) en cada access token nuevo, así que sin
+    esto un cambio de rol no se aplicaría hasta que caducara el refresh token.
+    """
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data['access'])
+        rol = PerfilUsuario.objects.filter(usuario_id=access[api_settings.USER_ID_CLAIM]).values_list('rol', flat=True).first()
+        if rol:
+            access['rol'] = rol
+        else:
+            # Sin perfil, UsuarioToken lo busca en la base de datos
+            access.payload.pop('rol', None)
+        data['access'] = str(access)
+        return data
+
+
 class RegistroSerializer(serializers.ModelSerializer):
     """
     Serializer para el registro de nuevos usuarios.
@@ -48,4 +48,95 @@ def test_eliminar_perfil(api_cliente, crear_usuario):
     perfil = PerfilUsuario.objects.create(usuario=crear_usuario, rol='admin', telefono='987654321')
     url=reverse('perfilusuario-detail', args=[perfil.id])
     response=api_cliente.delete(url)
-    assert response.status_code == 204
\ No newline at end of file
+    assert response.status_code == 204
+def _token_para(api_cliente, username, password='testpassword'):
+    response = api_cliente.post(reverse('token_obtain_pair'), {"username": username, "password": password}, format='json')
+    assert response.status_code == 200
+    return response.data['access']
+
+@pytest.mark.django_db
+def test_rol_desde_token_sin_consultar_usuario_ni_perfil(api_cliente, crear_usuario, settings):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from models.pedido.models import Pedido
+    settings.TESTING = False
+    PerfilUsuario.objects.create(usuario=crear_usuario, rol='cliente')
+    otro = User.objects.create_user(username='otro', password='testpassword')
+    Pedido.objects.create(cliente=crear_usuario, direccion_envio='Calle 1')
+    Pedido.objects.create(cliente=otro, direccion_envio='Calle 2')
+
+    api_cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {_token_para(api_cliente, 'testuser')}")
+    with CaptureQueriesContext(connection) as contexto:
+        response = api_cliente.get(reverse('pedido-list'))
+
+    assert response.status_code == 200
+    assert [p['cliente'] for p in response.data['results']] == [crear_usuario.id]
+    consultas = ' '.join(q['sql'] for q in contexto.captured_queries)
+    assert 'FROM "auth_user"' not in consultas
+    assert 'FROM "perfil_perfilusuario"' not in consultas
+
+@pytest.mark.django_db
+def test_permisos_por_rol_desde_token(api_cliente, crear_usuario, settings):
+    settings.TESTING = False
+    PerfilUsuario.objects.create(usuario=crear_usuario, rol='cliente')
+    api_cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {_token_para(api_cliente, 'testuser')}")
+
+    # Crear entregas exige rol admin
+    response = api_cliente.post(reverse('entrega-list'), {}, format='json')
+    assert response.status_code == 403
+
+    perfil = PerfilUsuario.objects.get(usuario=crear_usuario)
+    response = api_cliente.get(reverse('perfilusuario-detail', args=[perfil.id]))
+    assert response.status_code == 404  # los clientes solo ven perfiles de repartidores
+
+@pytest.mark.django_db
+def test_propietario_desde_token(api_cliente, crear_usuario, settings):
+    from models.pedido.models import Pedido
+    settings.TESTING = False
+    PerfilUsuario.objects.create(usuario=crear_usuario, rol='cliente')
+    pedido = Pedido.objects.create(cliente=crear_usuario, direccion_envio='Calle 1')
+    api_cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {_token_para(api_cliente, 'testuser')}")
+
+    response = api_cliente.patch(reverse('pedido-detail', args=[pedido.id]), {"direccion_envio": "Calle 2"}, format='json')
+    assert response.status_code == 200
+    assert response.data['direccion_envio'] == 'Calle 2'
+
+@pytest.mark.django_db
+def test_usuario_desactivado_no_escribe_con_token_vigente(api_cliente, crear_usuario, settings):
+    from models.pedido.models import Pedido
+    settings.TESTING = False
+    PerfilUsuario.objects.create(usuario=crear_usuario, rol='cliente')
+    pedido = Pedido.objects.create(cliente=crear_usuario, direccion_envio='Calle 1')
+    api_cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {_token_para(api_cliente, 'testuser')}")
+    refresco = api_cliente.post(
+        reverse('token_obtain_pair'), {"username": 'testuser', "password": 'testpassword'}, format='json',
+    ).data['refresh']
+
+    crear_usuario.is_active = False
+    crear_usuario.save()
+
+    # Las lecturas siguen con el token sin estado hasta que caduca...
+    assert api_cliente.get(reverse('pedido-detail', args=[pedido.id])).status_code == 200
+    # ...pero las escrituras y el refresco comprueban la base de datos
+    response = api_cliente.patch(reverse('pedido-detail', args=[pedido.id]), {"direccion_envio": "Calle 2"}, format='json')
+    assert response.status_code == 401
+    api_cliente.credentials()
+    assert api_cliente.post(reverse('token_refresh'), {"refresh": refresco}, format='json').status_code == 401
+
+@pytest.mark.django_db
+def test_refresco_lee_el_rol_actual(api_cliente, crear_usuario, settings):
+    from rest_framework_simplejwt.tokens import AccessToken
+    settings.TESTING = False
+    perfil = PerfilUsuario.objects.create(usuario=crear_usuario, rol='admin')
+    refresco = api_cliente.post(
+        reverse('token_obtain_pair'), {"username": 'testuser', "password": 'testpassword'}, format='json',
+    ).data['refresh']
+
+    perfil.rol = 'cliente'
+    perfil.save()
+    response = api_cliente.post(reverse('token_refresh'), {"refresh": refresco}, format='json')
+    assert response.status_code == 200
+    assert AccessToken(response.data['access'])['rol'] == 'cliente'
+
+    api_cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    assert api_cliente.post(reverse('pedido-cancelar-lote'), {"pedidos": []}, format='json').status_code == 403
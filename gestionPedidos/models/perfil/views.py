@@ -19,6 +19,7 @@ from .permissions import (
 )
 
 from rest_framework.permissions import IsAuthenticated
+from models.comun.consultas import ConsultaOptimizadaMixin
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -38,7 +39,7 @@ class RegistroAPIView(generics.CreateAPIView):
     permission_classes = [AllowAny]
 
 
-class PerfilUsuarioViewSet(viewsets.ModelViewSet):
+class PerfilUsuarioViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestionar (listar, ver, actualizar, eliminar) perfiles de usuario existentes.
     Requiere autenticación y permisos basados en roles/propiedad.
@@ -47,6 +48,7 @@ class PerfilUsuarioViewSet(viewsets.ModelViewSet):
     queryset = PerfilUsuario.objects.all()
 
     serializer_class = PerfilUsuarioSerializer
+    orden_cursor = ('id',)
 
     def get_permissions(self):
         from django.conf import settings
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class UsuarioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'models.producto'
\ No newline at end of file
+    name = 'models.producto'
+
+    def ready(self):
+        import models.producto.signals
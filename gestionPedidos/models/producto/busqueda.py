@@ -0,0 +1,62 @@
+# models/producto/busqueda.py
+
+import re
+from functools import reduce
+from operator import and_
+
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Producto
+
+TABLA_FTS = 'producto_producto_fts'
+
+_PALABRA = re.compile(r'\w+', re.UNICODE)
+
+
+def terminos_busqueda(texto):
+    """
+    Palabras del texto de búsqueda, sin operadores ni signos de la sintaxis FTS5.
+    """
+    return _PALABRA.findall(texto or '')
+
+
+def consulta_fts(terminos):
+    """
+    Expresión MATCH de FTS5: todas las palabras deben aparecer y cada una se busca
+    también como prefijo ("tecl" encuentra "teclado").
+    """
+    return ' '.join(f'"{termino}"*' for termino in terminos)
+
+
+def buscar_productos(texto, queryset=None):
+    """
+    Productos que coinciden con el texto, del más al menos relevante (bm25 sobre
+    nombre y descripción). En SQLite usa el índice FTS5 que mantienen los triggers de
+    la migración 0004; en otros motores recurre a icontains.
+    """
+    if queryset is None:
+        queryset = Producto.objects.all()
+    terminos = terminos_busqueda(texto)
+    if not terminos:
+        return queryset.none()
+
+    if connection.vendor != 'sqlite':
+        condiciones = [Q(nombre__icontains=t) | Q(descripcion__icontains=t) for t in terminos]
+        return queryset.filter(reduce(and_, condiciones)).order_by('nombre', 'id')
+
+    # rank de FTS5 (bm25, menor es más relevante) como subconsulta correlacionada: el
+    # MATCH va con parámetro enlazado y el queryset no pierde filtros ni anotaciones
+    consulta = consulta_fts(terminos)
+    tabla = queryset.model._meta.db_table
+    coincidencias = RawSQL(f'SELECT rowid FROM {TABLA_FTS} WHERE {TABLA_FTS} MATCH %s', (consulta,))
+    relevancia = RawSQL(
+        f'SELECT rank FROM {TABLA_FTS} WHERE {TABLA_FTS} MATCH %s AND rowid = "{tabla}"."id"',
+        (consulta,),
+    )
+    return (
+        queryset.filter(id__in=coincidencias)
+        .annotate(relevancia=relevancia)
+        .order_by(F('relevancia').asc(), 'id')
+    )
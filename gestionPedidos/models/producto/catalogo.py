@@ -0,0 +1,123 @@
+# models/producto/catalogo.py
+
+import asyncio
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+
+from .models import VersionCatalogo
+
+VERSION_ID = 1
+
+
+def version_catalogo():
+    """
+    Versión actual del catálogo. Vive en la base de datos para que todos los workers
+    vean el mismo valor; es una lectura por clave primaria.
+    """
+    version = VersionCatalogo.objects.filter(pk=VERSION_ID).values_list('version', flat=True).first()
+    if version is None:
+        version = VersionCatalogo.objects.get_or_create(pk=VERSION_ID)[0].version
+    return version
+
+
+async def aversion_catalogo():
+    version = await VersionCatalogo.objects.filter(pk=VERSION_ID).values_list('version', flat=True).afirst()
+    if version is None:
+        version = (await VersionCatalogo.objects.aget_or_create(pk=VERSION_ID))[0].version
+    return version
+
+
+def incrementar_version_catalogo():
+    """
+    Invalida el catálogo cacheado. Se llama al guardar o borrar productos y en cada
+    cambio de stock hecho con UPDATE (reservas y cancelaciones).
+    """
+    if not VersionCatalogo.objects.filter(pk=VERSION_ID).update(version=F('version') + 1):
+        VersionCatalogo.objects.get_or_create(pk=VERSION_ID, defaults={'version': 1})
+
+
+def clave_catalogo(version, request):
+    consulta = f"{request.get_host()}|{request.get_full_path()}"
+    return f"catalogo:{version}:{hashlib.sha256(consulta.encode()).hexdigest()[:32]}"
+
+
+def etag_catalogo(clave):
+    return f'"{clave.split(":", 1)[1].replace(":", "-")}"'
+
+
+def etag_vigente(request, etag):
+    """
+    Indica si el cliente ya tiene esta versión (cabecera If-None-Match).
+    """
+    etags_cliente = [valor.strip() for valor in request.headers.get('If-None-Match', '').split(',')]
+    return etag in etags_cliente or '*' in etags_cliente
+
+
+def _cache():
+    return caches[getattr(settings, 'CATALOGO_CACHE', 'default')]
+
+
+def obtener_o_construir(clave, construir):
+    """
+    Devuelve el contenido cacheado o lo construye. Tras una invalidación solo la
+    primera petición reconstruye (candado con cache.add); las demás esperan a que el
+    contenido aparezca en la caché, hasta CATALOGO_ESPERA_RECONSTRUCCION segundos.
+    El candado solo aplica entre workers si CATALOGO_CACHE es una caché compartida
+    (por defecto, la de archivos de models.comun.cache; no una LocMemCache, que es
+    por proceso).
+    """
+    cache = _cache()
+    datos = cache.get(clave)
+    if datos is not None:
+        return datos
+
+    espera = getattr(settings, 'CATALOGO_ESPERA_RECONSTRUCCION', 5)
+    candado = f"{clave}:reconstruyendo"
+    if cache.add(candado, True, timeout=espera):
+        try:
+            datos = construir()
+            cache.set(clave, datos, timeout=getattr(settings, 'CATALOGO_CACHE_SEGUNDOS', 300))
+        finally:
+            cache.delete(candado)
+        return datos
+
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        time.sleep(0.05)
+        datos = cache.get(clave)
+        if datos is not None:
+            return datos
+    return construir()
+
+
+async def aobtener_o_construir(clave, construir):
+    """
+    Igual que obtener_o_construir para las vistas asíncronas: 'construir' es una
+    corrutina y la espera por el candado no bloquea el bucle de eventos.
+    """
+    cache = _cache()
+    datos = await cache.aget(clave)
+    if datos is not None:
+        return datos
+
+    espera = getattr(settings, 'CATALOGO_ESPERA_RECONSTRUCCION', 5)
+    candado = f"{clave}:reconstruyendo"
+    if await cache.aadd(candado, True, timeout=espera):
+        try:
+            datos = await construir()
+            await cache.aset(clave, datos, timeout=getattr(settings, 'CATALOGO_CACHE_SEGUNDOS', 300))
+        finally:
+            await cache.adelete(candado)
+        return datos
+
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        await asyncio.sleep(0.05)
+        datos = await cache.aget(clave)
+        if datos is not None:
+            return datos
+    return await construir()
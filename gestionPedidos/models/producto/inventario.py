@@ -0,0 +1,164 @@
+# models/producto/inventario.py
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import Producto
+from .catalogo import incrementar_version_catalogo
+
+
+class ProductoInexistenteError(ValueError):
+    pass
+
+
+class StockInsuficienteError(ValueError):
+    pass
+
+
+def normalizar_items(items_data):
+    """
+    Valida las líneas del carrito y devuelve una lista de (producto_id, cantidad).
+    Cualquier formato inválido lanza ValueError.
+    """
+    if not isinstance(items_data, list):
+        raise ValueError("Se espera una lista de items.")
+    lineas = []
+    for item_data in items_data:
+        if not isinstance(item_data, dict):
+            raise ValueError(f"Formato de item inválido: {item_data}")
+        producto_id = item_data.get('producto_id')
+        cantidad = item_data.get('cantidad')
+        if isinstance(cantidad, bool) or not isinstance(cantidad, int) or cantidad < 1:
+            raise ValueError(f"Cantidad inválida para el producto {producto_id}: {cantidad}")
+        try:
+            producto_id = int(producto_id)
+        except (TypeError, ValueError):
+            raise ProductoInexistenteError(f"El producto con ID {producto_id} no existe")
+        lineas.append((producto_id, cantidad))
+    return lineas
+
+
+def agrupar_cantidades(lineas):
+    """
+    Suma las cantidades pedidas por producto: {producto_id: cantidad_total}.
+    """
+    cantidades = Counter()
+    for producto_id, cantidad in lineas:
+        cantidades[producto_id] += cantidad
+    return dict(cantidades)
+
+
+def _por_producto(cantidades):
+    return Case(
+        *[When(id=producto_id, then=Value(cantidad)) for producto_id, cantidad in cantidades.items()],
+        output_field=IntegerField(),
+    )
+
+
+def reservar_stock(cantidades):
+    """
+    Descuenta el stock de todos los productos con un único UPDATE condicional
+    (stock >= cantidad pedida). Si algún producto no alcanza, lanza
+    StockInsuficienteError y la transacción del llamador revierte todo.
+
+    Debe ejecutarse dentro de transaction.atomic(). Devuelve {id: Producto} con el
+    stock ya descontado.
+    """
+    if not cantidades:
+        return {}
+
+    productos = Producto.objects.select_for_update().in_bulk(list(cantidades))
+    faltantes = sorted(set(cantidades) - set(productos))
+    if faltantes:
+        raise ProductoInexistenteError(f"El producto con ID {faltantes[0]} no existe")
+
+    requerido = _por_producto(cantidades)
+    actualizados = (
+        Producto.objects
+        .filter(id__in=list(cantidades), stock__gte=requerido)
+        .update(stock=F('stock') - requerido)
+    )
+    if actualizados != len(cantidades):
+        producto, cantidad = next(
+            ((productos[pid], cantidad) for pid, cantidad in cantidades.items() if productos[pid].stock < cantidad),
+            next((productos[pid], cantidad) for pid, cantidad in cantidades.items()),
+        )
+        raise StockInsuficienteError(
+            f"Stock insuficiente para el producto {producto.nombre}. "
+            f"Stock actual: {producto.stock}, Solicitado: {cantidad}"
+        )
+
+    incrementar_version_catalogo()
+    for producto_id, cantidad in cantidades.items():
+        productos[producto_id].stock -= cantidad
+    return productos
+
+
+def liberar_stock(cantidades):
+    """
+    Devuelve al inventario las cantidades indicadas ({producto_id: cantidad}) con un
+    único UPDATE relativo (stock = stock + cantidad), sin leer ni sobrescribir la fila.
+    """
+    if not cantidades:
+        return 0
+    actualizados = (
+        Producto.objects
+        .filter(id__in=list(cantidades))
+        .update(stock=F('stock') + _por_producto(cantidades))
+    )
+    incrementar_version_catalogo()
+    return actualizados
+
+
+def reservar_stock_por_pedidos(demandas):
+    """
+    Reserva stock para varios pedidos a la vez. 'demandas' es una lista con las
+    cantidades agrupadas de cada pedido ({producto_id: cantidad}).
+
+    Los productos se leen en una sola consulta y los pedidos se asignan en orden:
+    los que no alcanzan quedan rechazados sin afectar a los demás. El stock de todos
+    los aceptados se descuenta con un único UPDATE condicional; si un cambio
+    concurrente lo hace fallar, se reintenta pedido a pedido con savepoints.
+
+    Debe ejecutarse dentro de transaction.atomic(). Devuelve (productos, errores),
+    donde errores[i] es None si el pedido i quedó reservado o el mensaje de error.
+    """
+    ids = sorted({producto_id for demanda in demandas for producto_id in demanda})
+    productos = Producto.objects.select_for_update().in_bulk(ids)
+    disponible = {producto_id: producto.stock for producto_id, producto in productos.items()}
+
+    errores = []
+    total = Counter()
+    for demanda in demandas:
+        faltantes = sorted(set(demanda) - set(productos))
+        if faltantes:
+            errores.append(f"El producto con ID {faltantes[0]} no existe")
+            continue
+        escaso = next((pid for pid, cantidad in demanda.items() if disponible[pid] < cantidad), None)
+        if escaso is not None:
+            errores.append(
+                f"Stock insuficiente para el producto {productos[escaso].nombre}. "
+                f"Stock actual: {disponible[escaso]}, Solicitado: {demanda[escaso]}"
+            )
+            continue
+        for producto_id, cantidad in demanda.items():
+            disponible[producto_id] -= cantidad
+        total.update(demanda)
+        errores.append(None)
+
+    try:
+        with transaction.atomic():
+            reservar_stock(dict(total))
+    except StockInsuficienteError:
+        for indice, demanda in enumerate(demandas):
+            if errores[indice] is not None:
+                continue
+            try:
+                with transaction.atomic():
+                    reservar_stock(demanda)
+            except ValueError as e:
+                errores[indice] = str(e)
+
+    return productos, errores
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# Índice FTS5 de contenido externo sobre nombre y descripción. Los triggers lo
+# mantienen sincronizado también con los UPDATE masivos que no disparan señales; el de
+# actualización solo se activa si cambian las columnas indexadas (no con el stock).
+CREAR_FTS = [
+    """
+    CREATE VIRTUAL TABLE producto_producto_fts USING fts5(
+        nombre, descripcion,
+        content='producto_producto', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER producto_producto_fts_ai AFTER INSERT ON producto_producto BEGIN
+        INSERT INTO producto_producto_fts(rowid, nombre, descripcion)
+        VALUES (new.id, new.nombre, new.descripcion);
+    END
+    """,
+    """
+    CREATE TRIGGER producto_producto_fts_ad AFTER DELETE ON producto_producto BEGIN
+        INSERT INTO producto_producto_fts(producto_producto_fts, rowid, nombre, descripcion)
+        VALUES ('delete', old.id, old.nombre, old.descripcion);
+    END
+    """,
+    """
+    CREATE TRIGGER producto_producto_fts_au AFTER UPDATE OF nombre, descripcion ON producto_producto BEGIN
+        INSERT INTO producto_producto_fts(producto_producto_fts, rowid, nombre, descripcion)
+        VALUES ('delete', old.id, old.nombre, old.descripcion);
+        INSERT INTO producto_producto_fts(rowid, nombre, descripcion)
+        VALUES (new.id, new.nombre, new.descripcion);
+    END
+    """,
+    "INSERT INTO producto_producto_fts(producto_producto_fts) VALUES ('rebuild')",
+]
+
+ELIMINAR_FTS = [
+    "DROP TRIGGER IF EXISTS producto_producto_fts_au",
+    "DROP TRIGGER IF EXISTS producto_producto_fts_ad",
+    "DROP TRIGGER IF EXISTS producto_producto_fts_ai",
+    "DROP TABLE IF EXISTS producto_producto_fts",
+]
+
+
+def _ejecutar(sentencias):
+    def ejecutar(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sentencia in sentencias:
+            schema_editor.execute(sentencia)
+    return ejecutar
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('producto', '0003_versioncatalogo'),
+    ]
+
+    operations = [
+        migrations.RunPython(_ejecutar(CREAR_FTS), _ejecutar(ELIMINAR_FTS)),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
+from models.comun.cambios import SeguimientoCambiosMixin
 
-class Producto(models.Model):
+class Producto(SeguimientoCambiosMixin, models.Model):
     nombre = models.CharField(max_length=255)
     descripcion = models.TextField(blank=True, null=True)
     precio = models.DecimalField(max_digits=10, decimal_places=2)
@@ -9,3 +10,13 @@ class Producto(models.Model):
     def __str__(self):
         return self.nombre
 
+
+class VersionCatalogo(models.Model):
+    """
+    Contador global (una sola fila) que se incrementa con cada cambio en el catálogo.
+    Identifica el contenido cacheado de /api/productos/ y su ETag.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Catálogo v{self.version}"
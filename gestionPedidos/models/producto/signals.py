@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Producto
+from .catalogo import incrementar_version_catalogo
+
+@receiver([post_save, post_delete], sender=Producto)
+def invalidar_catalogo(sender, instance, **kwargs):
+    # Los cambios de stock con UPDATE no disparan señales; inventario.py incrementa la versión
+    if kwargs.get('signal') is post_save and not kwargs['created'] and not instance.ha_cambiado():
+        return
+    incrementar_version_catalogo()
@@ -37,7 +37,7 @@ def test_listar_productos(api_cliente, crear_producto):
     url = reverse('producto-list')
     response=api_cliente.get(url)
     assert response.status_code==200
-    assert response.data[0]['nombre']==crear_producto.nombre
+    assert response.data['results'][0]['nombre']==crear_producto.nombre
 
 @pytest.mark.django_db
 def test_obtener_producto(api_cliente, crear_producto):
@@ -65,4 +65,130 @@ def test_eliminar_producto(api_cliente, crear_producto):
     url = reverse('producto-detail', args=[crear_producto.id])
     response=api_cliente.delete(url)
     assert response.status_code==204
-    assert not Producto.objects.filter(id=crear_producto.id).exists()
\ No newline at end of file
+    assert not Producto.objects.filter(id=crear_producto.id).exists()
+
+@pytest.fixture(autouse=True)
+def cache_limpia(settings, tmp_path):
+    from django.core.cache import caches
+    settings.CACHES = {**settings.CACHES, 'catalogo': {**settings.CACHES['catalogo'], 'LOCATION': tmp_path}}
+    caches['catalogo'].clear()
+    yield
+    caches['catalogo'].clear()
+
+
+@pytest.mark.django_db
+def test_catalogo_cacheado_no_reconsulta_productos(api_cliente, crear_producto, django_assert_num_queries):
+    url = reverse('producto-list')
+    api_cliente.get(url)
+    # Solo la lectura de la versión del catálogo
+    with django_assert_num_queries(1):
+        response = api_cliente.get(url)
+    assert response.status_code == 200
+    assert response.data['results'][0]['nombre'] == crear_producto.nombre
+
+
+@pytest.mark.django_db
+def test_catalogo_responde_304_con_etag_vigente(api_cliente, crear_producto):
+    url = reverse('producto-list')
+    etag = api_cliente.get(url)['ETag']
+    response = api_cliente.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+
+
+@pytest.mark.django_db
+def test_catalogo_se_invalida_al_modificar_producto(api_cliente, crear_producto):
+    url = reverse('producto-list')
+    etag = api_cliente.get(url)['ETag']
+
+    crear_producto.precio = 15000
+    crear_producto.save()
+
+    response = api_cliente.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    assert response.data['results'][0]['precio'] == '15000.00'
+
+
+@pytest.mark.django_db
+def test_catalogo_no_se_invalida_con_guardado_sin_cambios(crear_producto):
+    from .catalogo import version_catalogo
+    version = version_catalogo()
+    producto = Producto.objects.get()
+    producto.save()
+    assert version_catalogo() == version
+    producto.stock += 1
+    producto.save()
+    assert version_catalogo() == version + 1
+
+@pytest.mark.django_db
+def test_catalogo_se_invalida_al_cambiar_stock(api_cliente, crear_producto):
+    from .catalogo import version_catalogo
+    from .inventario import reservar_stock, liberar_stock
+    from django.db import transaction
+
+    version = version_catalogo()
+    with transaction.atomic():
+        reservar_stock({crear_producto.id: 3})
+    assert version_catalogo() == version + 1
+    liberar_stock({crear_producto.id: 3})
+    assert version_catalogo() == version + 2
+
+
+@pytest.mark.django_db
+def test_buscar_productos_por_prefijo_y_relevancia(api_cliente):
+    Producto.objects.create(nombre='Mouse óptico', descripcion='Compatible con teclado', precio=100, stock=1)
+    teclado = Producto.objects.create(nombre='Teclado mecánico', descripcion='Teclado con luces', precio=200, stock=1)
+    Producto.objects.create(nombre='Monitor', descripcion='24 pulgadas', precio=300, stock=1)
+
+    response = api_cliente.get(reverse('producto-buscar'), {'q': 'tecl'})
+    assert response.status_code == 200
+    assert response.data['count'] == 2
+    assert response.data['results'][0]['id'] == teclado.id
+
+    response = api_cliente.get(reverse('producto-buscar'), {'q': 'optico'})
+    assert [p['nombre'] for p in response.data['results']] == ['Mouse óptico']
+
+
+@pytest.mark.django_db
+def test_buscar_productos_sigue_cambios_del_catalogo(api_cliente, crear_producto):
+    url = reverse('producto-buscar')
+    crear_producto.nombre = 'Lámpara de escritorio'
+    crear_producto.save()
+    assert api_cliente.get(url, {'q': 'lampara'}).data['count'] == 1
+
+    crear_producto.delete()
+    assert api_cliente.get(url, {'q': 'lampara'}).data['count'] == 0
+
+
+@pytest.mark.django_db
+def test_buscar_productos_sin_termino(api_cliente):
+    response = api_cliente.get(reverse('producto-buscar'), {'q': '"*'})
+    assert response.status_code == 400
+
+@pytest.mark.django_db
+def test_catalogo_asincrono_igual_al_sincrono(api_cliente, crear_producto):
+    import json
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+    sincrono = api_cliente.get(reverse('producto-list'))
+    response = async_to_sync(AsyncClient().get)(reverse('lectura-producto-list'))
+    assert response.status_code == 200
+    assert json.loads(response.content) == json.loads(sincrono.content)
+    assert 'db;' in response['Server-Timing']
+
+    no_modificado = async_to_sync(AsyncClient().get)(
+        reverse('lectura-producto-list'), headers={'If-None-Match': response['ETag']}
+    )
+    assert no_modificado.status_code == 304
+
+@pytest.mark.django_db
+def test_detalle_producto_asincrono(crear_producto):
+    import json
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+    cliente = AsyncClient()
+    response = async_to_sync(cliente.get)(reverse('lectura-producto-detail', args=[crear_producto.id]))
+    assert response.status_code == 200
+    assert json.loads(response.content)['nombre'] == crear_producto.nombre
+    assert async_to_sync(cliente.get)(reverse('lectura-producto-detail', args=[crear_producto.id + 1])).status_code == 404
@@ -1,8 +1,17 @@
 # models/producto/views.py
 
-from rest_framework import viewsets
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from .models import Producto
 from .serializers import ProductoSerializer 
+from .catalogo import (
+    aobtener_o_construir, aversion_catalogo, clave_catalogo, etag_catalogo, etag_vigente,
+    obtener_o_construir, version_catalogo,
+)
+from .busqueda import buscar_productos, terminos_busqueda
+from models.comun.asincrono import LecturaAsincronaView
+from models.comun.paginacion import PaginacionBusqueda
 
 
 from models.perfil.permissions import EsAdministrador
@@ -13,6 +22,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
 
     queryset = Producto.objects.all()
     serializer_class = ProductoSerializer
+    orden_cursor = ('id',)
 
     def get_permissions(self):
         from django.conf import settings
@@ -34,4 +44,66 @@ class ProductoViewSet(viewsets.ModelViewSet):
           
             return [AllowAny()]
 
+    def list(self, request, *args, **kwargs):
+        """
+        Lista el catálogo desde caché. El contenido se identifica por la versión del
+        catálogo y la consulta; si el cliente ya tiene esa versión (If-None-Match) se
+        responde 304 sin serializar nada.
+        """
+        clave = clave_catalogo(version_catalogo(), request)
+        etag = etag_catalogo(clave)
+
+        if etag_vigente(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            datos = obtener_o_construir(clave, lambda: super(ProductoViewSet, self).list(request, *args, **kwargs).data)
+            response = Response(datos)
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='buscar')
+    def buscar(self, request):
+        """
+        Búsqueda de texto completo sobre nombre y descripción: '?q=teclado inalam'.
+        Resultados ordenados por relevancia, con coincidencia por prefijo y paginados
+        por número de página ('?page=', '?page_size=').
+        """
+        texto = request.query_params.get('q', '')
+        if not terminos_busqueda(texto):
+            raise serializers.ValidationError({'q': "Indique al menos una palabra para buscar."})
+
+        queryset = buscar_productos(texto, self.get_queryset())
+        paginador = PaginacionBusqueda()
+        pagina = paginador.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(pagina, many=True)
+        return paginador.get_paginated_response(serializer.data)
+
+
+class ProductoListaAsincrona(LecturaAsincronaView):
+    """
+    Catálogo para el servidor ASGI: misma caché, ETag y paginación que ProductoViewSet.list.
+    """
+    viewset = ProductoViewSet
+    accion = 'list'
+
+    async def list(self, vista, request, *args, **kwargs):
+        clave = clave_catalogo(await aversion_catalogo(), request)
+        etag = etag_catalogo(clave)
+
+        if etag_vigente(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            async def construir():
+                return (await super(ProductoListaAsincrona, self).list(vista, request, *args, **kwargs)).data
+            response = Response(await aobtener_o_construir(clave, construir))
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        return response
+
 
+class ProductoDetalleAsincrono(LecturaAsincronaView):
+    viewset = ProductoViewSet
+    accion = 'retrieve'
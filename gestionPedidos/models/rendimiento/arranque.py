@@ -0,0 +1,199 @@
+# models/rendimiento/arranque.py
+"""
+Medición del arranque en frío: lo que paga la primera petición de una máquina recién
+levantada (importar los ajustes, cargar las apps, las URLs y el middleware y atender
+la petición).
+
+La medición corre en un proceso nuevo, con 'python -X importtime', para que nada esté
+importado de antemano. Este módulo solo importa la biblioteca estándar a nivel de
+módulo: lo que importa Django se mide, no se adelanta.
+"""
+
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+_INICIO = time.perf_counter()
+
+# Subsistemas pesados que solo deben cargarse al usarse (reportes PDF y documentación)
+MODULOS_DIFERIDOS = ('xhtml2pdf', 'reportlab', 'pyhanko', 'drf_yasg.views')
+
+_MARCA_RESULTADO = 'RESULTADO_ARRANQUE '
+_LINEA_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)\s*$')
+
+
+def _ms(desde):
+    return round((time.perf_counter() - desde) * 1000, 2)
+
+
+def _instrumentar_apps(tiempos):
+    """
+    Envuelve AppConfig.create para cronometrar, por app, la importación del paquete,
+    la de sus modelos y su ready().
+    """
+    from django.apps.config import AppConfig
+
+    crear = AppConfig.create.__func__
+
+    def cronometrada(fila, clave, funcion):
+        def envoltura():
+            inicio = time.perf_counter()
+            try:
+                return funcion()
+            finally:
+                fila[clave] = _ms(inicio)
+        return envoltura
+
+    def create(cls, entrada):
+        inicio = time.perf_counter()
+        config = crear(cls, entrada)
+        fila = tiempos.setdefault(config.label, {})
+        fila['importacion_ms'] = _ms(inicio)
+        config.import_models = cronometrada(fila, 'modelos_ms', config.import_models)
+        config.ready = cronometrada(fila, 'ready_ms', config.ready)
+        return config
+
+    AppConfig.create = classmethod(create)
+
+
+async def _peticion(aplicacion, ruta):
+    """
+    Envía una petición GET al manejador ASGI y devuelve el código de estado.
+    """
+    ruta, _, consulta = ruta.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'scheme': 'http',
+        'method': 'GET', 'path': ruta, 'raw_path': ruta.encode(), 'query_string': consulta.encode(),
+        'root_path': '', 'headers': [(b'host', b'localhost')],
+        'server': ('localhost', 8000), 'client': ('127.0.0.1', 0),
+    }
+    recibido = False
+    mensajes = []
+
+    async def recibir():
+        nonlocal recibido
+        if not recibido:
+            recibido = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Sin desconexión: el manejador cancela la espera al terminar la respuesta
+        await asyncio.Event().wait()
+
+    async def enviar(mensaje):
+        mensajes.append(mensaje)
+
+    await aplicacion(scope, recibir, enviar)
+    return next(mensaje['status'] for mensaje in mensajes if mensaje['type'] == 'http.response.start')
+
+
+def _medir_en_proceso(ruta):
+    """
+    Fases del arranque medidas dentro del proceso nuevo, hasta la primera respuesta.
+    """
+    # Mismo stack que el despliegue (gestionPedidos.asgi)
+    os.environ.setdefault('GESTION_ASGI', '1')
+    fases = {}
+    apps = {}
+
+    inicio = time.perf_counter()
+    import django
+    from django.conf import settings
+    settings.INSTALLED_APPS
+    fases['ajustes_ms'] = _ms(inicio)
+
+    inicio = time.perf_counter()
+    _instrumentar_apps(apps)
+    django.setup(set_prefix=False)
+    fases['apps_ms'] = _ms(inicio)
+
+    inicio = time.perf_counter()
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    fases['urls_ms'] = _ms(inicio)
+
+    inicio = time.perf_counter()
+    from django.core.handlers.asgi import ASGIHandler
+    aplicacion = ASGIHandler()
+    fases['middleware_ms'] = _ms(inicio)
+
+    inicio = time.perf_counter()
+    estado = asyncio.run(_peticion(aplicacion, ruta))
+    fases['primera_peticion_ms'] = _ms(inicio)
+
+    return {
+        'ruta': ruta,
+        'estado': estado,
+        'fases': fases,
+        'apps': apps,
+        'primera_respuesta_ms': _ms(_INICIO),
+        'diferidos_cargados': sorted(
+            modulo for modulo in MODULOS_DIFERIDOS
+            if any(nombre == modulo or nombre.startswith(f"{modulo}.") for nombre in sys.modules)
+        ),
+    }
+
+
+def analizar_importtime(texto):
+    """
+    Filas de la salida de 'python -X importtime': módulo, nivel de anidamiento y
+    tiempos propio y acumulado en ms.
+    """
+    modulos = []
+    for linea in texto.splitlines():
+        coincidencia = _LINEA_IMPORTTIME.match(linea)
+        if coincidencia:
+            propio, acumulado, sangria, modulo = coincidencia.groups()
+            modulos.append({
+                'modulo': modulo,
+                'nivel': len(sangria) // 2,
+                'propio_ms': int(propio) / 1000,
+                'acumulado_ms': int(acumulado) / 1000,
+            })
+    return modulos
+
+
+def tiempo_por_paquete(modulos):
+    """
+    Tiempo de importación propio sumado por paquete de primer nivel, de mayor a menor.
+    """
+    totales = {}
+    for fila in modulos:
+        paquete = fila['modulo'].split('.')[0]
+        totales[paquete] = totales.get(paquete, 0.0) + fila['propio_ms']
+    return sorted(((paquete, round(total, 2)) for paquete, total in totales.items()), key=lambda par: -par[1])
+
+
+def medir_arranque(ruta='/api/productos/'):
+    """
+    Arranca un proceso nuevo con los ajustes actuales, atiende una petición GET a
+    'ruta' y devuelve las fases, el coste por app y por módulo importado y el tiempo
+    hasta la primera respuesta (medido dentro del proceso y de punta a punta).
+    """
+    from django.conf import settings
+
+    entorno = dict(os.environ)
+    entorno['DJANGO_SETTINGS_MODULE'] = settings.SETTINGS_MODULE
+    entorno['PYTHONPATH'] = os.pathsep.join(filter(None, [str(settings.BASE_DIR), entorno.get('PYTHONPATH')]))
+
+    inicio = time.perf_counter()
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', __name__, ruta],
+        cwd=settings.BASE_DIR, env=entorno, capture_output=True, text=True, timeout=300,
+    )
+    proceso_ms = _ms(inicio)
+
+    linea = next((linea for linea in proceso.stdout.splitlines() if linea.startswith(_MARCA_RESULTADO)), None)
+    if proceso.returncode != 0 or linea is None:
+        raise RuntimeError(f"La medición del arranque falló:\n{proceso.stderr[-2000:]}")
+
+    resultado = json.loads(linea[len(_MARCA_RESULTADO):])
+    resultado['proceso_ms'] = proceso_ms
+    resultado['importaciones'] = analizar_importtime(proceso.stderr)
+    return resultado
+
+
+if __name__ == '__main__':
+    print(_MARCA_RESULTADO + json.dumps(_medir_en_proceso(sys.argv[1] if len(sys.argv) > 1 else '/api/productos/')))
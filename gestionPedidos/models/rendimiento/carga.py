@@ -0,0 +1,202 @@
+# models/rendimiento/carga.py
+
+import base64
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+
+from .datos import CLAVE_USUARIOS
+from .medicion import percentil
+
+LIMITES_HISTOGRAMA_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Estadisticas:
+    """
+    Latencias y errores por operación, compartidos entre los usuarios virtuales.
+    """
+    def __init__(self):
+        self._candado = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.errores = defaultdict(Counter)
+
+    def registrar(self, operacion, duracion_ms, error=None):
+        with self._candado:
+            self.latencias[operacion].append(duracion_ms)
+            if error:
+                self.errores[operacion][error] += 1
+
+    def resumen(self, duracion_s):
+        operaciones = {}
+        for operacion, latencias in sorted(self.latencias.items()):
+            errores = self.errores[operacion]
+            histograma = Counter()
+            for valor in latencias:
+                limite = next((limite for limite in LIMITES_HISTOGRAMA_MS if valor <= limite), None)
+                histograma[f"<={limite}" if limite else f">{LIMITES_HISTOGRAMA_MS[-1]}"] += 1
+            operaciones[operacion] = {
+                'peticiones': len(latencias),
+                'errores': sum(errores.values()),
+                'tipos_error': dict(errores),
+                'p50_ms': round(percentil(latencias, 50), 2),
+                'p95_ms': round(percentil(latencias, 95), 2),
+                'p99_ms': round(percentil(latencias, 99), 2),
+                'max_ms': round(max(latencias), 2),
+                'histograma': dict(histograma),
+            }
+        peticiones = sum(datos['peticiones'] for datos in operaciones.values())
+        errores = sum(datos['errores'] for datos in operaciones.values())
+        bloqueos = sum(datos['tipos_error'].get('database is locked', 0) for datos in operaciones.values())
+        return {
+            'duracion_s': round(duracion_s, 2),
+            'peticiones': peticiones,
+            'rendimiento_rps': round(peticiones / duracion_s, 2) if duracion_s else 0.0,
+            'tasa_error': round(errores / peticiones, 4) if peticiones else 0.0,
+            'bloqueos_sqlite': bloqueos,
+            'operaciones': operaciones,
+        }
+
+
+class ErrorPeticion(Exception):
+    pass
+
+
+def _clasificar_error(codigo, cuerpo):
+    if 'database is locked' in cuerpo:
+        return 'database is locked'
+    return f"HTTP {codigo}"
+
+
+class UsuarioVirtual:
+    """
+    Repite el flujo del frontend para un rol con pausas de 'pensar' entre pasos
+    (distribución exponencial con media 'pausa' segundos).
+    """
+    def __init__(self, url_base, username, estadisticas, pausa, aleatorio, timeout=30):
+        self.url_base = url_base.rstrip('/')
+        self.username = username
+        self.estadisticas = estadisticas
+        self.pausa = pausa
+        self.aleatorio = aleatorio
+        self.timeout = timeout
+        self.token = None
+        self.usuario_id = None
+
+    def _pensar(self, detener):
+        if self.pausa:
+            detener.wait(self.aleatorio.expovariate(1 / self.pausa))
+
+    def peticion(self, operacion, metodo, ruta, datos=None):
+        cuerpo = json.dumps(datos).encode() if datos is not None else None
+        cabeceras = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if self.token:
+            cabeceras['Authorization'] = f"Bearer {self.token}"
+        solicitud = urllib.request.Request(self.url_base + ruta, data=cuerpo, headers=cabeceras, method=metodo)
+
+        inicio = time.perf_counter()
+        error, contenido = None, None
+        try:
+            with urllib.request.urlopen(solicitud, timeout=self.timeout) as respuesta:
+                contenido = respuesta.read()
+        except urllib.error.HTTPError as excepcion:
+            error = _clasificar_error(excepcion.code, excepcion.read().decode(errors='replace'))
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as excepcion:
+            error = f"conexión: {getattr(excepcion, 'reason', excepcion)}"
+        self.estadisticas.registrar(operacion, (time.perf_counter() - inicio) * 1000, error)
+        if error:
+            raise ErrorPeticion(error)
+        return json.loads(contenido) if contenido else None
+
+    def iniciar_sesion(self):
+        tokens = self.peticion('login', 'POST', '/api/token/', {'username': self.username, 'password': CLAVE_USUARIOS})
+        self.token = tokens['access']
+        carga = self.token.split('.')[1]
+        self.usuario_id = json.loads(base64.urlsafe_b64decode(carga + '=' * (-len(carga) % 4)))['user_id']
+
+    def flujo(self, detener):
+        raise NotImplementedError
+
+    def ejecutar(self, detener):
+        while not detener.is_set():
+            try:
+                if self.token is None:
+                    self.iniciar_sesion()
+                    self._pensar(detener)
+                self.flujo(detener)
+            except ErrorPeticion as error:
+                # El error ya quedó registrado; se reintenta el flujo tras una pausa y
+                # solo se vuelve a iniciar sesión si el token dejó de valer
+                if str(error) == 'HTTP 401':
+                    self.token = None
+                self._pensar(detener)
+
+
+class ClienteVirtual(UsuarioVirtual):
+    """
+    Catálogo -> crear pedido con items -> lista de pedidos, como el frontend del cliente.
+    """
+    def flujo(self, detener):
+        productos = self.peticion('catalogo', 'GET', '/api/productos/?paginar=false')
+        self._pensar(detener)
+        disponibles = [producto for producto in productos if producto['stock'] > 0]
+        if disponibles:
+            elegidos = self.aleatorio.sample(disponibles, min(len(disponibles), self.aleatorio.randint(1, 3)))
+            self.peticion('crear_con_items', 'POST', '/api/pedidos/crear-con-items/', {
+                'pedido': {
+                    'cliente': self.usuario_id,
+                    'direccion_envio': 'Dirección de carga',
+                    'estado': 'pendiente',
+                    'monto_total': int(sum(float(producto['precio']) for producto in elegidos)),
+                },
+                'items': [{'producto_id': producto['id'], 'cantidad': 1} for producto in elegidos],
+            })
+            self._pensar(detener)
+        self.peticion('pedidos', 'GET', '/api/pedidos/?paginar=false')
+        self._pensar(detener)
+
+
+class RepartidorVirtual(UsuarioVirtual):
+    """
+    Lista de entregas -> actualización del estado de una de ellas.
+    """
+    SIGUIENTE_ESTADO = {'pendiente': 'en_camino', 'en_camino': 'entregado', 'problema': 'en_camino'}
+
+    def flujo(self, detener):
+        entregas = self.peticion('entregas', 'GET', '/api/entregas/?paginar=false')
+        self._pensar(detener)
+        abiertas = [entrega for entrega in entregas if entrega['estado'] in self.SIGUIENTE_ESTADO]
+        if abiertas:
+            entrega = self.aleatorio.choice(abiertas)
+            self.peticion('actualizar_entrega', 'PATCH', f"/api/entregas/{entrega['id']}/", {
+                'estado': self.SIGUIENTE_ESTADO[entrega['estado']],
+            })
+        self._pensar(detener)
+
+
+def ejecutar_carga(url_base, clientes, repartidores, duracion, pausa=1.0, semilla=1, timeout=30):
+    """
+    Lanza un hilo por usuario virtual ('clientes' y 'repartidores' son listas de
+    nombres de usuario) durante 'duracion' segundos y devuelve el resumen.
+    """
+    estadisticas = Estadisticas()
+    detener = threading.Event()
+    usuarios = [
+        clase(url_base, username, estadisticas, pausa, random.Random(semilla + indice), timeout)
+        for indice, (clase, username) in enumerate(
+            [(ClienteVirtual, nombre) for nombre in clientes] + [(RepartidorVirtual, nombre) for nombre in repartidores]
+        )
+    ]
+    hilos = [threading.Thread(target=usuario.ejecutar, args=(detener,), daemon=True) for usuario in usuarios]
+
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    detener.wait(duracion)
+    detener.set()
+    for hilo in hilos:
+        hilo.join(timeout + 5)
+    return estadisticas.resumen(time.perf_counter() - inicio)
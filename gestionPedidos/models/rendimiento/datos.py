@@ -0,0 +1,109 @@
+# models/rendimiento/datos.py
+
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from models.entrega.models import Entrega
+from models.itemPedido.models import ItemPedido
+from models.pedido.models import Pedido
+from models.perfil.models import PerfilUsuario
+from models.producto.models import Producto
+from models.ventas.acumulados import reconstruir
+
+# Volúmenes predefinidos para 'generar_datos' y 'benchmark' (--escala)
+ESCALAS = {
+    'minima': {'admins': 1, 'clientes': 5, 'repartidores': 2, 'productos': 20, 'pedidos': 50, 'items_por_pedido': 3, 'proporcion_entregas': 0.5},
+    'pequena': {'admins': 2, 'clientes': 50, 'repartidores': 10, 'productos': 200, 'pedidos': 2000, 'items_por_pedido': 3, 'proporcion_entregas': 0.6},
+    'mediana': {'admins': 5, 'clientes': 500, 'repartidores': 50, 'productos': 2000, 'pedidos': 20000, 'items_por_pedido': 4, 'proporcion_entregas': 0.6},
+    'grande': {'admins': 10, 'clientes': 5000, 'repartidores': 200, 'productos': 20000, 'pedidos': 200000, 'items_por_pedido': 4, 'proporcion_entregas': 0.6},
+}
+
+CLAVE_USUARIOS = 'benchmark'
+TAMANO_LOTE = 1000
+
+
+def _crear_usuarios(rol, cantidad, prefijo, clave):
+    usuarios = User.objects.bulk_create(
+        [User(username=f"{prefijo}_{rol}_{indice}", password=clave, email=f"{prefijo}_{rol}_{indice}@example.com")
+         for indice in range(cantidad)],
+        batch_size=TAMANO_LOTE,
+    )
+    PerfilUsuario.objects.bulk_create(
+        [PerfilUsuario(usuario=usuario, rol=rol) for usuario in usuarios],
+        batch_size=TAMANO_LOTE,
+    )
+    return usuarios
+
+
+def generar_datos(admins, clientes, repartidores, productos, pedidos, items_por_pedido,
+                  proporcion_entregas, semilla=1, prefijo='bench'):
+    """
+    Siembra un conjunto sintético con bulk_create (sin señales ni save() por fila):
+    usuarios de cada rol con su perfil, productos, pedidos con sus items y entregas
+    asignadas a repartidores. Los acumulados de ventas se reconstruyen al final.
+
+    Todos los usuarios comparten la contraseña CLAVE_USUARIOS, con el hash calculado
+    una sola vez. Devuelve {rol: [usuarios]} para usarlos en los escenarios.
+    """
+    aleatorio = random.Random(semilla)
+    clave = make_password(CLAVE_USUARIOS)
+
+    with transaction.atomic():
+        usuarios = {
+            'admin': _crear_usuarios('admin', admins, prefijo, clave),
+            'cliente': _crear_usuarios('cliente', clientes, prefijo, clave),
+            'repartidor': _crear_usuarios('repartidor', repartidores, prefijo, clave),
+        }
+
+        catalogo = Producto.objects.bulk_create(
+            [Producto(
+                nombre=f"Producto {indice} {aleatorio.choice(['teclado', 'mouse', 'monitor', 'cable', 'silla'])}",
+                descripcion=f"Descripción del producto {indice}",
+                precio=Decimal(aleatorio.randint(100, 100000)) / 100,
+                stock=aleatorio.randint(1000, 100000),
+            ) for indice in range(productos)],
+            batch_size=TAMANO_LOTE,
+        )
+
+        estados = [estado for estado, _ in Pedido.ESTADOS_PEDIDO]
+        for inicio in range(0, pedidos, TAMANO_LOTE):
+            lote = Pedido.objects.bulk_create([
+                Pedido(
+                    cliente=aleatorio.choice(usuarios['cliente']),
+                    estado=aleatorio.choice(estados),
+                    direccion_envio=f"Calle {indice}",
+                )
+                for indice in range(inicio, min(inicio + TAMANO_LOTE, pedidos))
+            ])
+
+            items = []
+            for pedido in lote:
+                lineas = [
+                    ItemPedido(
+                        pedido=pedido, producto=producto,
+                        cantidad=aleatorio.randint(1, 5), precio_al_comprar=producto.precio,
+                    )
+                    for producto in aleatorio.sample(catalogo, min(items_por_pedido, len(catalogo)))
+                ]
+                pedido.monto_total = sum(item.cantidad * item.precio_al_comprar for item in lineas)
+                items.extend(lineas)
+            ItemPedido.objects.bulk_create(items, batch_size=TAMANO_LOTE)
+            Pedido.objects.bulk_update(lote, ['monto_total'], batch_size=TAMANO_LOTE)
+
+            if usuarios['repartidor']:
+                Entrega.objects.bulk_create([
+                    Entrega(
+                        pedido=pedido,
+                        asignado_a=aleatorio.choice(usuarios['repartidor']),
+                        estado=aleatorio.choice([estado for estado, _ in Entrega.ESTADOS_ENTREGA]),
+                        numero_seguimiento=f"SEG-{pedido.pk}",
+                    )
+                    for pedido in lote if aleatorio.random() < proporcion_entregas
+                ])
+
+        reconstruir()
+    return usuarios
@@ -0,0 +1,58 @@
+# models/rendimiento/escenarios.py
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from django.urls import reverse
+
+from models.reporte import cache as cache_reportes
+
+
+@dataclass
+class Escenario:
+    """
+    Petición a medir: método, ruta, rol del usuario que la hace y, opcionalmente,
+    el cuerpo (función del contexto) y una preparación previa a cada repetición.
+    """
+    nombre: str
+    metodo: str
+    ruta: str
+    rol: str
+    datos: Optional[Callable] = None
+    preparar: Optional[Callable] = None
+    repeticiones: Optional[int] = None
+    codigos: tuple = (200,)
+
+
+def _datos_crear_con_items(contexto):
+    productos = contexto['productos']
+    cliente = contexto['usuario']
+    return {
+        "pedido": {"cliente": cliente.id, "estado": "pendiente", "direccion_envio": "Calle benchmark", "monto_total": 100},
+        "items": [{"producto_id": productos[indice % len(productos)], "cantidad": 1} for indice in range(3)],
+    }
+
+
+def escenarios():
+    """
+    Escenarios de la suite. Los listados se miden con cada rol porque el queryset
+    (y el plan de consultas) depende de él.
+    """
+    pedidos = reverse('pedido-list')
+    entregas = reverse('entrega-list')
+    lista = [
+        Escenario(f"pedidos.lista[{rol}]", 'get', pedidos, rol) for rol in ('admin', 'cliente', 'repartidor')
+    ] + [
+        Escenario(f"entregas.lista[{rol}]", 'get', entregas, rol) for rol in ('admin', 'cliente', 'repartidor')
+    ]
+    lista += [
+        Escenario('productos.lista', 'get', reverse('producto-list'), 'cliente'),
+        Escenario('productos.buscar', 'get', reverse('producto-buscar') + '?q=tecl', 'cliente'),
+        Escenario('pedidos.crear_con_items', 'post', reverse('pedido-crear-con-items'), 'cliente',
+                  datos=_datos_crear_con_items, codigos=(201,)),
+        Escenario('pedidos.reporte_pdf', 'get', reverse('pedido-reporte-pdf'), 'admin',
+                  preparar=lambda contexto: cache_reportes.invalidar('pedidos'), repeticiones=3),
+        Escenario('entregas.reporte_pdf', 'get', reverse('entrega-reporte-pdf'), 'admin',
+                  preparar=lambda contexto: cache_reportes.invalidar('entregas'), repeticiones=3),
+    ]
+    return lista
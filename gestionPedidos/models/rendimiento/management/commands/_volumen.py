@@ -0,0 +1,17 @@
+from models.rendimiento.datos import ESCALAS
+
+
+def agregar_argumentos_volumen(parser):
+    parser.add_argument('--escala', choices=sorted(ESCALAS), default='pequena', help="Volumen predefinido de datos.")
+    for campo, tipo in (('admins', int), ('clientes', int), ('repartidores', int), ('productos', int),
+                        ('pedidos', int), ('items_por_pedido', int), ('proporcion_entregas', float)):
+        parser.add_argument(f"--{campo.replace('_', '-')}", dest=campo, type=tipo, help="Sustituye el valor de la escala.")
+    parser.add_argument('--semilla', type=int, default=1)
+
+
+def volumen_desde_opciones(options):
+    volumen = dict(ESCALAS[options['escala']])
+    for campo in volumen:
+        if options.get(campo) is not None:
+            volumen[campo] = options[campo]
+    return volumen
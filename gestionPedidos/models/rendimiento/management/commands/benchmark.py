@@ -0,0 +1,85 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from models.producto.models import Producto
+from models.rendimiento.datos import generar_datos
+from models.rendimiento.escenarios import escenarios
+from models.rendimiento.medicion import cargar_base, comparar, ejecutar_suite, guardar_base
+from ._volumen import agregar_argumentos_volumen, volumen_desde_opciones
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide los endpoints principales (latencia p50/p90/p95/p99, consultas y pico de memoria) "
+        "sobre una base de pruebas aislada sembrada con datos sintéticos."
+    )
+
+    def add_arguments(self, parser):
+        agregar_argumentos_volumen(parser)
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument('--filtro', help="Solo los escenarios cuyo nombre contenga este texto.")
+        parser.add_argument('--guardar', nargs='?', const='', help="Guarda los resultados como base (ruta opcional).")
+        parser.add_argument('--comparar', nargs='?', const='', help="Compara con una base guardada (ruta opcional).")
+        parser.add_argument('--tolerancia', type=float, default=0.2, help="Aumento de p95 admitido (0.2 = 20%%).")
+
+    def _ruta_base(self, valor, escala):
+        if valor:
+            return Path(valor)
+        directorio = Path(getattr(settings, 'BENCHMARK_DIR', settings.BASE_DIR / 'benchmarks'))
+        return directorio / f"base_{escala}.json"
+
+    def handle(self, *args, **options):
+        volumen = volumen_desde_opciones(options)
+        ruta_comparar = self._ruta_base(options['comparar'], options['escala']) if options['comparar'] is not None else None
+        if ruta_comparar and not ruta_comparar.exists():
+            raise CommandError(f"No existe la base {ruta_comparar}. Genérela con --guardar.")
+
+        # Base de datos de pruebas y correo en memoria: el benchmark no toca datos reales
+        setup_test_environment()
+        nombre_original = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with tempfile.TemporaryDirectory() as temporal, override_settings(REPORTES_CACHE_DIR=Path(temporal)):
+                self.stdout.write(f"Sembrando datos ({options['escala']}): {volumen}")
+                usuarios = generar_datos(**volumen, semilla=options['semilla'])
+                contexto = {'productos': list(Producto.objects.values_list('id', flat=True)[:50])}
+                resultados = ejecutar_suite(escenarios(), usuarios, contexto, options['repeticiones'], options['filtro'])
+        finally:
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+            teardown_test_environment()
+
+        self._mostrar(resultados)
+
+        if options['guardar'] is not None:
+            ruta = self._ruta_base(options['guardar'], options['escala'])
+            guardar_base(ruta, resultados, {'escala': options['escala'], 'volumen': volumen})
+            self.stdout.write(self.style.SUCCESS(f"Base guardada en {ruta}"))
+
+        if ruta_comparar:
+            self._comparar(cargar_base(ruta_comparar), resultados, options['tolerancia'])
+
+    def _mostrar(self, resultados):
+        self.stdout.write(f"{'escenario':32} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'consultas':>9} {'mem KB':>9}")
+        for nombre, m in resultados.items():
+            self.stdout.write(
+                f"{nombre:32} {m['p50_ms']:9.2f} {m['p90_ms']:9.2f} {m['p95_ms']:9.2f} {m['p99_ms']:9.2f} "
+                f"{m['consultas']:9d} {m['memoria_pico_kb']:9.1f}"
+            )
+
+    def _comparar(self, base, resultados, tolerancia):
+        regresiones = []
+        for nombre, metrica, anterior, actual, regresion in comparar(base, resultados, tolerancia):
+            cambio = f"{(actual - anterior) / anterior * 100:+.1f}%" if anterior else 'n/a'
+            linea = f"{nombre:32} {metrica:16} {anterior:>10} -> {actual:>10} ({cambio})"
+            if regresion:
+                regresiones.append(nombre)
+                self.stdout.write(self.style.ERROR(linea))
+            else:
+                self.stdout.write(linea)
+        if regresiones:
+            raise CommandError(f"Regresiones respecto a la base: {', '.join(sorted(set(regresiones)))}")
+        self.stdout.write(self.style.SUCCESS("Sin regresiones respecto a la base."))
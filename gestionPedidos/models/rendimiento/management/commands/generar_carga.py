@@ -0,0 +1,67 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from models.rendimiento.carga import LIMITES_HISTOGRAMA_MS, ejecutar_carga
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera carga concurrente contra un servidor en marcha repitiendo los flujos del "
+        "frontend (clientes y repartidores). Usa los usuarios creados con 'generar_datos'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="URL base del servidor.")
+        parser.add_argument('--usuarios', type=int, default=10, help="Usuarios virtuales concurrentes.")
+        parser.add_argument('--proporcion-repartidores', type=float, default=0.2)
+        parser.add_argument('--duracion', type=float, default=60, help="Segundos de carga.")
+        parser.add_argument('--pausa', type=float, default=1.0, help="Pausa media entre pasos (segundos).")
+        parser.add_argument('--prefijo', default='bench', help="Prefijo usado en 'generar_datos'.")
+        parser.add_argument('--semilla', type=int, default=1)
+        parser.add_argument('--json', help="Guarda el resumen en este archivo.")
+
+    def _usuarios(self, prefijo, rol, cantidad):
+        nombres = list(
+            User.objects.filter(username__startswith=f"{prefijo}_{rol}_", perfil__rol=rol)
+            .order_by('id').values_list('username', flat=True)[:cantidad]
+        )
+        if cantidad and not nombres:
+            raise CommandError(f"No hay usuarios '{prefijo}_{rol}_*'. Ejecute antes 'generar_datos'.")
+        return [nombres[indice % len(nombres)] for indice in range(cantidad)]
+
+    def handle(self, *args, **options):
+        repartidores = round(options['usuarios'] * options['proporcion_repartidores'])
+        clientes = options['usuarios'] - repartidores
+        resumen = ejecutar_carga(
+            options['url'],
+            self._usuarios(options['prefijo'], 'cliente', clientes),
+            self._usuarios(options['prefijo'], 'repartidor', repartidores),
+            options['duracion'], options['pausa'], options['semilla'],
+        )
+        self._mostrar(resumen)
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as archivo:
+                json.dump(resumen, archivo, indent=2, ensure_ascii=False)
+
+    def _mostrar(self, resumen):
+        self.stdout.write(
+            f"{resumen['peticiones']} peticiones en {resumen['duracion_s']} s: "
+            f"{resumen['rendimiento_rps']} pet/s, tasa de error {resumen['tasa_error']:.2%}, "
+            f"'database is locked': {resumen['bloqueos_sqlite']}"
+        )
+        columnas = [f"<={limite}" for limite in LIMITES_HISTOGRAMA_MS] + [f">{LIMITES_HISTOGRAMA_MS[-1]}"]
+        for operacion, datos in resumen['operaciones'].items():
+            self.stdout.write(
+                f"\n{operacion}: {datos['peticiones']} pet, {datos['errores']} errores, "
+                f"p50 {datos['p50_ms']} ms, p95 {datos['p95_ms']} ms, p99 {datos['p99_ms']} ms, máx {datos['max_ms']} ms"
+            )
+            for tipo, cantidad in datos['tipos_error'].items():
+                self.stdout.write(self.style.ERROR(f"    {tipo}: {cantidad}"))
+            maximo = max(datos['histograma'].values())
+            for columna in columnas:
+                cantidad = datos['histograma'].get(columna, 0)
+                if cantidad:
+                    barra = '#' * max(1, round(cantidad / maximo * 40))
+                    self.stdout.write(f"    {columna:>7} ms {cantidad:6d} {barra}")
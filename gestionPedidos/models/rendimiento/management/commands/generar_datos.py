@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from models.rendimiento.datos import CLAVE_USUARIOS, generar_datos
+from ._volumen import agregar_argumentos_volumen, volumen_desde_opciones
+
+
+class Command(BaseCommand):
+    help = "Siembra datos sintéticos (usuarios por rol, productos, pedidos, items y entregas) en la base configurada."
+
+    def add_arguments(self, parser):
+        agregar_argumentos_volumen(parser)
+        parser.add_argument('--prefijo', default='bench', help="Prefijo de los nombres de usuario generados.")
+
+    def handle(self, *args, **options):
+        volumen = volumen_desde_opciones(options)
+        usuarios = generar_datos(**volumen, semilla=options['semilla'], prefijo=options['prefijo'])
+        resumen = ', '.join(f"{len(lista)} {rol}" for rol, lista in usuarios.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Datos generados ({resumen}; {volumen['productos']} productos, {volumen['pedidos']} pedidos). "
+            f"Contraseña de los usuarios: '{CLAVE_USUARIOS}'."
+        ))
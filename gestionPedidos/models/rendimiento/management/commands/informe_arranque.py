@@ -0,0 +1,73 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from models.rendimiento.arranque import medir_arranque, tiempo_por_paquete
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el arranque en frío en un proceso nuevo: ajustes, carga de cada app "
+        "(importación, modelos y ready), URLs, middleware y primera petición, con el "
+        "coste de importación por paquete y por módulo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ruta', default='/api/productos/', help="Ruta de la primera petición (GET).")
+        parser.add_argument('--top', type=int, default=15, help="Módulos y paquetes a listar.")
+        parser.add_argument('--maximo-ms', type=float, help="Falla si la primera respuesta tarda más.")
+        parser.add_argument('--json', help="Guarda el resultado completo en este archivo.")
+
+    def handle(self, *args, **options):
+        try:
+            resultado = medir_arranque(options['ruta'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        self._mostrar(resultado, options['top'])
+        if options['json']:
+            with open(options['json'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+
+        if resultado['diferidos_cargados']:
+            self.stdout.write(self.style.WARNING(
+                f"Se cargaron en el arranque módulos que deberían ser diferidos: "
+                f"{', '.join(resultado['diferidos_cargados'])}"
+            ))
+        maximo = options['maximo_ms']
+        if maximo is None:
+            maximo = getattr(settings, 'ARRANQUE_PRIMERA_RESPUESTA_MAXIMA_MS', None)
+        if maximo is not None and resultado['primera_respuesta_ms'] > maximo:
+            raise CommandError(
+                f"Primera respuesta en {resultado['primera_respuesta_ms']} ms; máximo: {maximo} ms"
+            )
+
+    def _mostrar(self, resultado, top):
+        self.stdout.write(
+            f"GET {resultado['ruta']} -> {resultado['estado']}: primera respuesta en "
+            f"{resultado['primera_respuesta_ms']} ms ({resultado['proceso_ms']} ms con el arranque del intérprete)"
+        )
+        self.stdout.write("\nFases:")
+        for fase, duracion in resultado['fases'].items():
+            self.stdout.write(f"  {fase.removesuffix('_ms'):20} {duracion:9.2f} ms")
+
+        self.stdout.write(f"\n{'app':24} {'importación':>12} {'modelos':>9} {'ready':>9}  (ms)")
+        apps = sorted(
+            resultado['apps'].items(),
+            key=lambda par: -sum(par[1].values()),
+        )
+        for etiqueta, tiempos in apps:
+            self.stdout.write(
+                f"{etiqueta:24} {tiempos.get('importacion_ms', 0):12.2f} "
+                f"{tiempos.get('modelos_ms', 0):9.2f} {tiempos.get('ready_ms', 0):9.2f}"
+            )
+
+        self.stdout.write(f"\n{'paquete':32} {'propio':>9}  (ms)")
+        for paquete, total in tiempo_por_paquete(resultado['importaciones'])[:top]:
+            self.stdout.write(f"{paquete:32} {total:9.2f}")
+
+        self.stdout.write(f"\n{'módulo':48} {'acumulado':>10} {'propio':>9}  (ms)")
+        modulos = sorted(resultado['importaciones'], key=lambda fila: -fila['acumulado_ms'])
+        for fila in modulos[:top]:
+            self.stdout.write(f"{fila['modulo']:48} {fila['acumulado_ms']:10.2f} {fila['propio_ms']:9.2f}")
@@ -0,0 +1,121 @@
+# models/rendimiento/medicion.py
+
+import json
+import math
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def percentil(valores, porcentaje):
+    """
+    Percentil por rango más cercano sobre una lista de valores.
+    """
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posicion = max(0, math.ceil(porcentaje / 100 * len(ordenados)) - 1)
+    return ordenados[posicion]
+
+
+def _peticion(cliente, escenario, contexto):
+    if escenario.preparar:
+        escenario.preparar(contexto)
+    datos = escenario.datos(contexto) if escenario.datos else None
+    response = getattr(cliente, escenario.metodo)(escenario.ruta, datos, format='json' if datos is not None else None)
+    if response.status_code not in escenario.codigos:
+        raise AssertionError(f"{escenario.nombre}: respuesta {response.status_code} inesperada")
+    # Las respuestas en streaming o de archivo se consumen completas
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def medir_escenario(escenario, usuario, contexto, repeticiones=20):
+    """
+    Ejecuta el escenario con el test client autenticado como 'usuario': una vuelta de
+    calentamiento, 'repeticiones' vueltas cronometradas contando consultas y una
+    última con tracemalloc para el pico de memoria (aparte, porque tracemalloc
+    ralentiza la ejecución). Devuelve un diccionario con las métricas en milisegundos.
+    """
+    cliente = APIClient()
+    cliente.force_authenticate(user=usuario)
+    contexto = dict(contexto, usuario=usuario)
+    repeticiones = escenario.repeticiones or repeticiones
+
+    _peticion(cliente, escenario, contexto)
+
+    tiempos, consultas = [], []
+    for _ in range(repeticiones):
+        with CaptureQueriesContext(connection) as capturadas:
+            inicio = time.perf_counter()
+            _peticion(cliente, escenario, contexto)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        consultas.append(len(capturadas.captured_queries))
+
+    tracemalloc.start()
+    try:
+        _peticion(cliente, escenario, contexto)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'repeticiones': repeticiones,
+        'p50_ms': round(percentil(tiempos, 50), 3),
+        'p90_ms': round(percentil(tiempos, 90), 3),
+        'p95_ms': round(percentil(tiempos, 95), 3),
+        'p99_ms': round(percentil(tiempos, 99), 3),
+        'max_ms': round(max(tiempos), 3),
+        'consultas': max(consultas),
+        'memoria_pico_kb': round(pico / 1024, 1),
+    }
+
+
+def ejecutar_suite(escenarios, usuarios, contexto, repeticiones=20, filtro=None):
+    """
+    Mide cada escenario (opcionalmente solo los que contienen 'filtro' en el nombre)
+    con el primer usuario de su rol. Devuelve {nombre: métricas}.
+    """
+    resultados = {}
+    for escenario in escenarios:
+        if filtro and filtro not in escenario.nombre:
+            continue
+        resultados[escenario.nombre] = medir_escenario(escenario, usuarios[escenario.rol][0], contexto, repeticiones)
+    return resultados
+
+
+def guardar_base(ruta, resultados, metadatos):
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(json.dumps({'metadatos': metadatos, 'resultados': resultados}, indent=2, ensure_ascii=False))
+
+
+def cargar_base(ruta):
+    return json.loads(ruta.read_text())['resultados']
+
+
+def comparar(base, resultados, tolerancia=0.2):
+    """
+    Compara contra una base guardada. Es regresión que el p95 crezca más que la
+    tolerancia (proporción) o que aumente el número de consultas. Devuelve una lista
+    de (nombre, métrica, base, actual, regresion).
+    """
+    filas = []
+    for nombre, actual in resultados.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            continue
+        for metrica in ('p50_ms', 'p95_ms', 'consultas', 'memoria_pico_kb'):
+            if metrica not in anterior:
+                continue
+            if metrica == 'consultas':
+                regresion = actual[metrica] > anterior[metrica]
+            elif metrica == 'p95_ms':
+                regresion = actual[metrica] > anterior[metrica] * (1 + tolerancia)
+            else:
+                regresion = False
+            filas.append((nombre, metrica, anterior[metrica], actual[metrica], regresion))
+    return filas
@@ -0,0 +1,268 @@
+# models/rendimiento/middleware.py
+
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+
+from .perfilador import PerfiladorMuestreo, guardar_perfil, ruta_seleccionada
+
+logger = logging.getLogger('models.rendimiento.peticiones')
+
+
+class PresupuestoConsultasExcedido(AssertionError):
+    pass
+
+
+class _Medicion:
+    """
+    Contadores de una petición.
+    """
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_db = 0.0
+        self.fin_vista = None
+
+
+# Perfilador de la petición en curso (solo con ASGI y si se perfila)
+_perfilador_actual = ContextVar('perfilador_actual', default=None)
+
+# Medición de la petición en curso. Con ASGI las consultas corren en el hilo de
+# sync_to_async, que hereda el contexto de la petición.
+_medicion_actual = ContextVar('medicion_actual', default=None)
+
+
+def _medir_consulta(execute, sql, params, many, context):
+    """
+    execute_wrapper instalado en todas las conexiones: cuenta las consultas (también
+    con DEBUG=False) en la medición de la petición en curso, si la hay.
+    """
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicion.tiempo_db += time.perf_counter() - inicio
+        medicion.consultas += 1
+
+
+@receiver(connection_created, dispatch_uid='rendimiento_medir_conexion')
+@receiver(request_started, dispatch_uid='rendimiento_medir_peticion')
+def _instalar_medidor(sender, connection=None, **kwargs):
+    """
+    Las conexiones son por hilo: se instala el medidor en las que abre cada hilo y, al
+    empezar cada petición, en las ya abiertas del hilo que atiende la base de datos.
+    """
+    for conexion in [connection] if connection is not None else connections.all(initialized_only=True):
+        if _medir_consulta not in conexion.execute_wrappers:
+            conexion.execute_wrappers.append(_medir_consulta)
+
+
+def presupuesto_consultas(nombre_vista):
+    """
+    Máximo de consultas permitido para la vista (nombre de la URL, p. ej. 'pedido-list'),
+    según PRESUPUESTOS_CONSULTAS, o PRESUPUESTO_CONSULTAS_DEFECTO si no está listada.
+    """
+    presupuestos = getattr(settings, 'PRESUPUESTOS_CONSULTAS', {})
+    return presupuestos.get(nombre_vista, getattr(settings, 'PRESUPUESTO_CONSULTAS_DEFECTO', None))
+
+
+class MedicionPeticionMiddleware:
+    """
+    Mide cada petición: número de consultas, tiempo en base de datos, tiempo de la
+    vista sin base de datos (en DRF, sobre todo la serialización de los objetos),
+    tiempo de render de la respuesta y total. Lo publica en la cabecera Server-Timing
+    y en una línea JSON del logger 'models.rendimiento.peticiones'.
+
+    Si la vista supera su presupuesto de consultas, con PRESUPUESTO_CONSULTAS_ESTRICTO
+    (por defecto en los tests) lanza PresupuestoConsultasExcedido; si no, deja un warning.
+
+    Funciona con WSGI y con ASGI; en las vistas asíncronas el render forma parte de la vista.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        medicion, inicio, contexto = self._empezar(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _medicion_actual.reset(contexto)
+        return self._terminar(request, response, medicion, inicio)
+
+    async def __acall__(self, request):
+        medicion, inicio, contexto = self._empezar(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _medicion_actual.reset(contexto)
+        return self._terminar(request, response, medicion, inicio)
+
+    def _empezar(self, request):
+        _instalar_medidor(None)
+        medicion = _Medicion()
+        request._medicion = medicion
+        return medicion, time.perf_counter(), _medicion_actual.set(medicion)
+
+    def _terminar(self, request, response, medicion, inicio):
+        total = time.perf_counter() - inicio
+
+        fin_vista = medicion.fin_vista or inicio + total
+        db_ms = medicion.tiempo_db * 1000
+        vista_ms = max((fin_vista - inicio) * 1000 - db_ms, 0.0)
+        render_ms = (inicio + total - fin_vista) * 1000
+        total_ms = total * 1000
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.1f};desc="{medicion.consultas} consultas"',
+            f'vista;dur={vista_ms:.1f}',
+            f'render;dur={render_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+        coincidencia = getattr(request, 'resolver_match', None)
+        nombre_vista = coincidencia.view_name if coincidencia else None
+        presupuesto = presupuesto_consultas(nombre_vista) if nombre_vista else None
+        logger.info(json.dumps({
+            'metodo': request.method,
+            'ruta': request.path,
+            'vista': nombre_vista,
+            'estado': response.status_code,
+            'consultas': medicion.consultas,
+            'presupuesto': presupuesto,
+            'db_ms': round(db_ms, 2),
+            'vista_ms': round(vista_ms, 2),
+            'render_ms': round(render_ms, 2),
+            'total_ms': round(total_ms, 2),
+        }))
+
+        if presupuesto is not None and medicion.consultas > presupuesto:
+            mensaje = (
+                f"{request.method} {request.path} ({nombre_vista}) ejecutó {medicion.consultas} "
+                f"consultas; presupuesto: {presupuesto}"
+            )
+            if getattr(settings, 'PRESUPUESTO_CONSULTAS_ESTRICTO', False):
+                raise PresupuestoConsultasExcedido(mensaje)
+            logger.warning(mensaje)
+        return response
+
+    def process_template_response(self, request, response):
+        # Las respuestas de DRF se renderizan después de este punto
+        medicion = getattr(request, '_medicion', None)
+        if medicion is not None:
+            medicion.fin_vista = time.perf_counter()
+        return response
+
+
+def _es_administrador(request):
+    """
+    Administrador por sesión (is_staff) o por el token de la API (rol 'admin'). Solo se
+    consulta cuando la petición trae la cabecera X-Perfilar.
+    """
+    usuario = getattr(request, 'user', None)
+    if usuario is not None and usuario.is_authenticated and usuario.is_staff:
+        return True
+    for clase in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            resultado = clase().authenticate(request)
+        except exceptions.APIException:
+            return False
+        if resultado is None:
+            continue
+        try:
+            return resultado[0].perfil.rol == 'admin'
+        except Exception:
+            return False
+    return False
+
+
+class PerfiladorMiddleware:
+    """
+    Perfila peticiones con PerfiladorMuestreo y guarda el árbol de llamadas en
+    PERFILADOR_DIR (ver models.rendimiento.perfilador). Se perfila una petición si:
+
+    - la envía un administrador con la cabecera 'X-Perfilar: 1', o
+    - su ruta cumple PERFILADOR_RUTAS (o no hay rutas configuradas) y entra en el
+      PERFILADOR_PORCENTAJE de peticiones muestreadas.
+
+    Con PERFILADOR_PORCENTAJE = 0 y sin la cabecera, el coste es una lectura de ajuste.
+    La respuesta perfilada lleva el nombre del archivo en la cabecera X-Perfil.
+
+    Con ASGI, las vistas síncronas (DRF) corren en el hilo de sync_to_async: process_view
+    pasa el perfilador a ese hilo. En las vistas asíncronas se sigue muestreando el
+    bucle de eventos y el tiempo del ORM async aparece como espera.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self._seguir_vista
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        perfilar = bool(request.headers.get('X-Perfilar')) and _es_administrador(request)
+        if not (perfilar or self._muestreada(request)):
+            return self.get_response(request)
+
+        inicio = time.perf_counter()
+        with PerfiladorMuestreo(getattr(settings, 'PERFILADOR_INTERVALO_MS', 1) / 1000) as perfilador:
+            response = self.get_response(request)
+        return self._guardar(request, response, perfilador, inicio)
+
+    async def __acall__(self, request):
+        # Solo la cabecera obliga a autenticar (y a pasar por un hilo) antes de la vista
+        perfilar = bool(request.headers.get('X-Perfilar')) and await sync_to_async(_es_administrador)(request)
+        if not (perfilar or self._muestreada(request)):
+            return await self.get_response(request)
+
+        inicio = time.perf_counter()
+        with PerfiladorMuestreo(getattr(settings, 'PERFILADOR_INTERVALO_MS', 1) / 1000) as perfilador:
+            contexto = _perfilador_actual.set(perfilador)
+            try:
+                response = await self.get_response(request)
+            finally:
+                _perfilador_actual.reset(contexto)
+        return self._guardar(request, response, perfilador, inicio)
+
+    async def _seguir_vista(self, request, vista, args, kwargs):
+        perfilador = _perfilador_actual.get()
+        if perfilador is not None and not iscoroutinefunction(vista):
+            # Mismo hilo que la vista: ThreadSensitiveContext de la petición
+            await sync_to_async(perfilador.seguir_hilo_actual)()
+        return None
+
+    def _guardar(self, request, response, perfilador, inicio):
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        titulo = f"{request.method} {request.get_full_path()} -> {response.status_code} en {duracion_ms:.1f} ms"
+        response['X-Perfil'] = guardar_perfil(perfilador.informe(titulo), request.method, request.path, duracion_ms)
+        return response
+
+    def _muestreada(self, request):
+        porcentaje = getattr(settings, 'PERFILADOR_PORCENTAJE', 0)
+        if not porcentaje:
+            return False
+        return random.random() * 100 < porcentaje and ruta_seleccionada(request.path)
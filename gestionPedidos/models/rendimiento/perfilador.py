@@ -0,0 +1,165 @@
+# models/rendimiento/perfilador.py
+
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+
+class _Nodo:
+    __slots__ = ('total', 'propio', 'hijos')
+
+    def __init__(self):
+        self.total = 0.0
+        self.propio = 0.0
+        self.hijos = {}
+
+
+class PerfiladorMuestreo:
+    """
+    Perfilador por muestreo: un hilo aparte toma la pila del hilo perfilado cada
+    'intervalo' segundos (sys._current_frames) y acumula el tiempo transcurrido en un
+    árbol de llamadas. No instala hooks de trazado, así que el hilo perfilado corre a
+    velocidad normal salvo por el GIL que toma el muestreo.
+    """
+    def __init__(self, intervalo=0.001):
+        self.intervalo = intervalo
+        self.raiz = _Nodo()
+        self.muestras = 0
+        self._hilo_objetivo = None
+        self._marco_base = None
+        self._codigo_base = None
+        self._detener = threading.Event()
+        self._muestreador = None
+
+    def __enter__(self):
+        self._hilo_objetivo = threading.get_ident()
+        # Solo interesan las llamadas hechas desde el bloque 'with', no las de más arriba
+        self._marco_base = sys._getframe(1)
+        self._muestreador = threading.Thread(target=self._muestrear, name='perfilador', daemon=True)
+        self._muestreador.start()
+        return self
+
+    def seguir_hilo_actual(self):
+        """
+        Pasa a muestrear el hilo que llama. Con ASGI las vistas síncronas corren en el
+        hilo de sync_to_async, no en el del bucle de eventos que abrió el perfilador;
+        sus pilas se recortan en la llamada de asgiref que ejecuta la función.
+        """
+        from asgiref.sync import SyncToAsync
+
+        self._marco_base = None
+        self._codigo_base = SyncToAsync.thread_handler.__code__
+        self._hilo_objetivo = threading.get_ident()
+
+    def __exit__(self, *exc):
+        self._detener.set()
+        self._muestreador.join()
+        self._marco_base = None
+        return False
+
+    def _muestrear(self):
+        anterior = time.perf_counter()
+        while not self._detener.wait(self.intervalo):
+            marco = sys._current_frames().get(self._hilo_objetivo)
+            ahora = time.perf_counter()
+            transcurrido, anterior = ahora - anterior, ahora
+            if marco is None:
+                continue
+            pila = []
+            while marco is not None and marco is not self._marco_base and marco.f_code is not self._codigo_base:
+                codigo = marco.f_code
+                pila.append((codigo.co_name, codigo.co_filename, codigo.co_firstlineno))
+                marco = marco.f_back
+            self._acumular(reversed(pila), transcurrido)
+
+    def _acumular(self, pila, transcurrido):
+        nodo = self.raiz
+        nodo.total += transcurrido
+        for clave in pila:
+            nodo = nodo.hijos.setdefault(clave, _Nodo())
+            nodo.total += transcurrido
+        nodo.propio += transcurrido
+        self.muestras += 1
+
+    def informe(self, titulo, minimo_porcentaje=0.5):
+        """
+        Árbol de llamadas en texto con tiempo acumulado y propio (ms) por función.
+        Se omiten las ramas por debajo de 'minimo_porcentaje' del total.
+        """
+        total = self.raiz.total or 1e-9
+        lineas = [
+            titulo,
+            f"{self.muestras} muestras, intervalo {self.intervalo * 1000:g} ms",
+            '',
+            f"{'acumulado_ms':>12} {'propio_ms':>10}  función",
+        ]
+
+        def recorrer(nodo, profundidad):
+            for (nombre, archivo, linea), hijo in sorted(nodo.hijos.items(), key=lambda par: -par[1].total):
+                if hijo.total / total * 100 < minimo_porcentaje:
+                    continue
+                lineas.append(
+                    f"{hijo.total * 1000:12.2f} {hijo.propio * 1000:10.2f}  "
+                    f"{'  ' * profundidad}{nombre} ({_ruta_corta(archivo)}:{linea})"
+                )
+                recorrer(hijo, profundidad + 1)
+
+        recorrer(self.raiz, 0)
+        return '\n'.join(lineas) + '\n'
+
+
+def _ruta_corta(archivo):
+    for prefijo in (str(settings.BASE_DIR), *sys.path):
+        if prefijo and archivo.startswith(prefijo):
+            return os.path.relpath(archivo, prefijo)
+    return archivo
+
+
+def directorio_perfiles():
+    return Path(getattr(settings, 'PERFILADOR_DIR', settings.BASE_DIR / 'perfiles'))
+
+
+@lru_cache(maxsize=8)
+def _compilar(patrones):
+    return [re.compile(patron) for patron in patrones]
+
+
+def ruta_seleccionada(ruta):
+    """
+    Indica si la ruta cumple PERFILADOR_RUTAS (expresiones regulares). Sin patrones,
+    aplica a todas.
+    """
+    patrones = tuple(getattr(settings, 'PERFILADOR_RUTAS', ()))
+    return not patrones or any(patron.search(ruta) for patron in _compilar(patrones))
+
+
+def guardar_perfil(contenido, metodo, ruta, duracion_ms):
+    """
+    Escribe el informe en PERFILADOR_DIR y conserva solo los PERFILADOR_MAXIMO_ARCHIVOS
+    más recientes. Devuelve el nombre del archivo.
+    """
+    directorio = directorio_perfiles()
+    directorio.mkdir(parents=True, exist_ok=True)
+    segmento = re.sub(r'[^A-Za-z0-9]+', '_', ruta).strip('_')[:60] or 'raiz'
+    nombre = f"{datetime.now():%Y%m%d-%H%M%S-%f}_{metodo}_{segmento}_{duracion_ms:.0f}ms.txt"
+    (directorio / nombre).write_text(contenido, encoding='utf-8')
+
+    maximo = getattr(settings, 'PERFILADOR_MAXIMO_ARCHIVOS', 50)
+    archivos = sorted(directorio.glob('*.txt'), key=lambda ruta_archivo: ruta_archivo.name, reverse=True)
+    for antiguo in archivos[maximo:]:
+        antiguo.unlink(missing_ok=True)
+    return nombre
+
+
+def listar_perfiles():
+    directorio = directorio_perfiles()
+    if not directorio.exists():
+        return []
+    return sorted(directorio.glob('*.txt'), key=lambda ruta_archivo: ruta_archivo.name, reverse=True)
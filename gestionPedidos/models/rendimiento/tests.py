@@ -0,0 +1,197 @@
+import pytest
+from models.entrega.models import Entrega
+from models.itemPedido.models import ItemPedido
+from models.pedido.models import Pedido
+from models.perfil.models import PerfilUsuario
+from models.ventas.models import VentaDiaria
+from .datos import generar_datos
+from .escenarios import escenarios
+from .medicion import comparar, ejecutar_suite, percentil
+
+VOLUMEN = {'admins': 1, 'clientes': 3, 'repartidores': 2, 'productos': 10, 'pedidos': 30, 'items_por_pedido': 2, 'proporcion_entregas': 0.5}
+
+@pytest.mark.django_db
+def test_generar_datos_con_volumen_indicado():
+    usuarios = generar_datos(**VOLUMEN)
+    assert {rol: len(lista) for rol, lista in usuarios.items()} == {'admin': 1, 'cliente': 3, 'repartidor': 2}
+    assert PerfilUsuario.objects.filter(rol='repartidor').count() == 2
+    assert Pedido.objects.count() == 30
+    assert ItemPedido.objects.count() == 60
+    assert 0 < Entrega.objects.count() <= 30
+    assert VentaDiaria.objects.exists()
+
+@pytest.mark.django_db
+def test_suite_mide_latencia_y_consultas(settings):
+    settings.TESTING = False
+    usuarios = generar_datos(**VOLUMEN)
+    resultados = ejecutar_suite(escenarios(), usuarios, {'productos': []}, repeticiones=2, filtro='.lista')
+    assert 'pedidos.lista[cliente]' in resultados
+    metricas = resultados['entregas.lista[repartidor]']
+    assert metricas['repeticiones'] == 2
+    assert metricas['p50_ms'] <= metricas['p99_ms']
+    assert metricas['consultas'] > 0
+    assert metricas['memoria_pico_kb'] > 0
+
+def test_comparar_detecta_regresiones():
+    base = {'pedidos.lista[admin]': {'p50_ms': 10, 'p95_ms': 10, 'consultas': 2, 'memoria_pico_kb': 100}}
+    actual = {'pedidos.lista[admin]': {'p50_ms': 11, 'p95_ms': 13, 'consultas': 3, 'memoria_pico_kb': 100}}
+    regresiones = {metrica for _, metrica, _, _, regresion in comparar(base, actual, tolerancia=0.2) if regresion}
+    assert regresiones == {'p95_ms', 'consultas'}
+
+def test_percentil_rango_mas_cercano():
+    valores = list(range(1, 101))
+    assert percentil(valores, 50) == 50
+    assert percentil(valores, 95) == 95
+    assert percentil(valores, 100) == 100
+
+@pytest.mark.django_db
+def test_middleware_publica_server_timing(client):
+    from django.urls import reverse
+    response = client.get(reverse('producto-list'))
+    cabecera = response['Server-Timing']
+    assert 'db;dur=' in cabecera and 'total;dur=' in cabecera
+    assert 'consultas"' in cabecera
+
+@pytest.mark.django_db
+def test_middleware_presupuesto_de_consultas(client, settings, monkeypatch):
+    from django.urls import reverse
+    from . import middleware
+    from .middleware import PresupuestoConsultasExcedido
+    avisos = []
+    monkeypatch.setattr(middleware.logger, 'warning', avisos.append)
+    settings.PRESUPUESTOS_CONSULTAS = {'producto-list': 0}
+
+    with pytest.raises(PresupuestoConsultasExcedido):
+        client.get(reverse('producto-list'))
+
+    settings.PRESUPUESTO_CONSULTAS_ESTRICTO = False
+    response = client.get(reverse('producto-list'))
+    assert response.status_code == 200
+    assert len(avisos) == 1 and 'presupuesto: 0' in avisos[0]
+
+@pytest.fixture
+def perfiles_temporales(settings, tmp_path):
+    settings.PERFILADOR_DIR = tmp_path
+    return tmp_path
+
+@pytest.mark.django_db
+def test_perfilador_por_ruta_y_porcentaje(client, settings, perfiles_temporales):
+    from django.urls import reverse
+    settings.PERFILADOR_PORCENTAJE = 100
+    settings.PERFILADOR_RUTAS = [r'^/api/productos/']
+
+    response = client.get(reverse('producto-list'))
+    assert response.has_header('X-Perfil')
+    contenido = (perfiles_temporales / response['X-Perfil']).read_text()
+    assert contenido.startswith('GET /api/productos/')
+    assert 'acumulado_ms' in contenido
+
+    assert not client.get(reverse('ventas-list')).has_header('X-Perfil')
+
+@pytest.mark.django_db
+def test_perfilador_asgi_muestrea_el_hilo_de_la_vista(settings, perfiles_temporales, monkeypatch):
+    import time
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+    from django.urls import reverse
+    from models.producto.views import ProductoViewSet
+    from . import middleware
+    listar = ProductoViewSet.list
+    def listar_lento(self, request, *args, **kwargs):
+        fin = time.perf_counter() + 0.05
+        while time.perf_counter() < fin:
+            pass
+        return listar(self, request, *args, **kwargs)
+    monkeypatch.setattr(ProductoViewSet, 'list', listar_lento)
+
+    # Sin perfilar no se pasa por otro hilo para decidirlo
+    def sin_hilos(*args, **kwargs):
+        raise AssertionError('sync_to_async con el perfilador desactivado')
+    with monkeypatch.context() as parche:
+        parche.setattr(middleware, 'sync_to_async', sin_hilos)
+        assert not async_to_sync(AsyncClient().get)(reverse('producto-list')).has_header('X-Perfil')
+
+    settings.PERFILADOR_PORCENTAJE = 100
+    response = async_to_sync(AsyncClient().get)(reverse('producto-list'))
+    contenido = (perfiles_temporales / response['X-Perfil']).read_text()
+    assert 'listar_lento' in contenido
+
+@pytest.mark.django_db
+def test_perfilador_desactivado_y_cabecera_solo_admin(client, perfiles_temporales):
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+    assert not client.get(reverse('producto-list'), HTTP_X_PERFILAR='1').has_header('X-Perfil')
+
+    admin = User.objects.create_user(username='admin_perfil', password='x', is_staff=True)
+    client.force_login(admin)
+    response = client.get(reverse('producto-list'), HTTP_X_PERFILAR='1')
+    assert response.has_header('X-Perfil')
+
+@pytest.mark.django_db
+def test_perfilador_rotacion_y_descarga(client, settings, perfiles_temporales):
+    from django.urls import reverse
+    from .perfilador import guardar_perfil
+    settings.PERFILADOR_MAXIMO_ARCHIVOS = 2
+    nombres = [guardar_perfil(f"perfil {indice}\n", 'GET', '/api/pedidos/', indice) for indice in range(3)]
+    assert len(list(perfiles_temporales.glob('*.txt'))) == 2
+
+    listado = client.get(reverse('perfilador-list')).json()
+    assert [perfil['nombre'] for perfil in listado] == [nombres[2], nombres[1]]
+    response = client.get(reverse('perfilador-detail', args=[nombres[2]]))
+    assert b''.join(response.streaming_content) == b'perfil 2\n'
+    assert client.get(reverse('perfilador-detail', args=[nombres[0]])).status_code == 404
+
+def test_perfilador_muestreo_acumula_arbol():
+    import time
+    from .perfilador import PerfiladorMuestreo
+    def ocupado():
+        fin = time.perf_counter() + 0.05
+        while time.perf_counter() < fin:
+            pass
+    with PerfiladorMuestreo(intervalo=0.001) as perfilador:
+        ocupado()
+    assert perfilador.muestras > 0
+    assert 'ocupado' in perfilador.informe('prueba')
+
+@pytest.mark.django_db(transaction=True)
+def test_generar_carga_contra_servidor(live_server):
+    from .carga import ejecutar_carga
+    usuarios = generar_datos(**VOLUMEN)
+    # El servidor de pruebas comparte la conexión SQLite en memoria entre hilos, así
+    # que cada flujo se ejecuta con un único usuario virtual
+    clientes = ejecutar_carga(live_server.url, [usuarios['cliente'][0].username], [], duracion=1, pausa=0.01)
+    repartidores = ejecutar_carga(live_server.url, [], [usuarios['repartidor'][0].username], duracion=1, pausa=0.01)
+
+    assert {'login', 'catalogo', 'crear_con_items', 'pedidos'} <= set(clientes['operaciones'])
+    assert {'login', 'entregas', 'actualizar_entrega'} <= set(repartidores['operaciones'])
+    assert clientes['tasa_error'] == 0 and repartidores['tasa_error'] == 0
+    catalogo = clientes['operaciones']['catalogo']
+    assert sum(catalogo['histograma'].values()) == catalogo['peticiones']
+
+def test_estadisticas_de_carga():
+    from .carga import Estadisticas
+    estadisticas = Estadisticas()
+    for valor in (5, 20, 80, 3000):
+        estadisticas.registrar('pedidos', valor)
+    estadisticas.registrar('crear_con_items', 120, error='database is locked')
+    resumen = estadisticas.resumen(duracion_s=2)
+    assert resumen['peticiones'] == 5
+    assert resumen['rendimiento_rps'] == 2.5
+    assert resumen['tasa_error'] == 0.2
+    assert resumen['bloqueos_sqlite'] == 1
+    assert resumen['operaciones']['pedidos']['histograma'] == {'<=10': 1, '<=25': 1, '<=100': 1, '<=5000': 1}
+
+def test_arranque_en_frio_difiere_subsistemas_pesados(settings):
+    import os
+    from .arranque import MODULOS_DIFERIDOS, medir_arranque
+    resultado = medir_arranque('/api/')
+    assert resultado['estado'] < 500
+    # PDF y documentación se importan al usarse, no al arrancar
+    assert resultado['diferidos_cargados'] == []
+    assert not any(fila['modulo'].startswith(MODULOS_DIFERIDOS) for fila in resultado['importaciones'])
+    assert set(resultado['fases']) == {'ajustes_ms', 'apps_ms', 'urls_ms', 'middleware_ms', 'primera_peticion_ms'}
+    assert 'pedido' in resultado['apps']
+    # Margen del doble sobre el objetivo para máquinas de desarrollo lentas o cargadas;
+    # ARRANQUE_MAXIMO_MS lo ajusta (p. ej. al objetivo exacto en la máquina de despliegue)
+    maximo = float(os.environ.get('ARRANQUE_MAXIMO_MS', 2 * settings.ARRANQUE_PRIMERA_RESPUESTA_MAXIMA_MS))
+    assert 0 < resultado['primera_respuesta_ms'] <= maximo
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import TrabajoReporte
+
+@admin.register(TrabajoReporte)
+class TrabajoReporteAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tipo', 'solicitado_por', 'estado', 'fecha_creacion', 'fecha_finalizacion')
+    list_filter = ('tipo', 'estado')
+    search_fields = ('id', 'solicitado_por__username')
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ReporteConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'models.reporte'
+
+    def ready(self):
+        import models.reporte.signals
@@ -0,0 +1,90 @@
+# models/reporte/cache.py
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Max
+
+
+def _ruta_cache():
+    return Path(getattr(settings, 'REPORTES_CACHE_DIR', settings.BASE_DIR / 'reportes_cache'))
+
+
+def directorio_cache():
+    directorio = _ruta_cache()
+    directorio.mkdir(parents=True, exist_ok=True)
+    return directorio
+
+
+def huella_queryset(tipo, queryset):
+    """
+    Huella del contenido del reporte: ids de las filas que lo componen (ya filtradas
+    por rol) más la fecha de la última modificación entre ellas.
+    """
+    marcador = queryset.aggregate(maximo=Max('fecha_actualizacion'))['maximo']
+    digest = hashlib.sha256(f"{tipo}|{marcador.isoformat() if marcador else ''}".encode())
+    for id_fila in queryset.order_by('id').values_list('id', flat=True).iterator(chunk_size=2000):
+        digest.update(b'%d,' % id_fila)
+    return f"{tipo}-{digest.hexdigest()}"
+
+
+def obtener(huella):
+    """
+    PDF en caché para la huella, abierto para lectura, o None. Se abre antes de
+    tocarlo: si invalidar o la expulsión LRU lo borran entre medias es un fallo de caché,
+    y una vez abierto se puede leer aunque lo borren. Un acierto actualiza la fecha de
+    acceso del archivo, que es lo que usa la expulsión LRU.
+    """
+    ruta = directorio_cache() / f"{huella}.pdf"
+    try:
+        archivo = open(ruta, 'rb')
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(ruta)
+    except FileNotFoundError:
+        pass
+    return archivo
+
+
+def guardar(huella, contenido):
+    """
+    Guarda el PDF de forma atómica y expulsa los menos usados si se supera
+    REPORTES_CACHE_MAX_BYTES.
+    """
+    directorio = directorio_cache()
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    with os.fdopen(descriptor, 'wb') as archivo:
+        archivo.write(contenido)
+    ruta = directorio / f"{huella}.pdf"
+    os.replace(temporal, ruta)
+    _expulsar(directorio, getattr(settings, 'REPORTES_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+    return ruta
+
+
+def _expulsar(directorio, maximo_bytes):
+    entradas = []
+    for ruta in directorio.glob('*.pdf'):
+        try:
+            estado = ruta.stat()
+        except FileNotFoundError:
+            continue
+        entradas.append((estado.st_mtime, estado.st_size, ruta))
+
+    total = sum(tamano for _, tamano, _ in entradas)
+    for _, tamano, ruta in sorted(entradas, key=lambda entrada: entrada[0]):
+        if total <= maximo_bytes:
+            break
+        ruta.unlink(missing_ok=True)
+        total -= tamano
+
+
+def invalidar(tipo):
+    """
+    Elimina los PDFs en caché de un tipo de reporte.
+    """
+    for ruta in _ruta_cache().glob(f"{tipo}-*.pdf"):
+        ruta.unlink(missing_ok=True)
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from models.reporte.models import TrabajoReporte
+from models.reporte.tareas import generar_reporte, reencolar_atascados
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera en este proceso los trabajos de reporte pendientes y reencola los que "
+        "quedaron en 'procesando' tras la caída de un worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--continuo', action='store_true', help="Seguir revisando la cola indefinidamente.")
+        parser.add_argument('--intervalo', type=float, default=5.0, help="Segundos de espera cuando la cola está vacía.")
+
+    def handle(self, *args, **options):
+        while True:
+            reencolados, fallidos = reencolar_atascados()
+            if reencolados or fallidos:
+                self.stdout.write(f"Trabajos atascados reencolados: {reencolados}, descartados: {fallidos}")
+
+            pendientes = list(TrabajoReporte.objects.filter(estado='pendiente').values_list('id', flat=True))
+            for trabajo_id in pendientes:
+                generar_reporte(trabajo_id)
+                trabajo = TrabajoReporte.objects.get(id=trabajo_id)
+                self.stdout.write(f"Trabajo #{trabajo.id}: {trabajo.estado}")
+
+            if not options['continuo']:
+                self.stdout.write(self.style.SUCCESS(f"{len(pendientes)} trabajo(s) procesado(s)."))
+                break
+            if not pendientes:
+                time.sleep(options['intervalo'])
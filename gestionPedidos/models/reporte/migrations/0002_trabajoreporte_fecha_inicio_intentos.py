@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reporte', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trabajoreporte',
+            name='fecha_inicio',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='trabajoreporte',
+            name='intentos',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
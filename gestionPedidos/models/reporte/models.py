@@ -0,0 +1,27 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+class TrabajoReporte(models.Model):
+    TIPOS_REPORTE = [
+        ('pedidos', 'Pedidos'),
+        ('entregas', 'Entregas'),
+    ]
+    ESTADOS_TRABAJO = [
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('completado', 'Completado'),
+        ('error', 'Error'),
+    ]
+    tipo = models.CharField(max_length=20, choices=TIPOS_REPORTE)
+    solicitado_por = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='trabajos_reporte')
+    estado = models.CharField(max_length=20, choices=ESTADOS_TRABAJO, default='pendiente')
+    archivo = models.CharField(max_length=255, blank=True)
+    mensaje_error = models.TextField(blank=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    # Cuándo lo tomó un worker y cuántas veces: detecta los que quedaron 'procesando' tras una caída
+    fecha_inicio = models.DateTimeField(null=True, blank=True)
+    intentos = models.PositiveSmallIntegerField(default=0)
+    fecha_finalizacion = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Reporte de {self.tipo} #{self.id} ({self.estado})"
@@ -0,0 +1,67 @@
+# models/reporte/pdf.py
+
+from io import BytesIO
+
+from django.template.loader import get_template
+
+from . import cache
+
+REPORTES = {
+    'pedidos': {
+        'plantilla': 'pedido/reporte_pedidos.html',
+        'variable': 'pedidos',
+        'archivo': 'reporte_pedidos.pdf',
+        'relaciones': ('cliente',),
+    },
+    'entregas': {
+        'plantilla': 'entrega/reporte_entregas.html',
+        'variable': 'entregas',
+        'archivo': 'reporte_entregas.pdf',
+        'relaciones': ('pedido__cliente', 'asignado_a'),
+    },
+}
+
+
+def queryset_reporte(tipo, usuario):
+    """
+    Registros que entran en el reporte, con el mismo filtrado por rol que la API.
+    """
+    if tipo == 'pedidos':
+        from models.pedido.views import pedidos_visibles
+        return pedidos_visibles(usuario)
+    if tipo == 'entregas':
+        from models.entrega.views import entregas_visibles
+        return entregas_visibles(usuario)
+    raise ValueError(f"Tipo de reporte desconocido: {tipo}")
+
+
+def renderizar_pdf(tipo, queryset, destino):
+    """
+    Renderiza la plantilla del reporte y escribe el PDF en 'destino' (archivo o HttpResponse).
+    Devuelve False si xhtml2pdf informó errores.
+    """
+    # xhtml2pdf arrastra reportlab y pyhanko (~0,5 s): se importa en el primer reporte,
+    # no al cargar las URLs en cada arranque en frío
+    from xhtml2pdf import pisa
+
+    config = REPORTES[tipo]
+    queryset = queryset.select_related(*config['relaciones'])
+    html = get_template(config['plantilla']).render({config['variable']: queryset})
+    pisa_status = pisa.CreatePDF(html, dest=destino)
+    return not pisa_status.err
+
+
+def generar_pdf_cacheado(tipo, queryset):
+    """
+    PDF del reporte abierto para lectura. Solo se renderiza si no hay uno en caché con
+    la misma huella; devuelve None si xhtml2pdf falla.
+    """
+    huella = cache.huella_queryset(tipo, queryset)
+    archivo = cache.obtener(huella)
+    if archivo is None:
+        archivo = BytesIO()
+        if not renderizar_pdf(tipo, queryset, archivo):
+            return None
+        cache.guardar(huella, archivo.getvalue())
+        archivo.seek(0)
+    return archivo
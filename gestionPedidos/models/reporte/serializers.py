@@ -0,0 +1,18 @@
+from rest_framework import serializers
+from django.urls import reverse
+from .models import TrabajoReporte
+
+class TrabajoReporteSerializer(serializers.ModelSerializer):
+    descarga = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TrabajoReporte
+        fields = ['id', 'tipo', 'estado', 'mensaje_error', 'fecha_creacion', 'fecha_finalizacion', 'descarga']
+        read_only_fields = ['estado', 'mensaje_error', 'fecha_creacion', 'fecha_finalizacion']
+
+    def get_descarga(self, trabajo):
+        if trabajo.estado != 'completado':
+            return None
+        url = reverse('trabajoreporte-descargar', args=[trabajo.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from models.entrega.models import Entrega
+from models.pedido.models import Pedido
+from . import cache
+
+def _sin_cambios(instance, kwargs):
+    # Un save() que no cambia ningún campo no invalida nada
+    return kwargs.get('signal') is post_save and not kwargs['created'] and not instance.ha_cambiado()
+
+@receiver([post_save, post_delete], sender=Pedido)
+def invalidar_reportes_pedido(sender, instance, **kwargs):
+    if _sin_cambios(instance, kwargs):
+        return
+    # El reporte de entregas también muestra datos del pedido
+    cache.invalidar('pedidos')
+    cache.invalidar('entregas')
+
+@receiver([post_save, post_delete], sender=Entrega)
+def invalidar_reportes_entrega(sender, instance, **kwargs):
+    if _sin_cambios(instance, kwargs):
+        return
+    cache.invalidar('entregas')
@@ -0,0 +1,77 @@
+# models/reporte/tareas.py
+
+import shutil
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import TrabajoReporte
+from .pdf import generar_pdf_cacheado, queryset_reporte
+
+
+def directorio_reportes():
+    directorio = Path(getattr(settings, 'REPORTES_DIR', settings.BASE_DIR / 'reportes_generados'))
+    directorio.mkdir(parents=True, exist_ok=True)
+    return directorio
+
+
+def generar_reporte(trabajo_id):
+    """
+    Genera el PDF de un trabajo pendiente. El paso a 'procesando' es un UPDATE
+    condicional, así que un mismo trabajo nunca se procesa dos veces.
+    """
+    tomado = TrabajoReporte.objects.filter(id=trabajo_id, estado='pendiente').update(
+        estado='procesando', fecha_inicio=timezone.now(), intentos=F('intentos') + 1,
+    )
+    if not tomado:
+        return
+
+    trabajo = TrabajoReporte.objects.select_related('solicitado_por').get(id=trabajo_id)
+    ruta = directorio_reportes() / f"{trabajo.tipo}_{trabajo.id}.pdf"
+    try:
+        queryset = queryset_reporte(trabajo.tipo, trabajo.solicitado_por)
+        pdf = generar_pdf_cacheado(trabajo.tipo, queryset)
+        if pdf is None:
+            raise RuntimeError('Error al generar el PDF')
+        with pdf, open(ruta, 'wb') as destino:
+            shutil.copyfileobj(pdf, destino)
+    except Exception as e:
+        ruta.unlink(missing_ok=True)
+        trabajo.estado = 'error'
+        trabajo.mensaje_error = str(e)
+    else:
+        trabajo.estado = 'completado'
+        trabajo.archivo = ruta.name
+    trabajo.fecha_finalizacion = timezone.now()
+    trabajo.save(update_fields=['estado', 'archivo', 'mensaje_error', 'fecha_finalizacion'])
+
+
+def reencolar_atascados():
+    """
+    Devuelve a 'pendiente' los trabajos que llevan en 'procesando' más de
+    REPORTES_PROCESANDO_MAXIMO_SEGUNDOS: el worker que los tomó murió (reinicio, OOM)
+    sin terminarlos. Tras REPORTES_MAX_INTENTOS tomas se marcan como error, para que un
+    reporte que tumba al worker no se reintente sin fin. Devuelve (reencolados, fallidos).
+    """
+    limite = timezone.now() - timedelta(seconds=getattr(settings, 'REPORTES_PROCESANDO_MAXIMO_SEGUNDOS', 15 * 60))
+    atascados = TrabajoReporte.objects.filter(estado='procesando').filter(
+        Q(fecha_inicio__lt=limite) | Q(fecha_inicio__isnull=True)
+    )
+    fallidos = atascados.filter(intentos__gte=getattr(settings, 'REPORTES_MAX_INTENTOS', 3)).update(
+        estado='error', mensaje_error='El worker se detuvo durante la generación.', fecha_finalizacion=timezone.now(),
+    )
+    return atascados.update(estado='pendiente'), fallidos
+
+
+def encolar_trabajo(trabajo):
+    """
+    El trabajo queda 'pendiente' en la base de datos y lo genera el proceso
+    'procesar_reportes --continuo', que corre junto al servidor web: xhtml2pdf es
+    intensivo en CPU y así no ocupa a los workers de gunicorn ni cada uno arranca su
+    propio pool. Con REPORTES_EJECUCION_SINCRONA (pruebas) se genera en el mismo proceso.
+    """
+    if getattr(settings, 'REPORTES_EJECUCION_SINCRONA', False):
+        generar_reporte(trabajo.id)
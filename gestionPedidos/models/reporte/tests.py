@@ -0,0 +1,159 @@
+import pytest
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.contrib.auth.models import User
+from models.pedido.models import Pedido
+from .models import TrabajoReporte
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def reportes_sincronos(settings, tmp_path):
+    settings.REPORTES_EJECUCION_SINCRONA = True
+    settings.REPORTES_DIR = tmp_path
+    settings.REPORTES_CACHE_DIR = tmp_path / 'cache'
+    return tmp_path
+
+@pytest.fixture
+def crear_pedido():
+    cliente = User.objects.create_user(username='testuser', password='testpassword')
+    return Pedido.objects.create(
+        cliente=cliente,
+        estado='pendiente',
+        direccion_envio='San Juan Oriental',
+        monto_total=1000.00
+    )
+
+@pytest.mark.django_db
+def test_crear_trabajo_reporte_y_descargar(api_client, reportes_sincronos, crear_pedido):
+    response = api_client.post(reverse('trabajoreporte-list'), {'tipo': 'pedidos'}, format='json')
+    assert response.status_code == 202
+    assert response.data['estado'] == 'completado'
+    assert response.data['descarga'].endswith(reverse('trabajoreporte-descargar', args=[response.data['id']]))
+
+    estado = api_client.get(reverse('trabajoreporte-detail', args=[response.data['id']]))
+    assert estado.status_code == 200
+    assert estado.data['estado'] == 'completado'
+
+    descarga = api_client.get(reverse('trabajoreporte-descargar', args=[response.data['id']]))
+    assert descarga.status_code == 200
+    assert descarga['Content-Type'] == 'application/pdf'
+    assert b''.join(descarga.streaming_content).startswith(b'%PDF')
+
+@pytest.mark.django_db
+def test_descargar_trabajo_pendiente(api_client, reportes_sincronos):
+    trabajo = TrabajoReporte.objects.create(tipo='entregas')
+    response = api_client.get(reverse('trabajoreporte-descargar', args=[trabajo.id]))
+    assert response.status_code == 409
+
+@pytest.mark.django_db
+def test_trabajo_reporte_tipo_invalido(api_client, reportes_sincronos):
+    response = api_client.post(reverse('trabajoreporte-list'), {'tipo': 'productos'}, format='json')
+    assert response.status_code == 400
+    assert not TrabajoReporte.objects.exists()
+
+@pytest.fixture
+def cache_reportes(settings, tmp_path):
+    settings.REPORTES_CACHE_DIR = tmp_path / 'cache'
+    return settings.REPORTES_CACHE_DIR
+
+@pytest.fixture
+def contar_renderizados(monkeypatch):
+    from . import pdf
+    llamadas = []
+    original = pdf.renderizar_pdf
+
+    def renderizar(tipo, queryset, destino):
+        llamadas.append(tipo)
+        return original(tipo, queryset, destino)
+
+    monkeypatch.setattr(pdf, 'renderizar_pdf', renderizar)
+    return llamadas
+
+@pytest.mark.django_db
+def test_reporte_pdf_servido_desde_cache(api_client, cache_reportes, contar_renderizados, crear_pedido):
+    url = reverse('pedido-reporte-pdf')
+    primera = b''.join(api_client.get(url).streaming_content)
+    segunda = b''.join(api_client.get(url).streaming_content)
+    assert primera.startswith(b'%PDF')
+    assert segunda == primera
+    assert contar_renderizados == ['pedidos']
+
+    crear_pedido.estado = 'en_proceso'
+    crear_pedido.save()
+    assert not list(cache_reportes.glob('pedidos-*.pdf'))
+    api_client.get(url)
+    assert contar_renderizados == ['pedidos', 'pedidos']
+
+@pytest.mark.django_db
+def test_cache_reportes_expulsa_menos_usado(settings, cache_reportes):
+    from . import cache
+    settings.REPORTES_CACHE_MAX_BYTES = 25
+    cache.guardar('pedidos-a', b'x' * 10)
+    cache.guardar('pedidos-b', b'x' * 10)
+    import os, time
+    antiguo = time.time() - 60
+    os.utime(cache_reportes / 'pedidos-b.pdf', (antiguo, antiguo))
+    cache.obtener('pedidos-a')
+    cache.guardar('pedidos-c', b'x' * 10)
+
+    assert cache.obtener('pedidos-b') is None
+    for huella in ('pedidos-a', 'pedidos-c'):
+        with cache.obtener(huella) as archivo:
+            assert archivo.read() == b'x' * 10
+
+@pytest.mark.django_db
+def test_cache_reportes_invalidado_durante_la_lectura(cache_reportes, contar_renderizados, crear_pedido):
+    from . import cache
+    from .pdf import generar_pdf_cacheado
+    queryset = Pedido.objects.all()
+    generar_pdf_cacheado('pedidos', queryset).close()
+
+    # Abierto antes de que otro proceso invalide: se sigue sirviendo entero
+    with generar_pdf_cacheado('pedidos', queryset) as archivo:
+        cache.invalidar('pedidos')
+        assert archivo.read().startswith(b'%PDF')
+    assert contar_renderizados == ['pedidos']
+
+    # Borrado antes de abrirlo: fallo de caché y se vuelve a generar
+    with generar_pdf_cacheado('pedidos', queryset) as archivo:
+        assert archivo.read().startswith(b'%PDF')
+    assert contar_renderizados == ['pedidos', 'pedidos']
+
+@pytest.mark.django_db
+def test_procesar_reportes_reencola_trabajos_atascados(settings, reportes_sincronos, crear_pedido):
+    from datetime import timedelta
+    from django.core.management import call_command
+    from django.utils import timezone
+    hace_una_hora = timezone.now() - timedelta(hours=1)
+    caido = TrabajoReporte.objects.create(tipo='pedidos', estado='procesando', fecha_inicio=hace_una_hora, intentos=1)
+    en_curso = TrabajoReporte.objects.create(tipo='pedidos', estado='procesando', fecha_inicio=timezone.now(), intentos=1)
+    agotado = TrabajoReporte.objects.create(
+        tipo='pedidos', estado='procesando', fecha_inicio=hace_una_hora, intentos=settings.REPORTES_MAX_INTENTOS,
+    )
+
+    call_command('procesar_reportes')
+
+    caido.refresh_from_db()
+    assert caido.estado == 'completado'
+    assert caido.intentos == 2
+    assert (reportes_sincronos / caido.archivo).exists()
+    en_curso.refresh_from_db()
+    assert en_curso.estado == 'procesando'
+    agotado.refresh_from_db()
+    assert agotado.estado == 'error'
+
+@pytest.mark.django_db
+def test_la_web_solo_encola_y_procesar_reportes_genera(api_client, settings, reportes_sincronos, crear_pedido):
+    from django.core.management import call_command
+    settings.REPORTES_EJECUCION_SINCRONA = False
+    response = api_client.post(reverse('trabajoreporte-list'), {'tipo': 'pedidos'}, format='json')
+    assert response.status_code == 202
+    trabajo = TrabajoReporte.objects.get(id=response.data['id'])
+    assert trabajo.estado == 'pendiente'
+
+    call_command('procesar_reportes')
+    trabajo.refresh_from_db()
+    assert trabajo.estado == 'completado'
@@ -0,0 +1,189 @@
+# models/ventas/acumulados.py
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from models.itemPedido.models import ItemPedido
+from models.pedido.models import Pedido
+from .models import VentaDiaria, VentaProductoDiaria
+
+ESTADO_CANCELADO = 'cancelado'
+
+
+def fecha_venta(fecha_pedido):
+    return timezone.localdate(fecha_pedido) if timezone.is_aware(fecha_pedido) else fecha_pedido.date()
+
+
+def _incrementar(modelo, filas):
+    """
+    Suma deltas a las filas del acumulado. 'filas' es una lista de (claves, deltas)
+    con diccionarios {campo: valor}; todas con los mismos campos.
+
+    Donde el motor lo admite (SQLite, PostgreSQL) se hace con un único
+    INSERT ... ON CONFLICT DO UPDATE SET campo = campo + excluded.campo para todas las
+    filas; si no, con un UPDATE relativo por fila y un INSERT para las que faltan.
+    """
+    if not filas:
+        return
+    conexion = connections[router.db_for_write(modelo)]
+    if not conexion.features.supports_update_conflicts_with_target:
+        for claves, deltas in filas:
+            _incrementar_fila(modelo, claves, deltas)
+        return
+
+    campos_clave, campos_suma = list(filas[0][0]), list(filas[0][1])
+    campos = [modelo._meta.get_field(nombre) for nombre in campos_clave + campos_suma]
+    columnas = [conexion.ops.quote_name(campo.column) for campo in campos]
+    tabla = conexion.ops.quote_name(modelo._meta.db_table)
+    marcadores = '(' + ', '.join(['%s'] * len(campos)) + ')'
+    parametros = [
+        campo.get_db_prep_save(valor, conexion)
+        for claves, deltas in filas
+        for campo, valor in zip(campos, [*claves.values(), *deltas.values()])
+    ]
+    sumas = ', '.join(
+        f"{columna} = {tabla}.{columna} + excluded.{columna}" for columna in columnas[len(campos_clave):]
+    )
+    sql = (
+        f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES {', '.join([marcadores] * len(filas))} "
+        f"ON CONFLICT ({', '.join(columnas[:len(campos_clave)])}) DO UPDATE SET {sumas}"
+    )
+    with conexion.cursor() as cursor:
+        cursor.execute(sql, parametros)
+
+
+def _incrementar_fila(modelo, claves, deltas):
+    actualizacion = {campo: F(campo) + valor for campo, valor in deltas.items()}
+    if modelo.objects.filter(**claves).update(**actualizacion):
+        return
+    try:
+        with transaction.atomic():
+            modelo.objects.create(**claves, **deltas)
+    except IntegrityError:
+        modelo.objects.filter(**claves).update(**actualizacion)
+
+
+def acumular_pedidos(filas, signo=1):
+    """
+    Aplica a VentaDiaria los pedidos dados como (fecha_pedido, estado, monto_total),
+    con una sola escritura para todos los pares (día, estado).
+    """
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+    for fecha_pedido, estado, monto in filas:
+        delta = deltas[(fecha_venta(fecha_pedido), estado)]
+        delta[0] += signo
+        delta[1] += signo * Decimal(str(monto or 0))
+    _incrementar(VentaDiaria, [
+        ({'fecha': fecha, 'estado': estado}, {'pedidos': pedidos, 'ingresos': ingresos})
+        for (fecha, estado), (pedidos, ingresos) in deltas.items()
+        if pedidos or ingresos
+    ])
+
+
+def acumular_items(pedido_ids, signo=1):
+    """
+    Aplica a VentaProductoDiaria los items de los pedidos indicados, agregados en una
+    sola consulta por pedido y producto.
+    """
+    if not pedido_ids:
+        return
+    filas = (
+        ItemPedido.objects
+        .filter(pedido_id__in=pedido_ids)
+        .values('pedido__fecha_pedido', 'producto_id')
+        .annotate(
+            unidades=Sum('cantidad'),
+            ingresos=Sum(F('cantidad') * F('precio_al_comprar'), output_field=DecimalField()),
+        )
+    )
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+    for fila in filas:
+        delta = deltas[(fecha_venta(fila['pedido__fecha_pedido']), fila['producto_id'])]
+        delta[0] += signo * fila['unidades']
+        delta[1] += signo * Decimal(fila['ingresos'] or 0)
+    _incrementar(VentaProductoDiaria, [
+        ({'fecha': fecha, 'producto': producto_id}, {'unidades': unidades, 'ingresos': ingresos})
+        for (fecha, producto_id), (unidades, ingresos) in deltas.items()
+    ])
+
+
+def acumular_item(pedido, producto_id, cantidad, precio, signo=1):
+    """
+    Aplica un único item (altas, cambios y bajas hechas con save()/delete()).
+    """
+    if pedido.estado == ESTADO_CANCELADO or not cantidad:
+        return
+    _incrementar(VentaProductoDiaria, [(
+        {'fecha': fecha_venta(pedido.fecha_pedido), 'producto': producto_id},
+        {'unidades': signo * cantidad, 'ingresos': signo * cantidad * Decimal(str(precio))},
+    )])
+
+
+def registrar_pedidos_creados(pedidos):
+    """
+    Suma a los acumulados pedidos recién creados junto con sus items.
+    """
+    acumular_pedidos((p.fecha_pedido, p.estado, p.monto_total) for p in pedidos)
+    acumular_items([p.pk for p in pedidos if p.estado != ESTADO_CANCELADO])
+
+
+def registrar_cambio_estado(anteriores, estado_nuevo):
+    """
+    Mueve pedidos de su estado anterior al nuevo. 'anteriores' son tuplas
+    (id, fecha_pedido, estado_anterior, monto_total). Al entrar o salir de 'cancelado'
+    también se restan o suman sus unidades vendidas.
+    """
+    anteriores = [fila for fila in anteriores if fila[2] != estado_nuevo]
+    if not anteriores:
+        return
+    acumular_pedidos([(fecha, estado, monto) for _, fecha, estado, monto in anteriores], signo=-1)
+    acumular_pedidos([(fecha, estado_nuevo, monto) for _, fecha, _, monto in anteriores])
+
+    if estado_nuevo == ESTADO_CANCELADO:
+        acumular_items([pedido_id for pedido_id, _, _, _ in anteriores], signo=-1)
+    else:
+        acumular_items([pedido_id for pedido_id, _, estado, _ in anteriores if estado == ESTADO_CANCELADO])
+
+
+def reconstruir():
+    """
+    Recalcula los acumulados desde Pedido e ItemPedido (cargas iniciales y correcciones).
+    Devuelve el número de filas (diarias, por producto) generadas.
+    """
+    with transaction.atomic():
+        VentaDiaria.objects.all().delete()
+        VentaProductoDiaria.objects.all().delete()
+
+        diarias = VentaDiaria.objects.bulk_create(
+            VentaDiaria(fecha=fila['fecha'], estado=fila['estado'], pedidos=fila['pedidos'], ingresos=fila['ingresos'] or 0)
+            for fila in (
+                Pedido.objects
+                .annotate(fecha=TruncDate('fecha_pedido'))
+                .values('fecha', 'estado')
+                .annotate(pedidos=Count('id'), ingresos=Sum('monto_total'))
+                .order_by()
+            )
+        )
+        productos = VentaProductoDiaria.objects.bulk_create(
+            VentaProductoDiaria(
+                fecha=fila['fecha'], producto_id=fila['producto_id'],
+                unidades=fila['unidades'], ingresos=fila['ingresos'] or 0,
+            )
+            for fila in (
+                ItemPedido.objects
+                .exclude(pedido__estado=ESTADO_CANCELADO)
+                .annotate(fecha=TruncDate('pedido__fecha_pedido'))
+                .values('fecha', 'producto_id')
+                .annotate(
+                    unidades=Sum('cantidad'),
+                    ingresos=Sum(F('cantidad') * F('precio_al_comprar'), output_field=DecimalField()),
+                )
+                .order_by()
+            )
+        )
+    return len(diarias), len(productos)
@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import VentaDiaria, VentaProductoDiaria
+
+@admin.register(VentaDiaria)
+class VentaDiariaAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'estado', 'pedidos', 'ingresos')
+    list_filter = ('estado',)
+    date_hierarchy = 'fecha'
+
+@admin.register(VentaProductoDiaria)
+class VentaProductoDiariaAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'producto', 'unidades', 'ingresos')
+    search_fields = ('producto__nombre',)
+    date_hierarchy = 'fecha'
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class VentasConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'models.ventas'
+
+    def ready(self):
+        import models.ventas.signals
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from models.ventas.acumulados import reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula los acumulados de ventas desde los pedidos (cargas iniciales y correcciones)."
+
+    def handle(self, *args, **options):
+        diarias, productos = reconstruir()
+        self.stdout.write(self.style.SUCCESS(
+            f"Acumulados reconstruidos: {diarias} fila(s) diarias, {productos} fila(s) por producto."
+        ))
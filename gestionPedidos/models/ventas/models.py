@@ -0,0 +1,36 @@
+from django.db import models
+from models.pedido.models import Pedido
+from models.producto.models import Producto
+
+
+class VentaDiaria(models.Model):
+    """
+    Acumulado de pedidos e importe por día del pedido y estado. Se mantiene de forma
+    incremental (models.ventas.acumulados) y se reconstruye con 'reconstruir_ventas'.
+    """
+    fecha = models.DateField()
+    estado = models.CharField(max_length=20, choices=Pedido.ESTADOS_PEDIDO)
+    pedidos = models.IntegerField(default=0)
+    ingresos = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['fecha', 'estado'], name='venta_diaria_fecha_estado_uniq')]
+
+    def __str__(self):
+        return f"{self.fecha} {self.estado}: {self.pedidos} pedido(s)"
+
+
+class VentaProductoDiaria(models.Model):
+    """
+    Unidades vendidas e importe por día y producto. Solo cuenta pedidos no cancelados.
+    """
+    fecha = models.DateField()
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='ventas_diarias')
+    unidades = models.IntegerField(default=0)
+    ingresos = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['fecha', 'producto'], name='venta_producto_fecha_uniq')]
+
+    def __str__(self):
+        return f"{self.fecha} {self.producto_id}: {self.unidades} unidad(es)"
@@ -0,0 +1,50 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from models.itemPedido.models import ItemPedido
+from models.pedido.models import Pedido
+from . import acumulados
+
+# Cubren las escrituras hechas con save()/delete() (API, admin). Las operaciones en
+# bloque (bulk_create, UPDATE de cancelación, transiciones de estado) llaman a
+# models.ventas.acumulados.
+
+# Los valores anteriores salen de SeguimientoCambiosMixin (los leídos con la instancia),
+# así que mantener los acumulados no añade lecturas a cada guardado.
+
+@receiver(post_save, sender=Pedido)
+def acumular_pedido(sender, instance, created, **kwargs):
+    if created:
+        acumulados.acumular_pedidos([(instance.fecha_pedido, instance.estado, instance.monto_total)])
+        return
+    cambios = instance.campos_cambiados()
+    fecha = instance.valor_original('fecha_pedido', instance.fecha_pedido)
+    estado = instance.valor_original('estado', instance.estado)
+    monto = instance.valor_original('monto_total', instance.monto_total)
+    if 'estado' in cambios:
+        acumulados.registrar_cambio_estado([(instance.pk, fecha, estado, monto)], instance.estado)
+        estado = instance.estado
+    if 'monto_total' in cambios:
+        acumulados.acumular_pedidos([(fecha, estado, monto)], signo=-1)
+        acumulados.acumular_pedidos([(fecha, estado, instance.monto_total)])
+
+@receiver(pre_delete, sender=Pedido)
+def restar_pedido(sender, instance, **kwargs):
+    acumulados.acumular_pedidos([(instance.fecha_pedido, instance.estado, instance.monto_total)], signo=-1)
+
+@receiver(post_save, sender=ItemPedido)
+def acumular_item(sender, instance, created, **kwargs):
+    if not created:
+        if not instance.ha_cambiado('producto', 'cantidad', 'precio_al_comprar'):
+            return
+        acumulados.acumular_item(
+            instance.pedido,
+            instance.valor_original('producto', instance.producto_id),
+            instance.valor_original('cantidad', instance.cantidad),
+            instance.valor_original('precio_al_comprar', instance.precio_al_comprar),
+            signo=-1,
+        )
+    acumulados.acumular_item(instance.pedido, instance.producto_id, instance.cantidad, instance.precio_al_comprar)
+
+@receiver(pre_delete, sender=ItemPedido)
+def restar_item(sender, instance, **kwargs):
+    acumulados.acumular_item(instance.pedido, instance.producto_id, instance.cantidad, instance.precio_al_comprar, signo=-1)
@@ -0,0 +1,123 @@
+import pytest
+from decimal import Decimal
+from rest_framework.test import APIClient
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils import timezone
+from models.pedido.models import Pedido
+from models.producto.models import Producto
+from .models import VentaDiaria, VentaProductoDiaria
+from .acumulados import reconstruir
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+@pytest.fixture
+def cliente():
+    return User.objects.create_user(username='cliente_ventas', password='testpassword')
+
+@pytest.fixture
+def productos():
+    return [
+        Producto.objects.create(nombre='Teclado', precio=50, stock=100),
+        Producto.objects.create(nombre='Mouse', precio=20, stock=100),
+    ]
+
+def _crear_pedido(api_client, cliente, items, monto=100):
+    datos = {
+        "pedido": {"cliente": cliente.id, "estado": "pendiente", "direccion_envio": "Calle 1", "monto_total": monto},
+        "items": items,
+    }
+    response = api_client.post(reverse('pedido-crear-con-items'), datos, format='json')
+    assert response.status_code == 201
+    return response.data['id']
+
+def _acumulados():
+    diarias = {
+        (fila.fecha, fila.estado): (fila.pedidos, fila.ingresos)
+        for fila in VentaDiaria.objects.all() if fila.pedidos
+    }
+    productos = {
+        (fila.fecha, fila.producto_id): (fila.unidades, fila.ingresos)
+        for fila in VentaProductoDiaria.objects.all() if fila.unidades
+    }
+    return diarias, productos
+
+@pytest.mark.django_db
+def test_acumulados_se_mantienen_al_crear_cambiar_y_cancelar(api_client, cliente, productos):
+    teclado, mouse = productos
+    hoy = timezone.localdate()
+    primero = _crear_pedido(api_client, cliente, [{"producto_id": teclado.id, "cantidad": 2}], monto=100)
+    segundo = _crear_pedido(api_client, cliente, [{"producto_id": mouse.id, "cantidad": 3}, {"producto_id": teclado.id, "cantidad": 1}], monto=110)
+
+    diarias, por_producto = _acumulados()
+    assert diarias == {(hoy, 'pendiente'): (2, Decimal('210.00'))}
+    assert por_producto[(hoy, teclado.id)] == (3, Decimal('150.00'))
+
+    api_client.patch(reverse('pedido-detail', args=[primero]), {"estado": "en_proceso"}, format='json')
+    api_client.post(reverse('pedido-cancelar-lote'), {"pedidos": [segundo]}, format='json')
+
+    diarias, por_producto = _acumulados()
+    assert diarias == {
+        (hoy, 'en_proceso'): (1, Decimal('100.00')),
+        (hoy, 'cancelado'): (1, Decimal('110.00')),
+    }
+    assert por_producto == {(hoy, teclado.id): (2, Decimal('100.00'))}
+
+    # La reconstrucción desde cero coincide con el mantenimiento incremental
+    incremental = _acumulados()
+    reconstruir()
+    assert _acumulados() == incremental
+
+@pytest.mark.django_db
+def test_acumulados_sin_releer_la_fila_al_guardar(api_client, cliente, productos):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from models.itemPedido.models import ItemPedido
+    teclado, mouse = productos
+    hoy = timezone.localdate()
+    pedido = Pedido.objects.get(id=_crear_pedido(api_client, cliente, [{"producto_id": teclado.id, "cantidad": 2}], monto=100))
+    item = ItemPedido.objects.select_related('pedido', 'producto').get(pedido=pedido)
+
+    with CaptureQueriesContext(connection) as contexto:
+        pedido.direccion_envio = 'Calle 2'
+        pedido.save()
+        pedido.monto_total = Decimal('80.00')
+        pedido.save()
+        item.cantidad = 4
+        item.save()
+    lecturas = [q['sql'] for q in contexto.captured_queries if q['sql'].startswith('SELECT')]
+    assert not [sql for sql in lecturas if 'FROM "pedido_pedido"' in sql or 'FROM "itemPedido_itempedido"' in sql]
+
+    diarias, por_producto = _acumulados()
+    assert diarias == {(hoy, 'pendiente'): (1, Decimal('80.00'))}
+    assert por_producto == {(hoy, teclado.id): (4, Decimal('200.00'))}
+    incremental = _acumulados()
+    reconstruir()
+    assert _acumulados() == incremental
+
+@pytest.mark.django_db
+def test_acumulados_al_borrar_pedido(api_client, cliente, productos):
+    pedido_id = _crear_pedido(api_client, cliente, [{"producto_id": productos[0].id, "cantidad": 2}])
+    Pedido.objects.get(id=pedido_id).delete()
+    assert _acumulados() == ({}, {})
+
+@pytest.mark.django_db
+def test_resumen_ventas_lee_solo_acumulados(api_client, cliente, productos, django_assert_num_queries):
+    teclado, mouse = productos
+    _crear_pedido(api_client, cliente, [{"producto_id": teclado.id, "cantidad": 2}], monto=100)
+    _crear_pedido(api_client, cliente, [{"producto_id": mouse.id, "cantidad": 5}], monto=100)
+
+    with django_assert_num_queries(3):
+        response = api_client.get(reverse('ventas-list'))
+    assert response.status_code == 200
+    assert response.data['dias'][0]['pedidos'] == 2
+    assert response.data['dias'][0]['ingresos'] == Decimal('200.00')
+    assert [p['nombre'] for p in response.data['productos']] == ['Mouse', 'Teclado']
+    assert response.data['por_estado'] == [{'estado': 'pendiente', 'pedidos': 2, 'ingresos': Decimal('200.00')}]
+
+@pytest.mark.django_db
+def test_resumen_ventas_fecha_invalida(api_client):
+    response = api_client.get(reverse('ventas-list'), {'desde': 'ayer'})
+    assert response.status_code == 400